@@ -0,0 +1,105 @@
+"""Measures how long the bot takes to import, per module.
+
+Run with ``python -m benchmarks.importtime`` from the repository root. The imports
+run in a fresh interpreter under ``-X importtime``, the same way a headless start
+does them, including every initial extension.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from typing import NamedTuple
+
+from utilFunc.formats import TabularData
+
+IMPORT_SCRIPT = 'import importlib, bot\nfor name in bot.initial_extensions: importlib.import_module(name)'
+
+# Modules that only the GUI or rarely used commands need, none of them should show up headless
+HEAVY_MODULES = ('PyQt6', 'git', 'lxml', 'dateutil.zoneinfo')
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> list[ImportTime]:
+    """Parses the ``-X importtime`` report Python writes to stderr."""
+    result = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or line.endswith('imported package'):
+            continue
+
+        _, _, data = line.partition(':')
+        self_us, cumulative_us, module = data.split('|', 2)
+        result.append(ImportTime(module.strip(), int(self_us), int(cumulative_us)))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--top', type=int, default=25, help='How many modules to list.')
+    parser.add_argument('--save', help='Write the timings to a JSON file.')
+    parser.add_argument('--compare', help='Compare against a saved JSON file.')
+    args = parser.parse_args()
+
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', IMPORT_SCRIPT],
+        capture_output=True,
+        text=True,
+    )
+    timings = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith('import time:')]
+        print('\n'.join(errors[-10:]), file=sys.stderr)
+        raise SystemExit('Importing the bot failed')
+
+    # Total self time per top level package
+    packages: defaultdict[str, int] = defaultdict(int)
+    for timing in timings:
+        packages[timing.module.partition('.')[0]] += timing.self_us
+    total = sum(packages.values())
+
+    previous: dict[str, int] = {}
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as fp:
+            previous = json.load(fp)['packages']
+
+    table = TabularData()
+    table.set_columns(['Package', 'Self (ms)', 'Share', 'Change (ms)'] if previous else ['Package', 'Self (ms)', 'Share'])
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        row = [package, f'{self_us / 1000:.1f}', f'{self_us / total:.1%}']
+        if previous:
+            row.append(f'{(self_us - previous.get(package, 0)) / 1000:+.1f}')
+        table.add_row(row)
+    print(table.render())
+
+    table = TabularData()
+    table.set_columns(['Module', 'Cumulative (ms)'])
+    for timing in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:args.top]:
+        table.add_row([timing.module, f'{timing.cumulative_us / 1000:.1f}'])
+    print(table.render())
+
+    if previous:
+        before = sum(previous.values())
+        print(f'Total: {total / 1000:.1f}ms ({(total - before) / 1000:+.1f}ms)')
+    else:
+        print(f'Total: {total / 1000:.1f}ms')
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as fp:
+            json.dump({'total': total, 'packages': packages}, fp, indent=2)
+
+    imported = {timing.module for timing in timings}
+    heavy = [name for name in HEAVY_MODULES if name in imported]
+    if heavy:
+        raise SystemExit(f'Imported at startup but should be lazy: {", ".join(heavy)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Compares picking random quotes with ORDER BY RANDOM() and with QuoteStore.random.
+
+Run with ``python -m benchmarks.quotes`` from the repository root. The database is
+built in a temporary directory unless ``--path`` is given, in which case it is
+built once and reused.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from typing import Awaitable, Callable
+
+from utilFunc import metrics
+from utilFunc.formats import TabularData
+from utilFunc.quotes import QuoteStore, quote_hash
+
+# The queries get-quote and random-quote used before
+GUILD_QUERY = 'SELECT user, message, date_added FROM quotes WHERE guild_id = ? ORDER BY RANDOM() LIMIT 1'
+USER_QUERY = 'SELECT message, date_added FROM quotes WHERE user = ? AND guild_id = ? ORDER BY RANDOM() LIMIT 1'
+
+USERS_PER_GUILD = 20
+# populate gives the first guild the most quotes
+LARGEST_GUILD = 0
+
+
+def populate(path: str, quotes: int, guilds: int) -> None:
+    """Creates a quote database with ``quotes`` quotes across ``guilds`` guilds.
+
+    Guild sizes are skewed like on a real bot: guild 0 has the most quotes, around
+    a tenth of them, and most guilds only have a few hundred.
+    """
+    store = QuoteStore(path)
+    store._open()
+    db = store.db
+    if db.execute('SELECT COUNT(*) FROM quotes').fetchone()[0] >= quotes:
+        store._close()
+        return
+
+    rng = random.Random(0)
+
+    def rows():
+        for index in range(quotes):
+            guild_id = min(guilds - 1, int(guilds * rng.random() ** 3))
+            user = f'user{rng.randrange(USERS_PER_GUILD)}'
+            message = f'quote number {index}'
+            yield quote_hash(user, message), user, message, '2026-01-01', guild_id
+
+    with db:
+        db.executemany(
+            'INSERT INTO quotes (hash, user, message, date_added, guild_id) VALUES(?,?,?,?,?) '
+            'ON CONFLICT (guild_id, hash) DO NOTHING',
+            rows(),
+        )
+    store._close()
+
+
+async def measure(samples: int, func: Callable[[], Awaitable[object]]) -> metrics.Histogram:
+    histogram = metrics.Histogram('pick_seconds', '', {})
+    for _ in range(samples):
+        start = time.perf_counter()
+        await func()
+        histogram.observe(time.perf_counter() - start)
+    return histogram
+
+
+def _us(value: float) -> str:
+    return '--' if math.isnan(value) else f'{value * 1e6:.0f}'
+
+
+async def run(path: str, guilds: int, samples: int) -> None:
+    rng = random.Random(0)
+    store = QuoteStore(path, max_pools=2 * guilds)
+    await store.open()
+
+    def pick_guild() -> int:
+        return rng.randrange(guilds)
+
+    def pick_user() -> str:
+        return f'user{rng.randrange(USERS_PER_GUILD)}'
+
+    # The old queries ran on the event loop, these do the same. The query runs when the lambda is
+    # called, asyncio.sleep(0, result) only makes it awaitable like the other methods.
+    db = sqlite3.connect(path)
+    results = [
+        ('guild', 'ORDER BY RANDOM()', await measure(
+            samples, lambda: asyncio.sleep(0, db.execute(GUILD_QUERY, (pick_guild(),)).fetchone())
+        )),
+        ('largest guild', 'ORDER BY RANDOM()', await measure(
+            samples, lambda: asyncio.sleep(0, db.execute(GUILD_QUERY, (LARGEST_GUILD,)).fetchone())
+        )),
+        ('guild + user', 'ORDER BY RANDOM()', await measure(
+            samples, lambda: asyncio.sleep(0, db.execute(USER_QUERY, (pick_user(), pick_guild())).fetchone())
+        )),
+    ]
+    db.close()
+
+    # Every guild once, so each pick has to load the guild's ids first
+    order = list(range(guilds))
+    rng.shuffle(order)
+    cold = iter(order)
+    results.append(('guild', 'QuoteStore, cold', await measure(guilds, lambda: store.random(next(cold)))))
+    results.append(('guild', 'QuoteStore, warm', await measure(samples, lambda: store.random(pick_guild()))))
+    results.append(('largest guild', 'QuoteStore, warm', await measure(samples, lambda: store.random(LARGEST_GUILD))))
+    results.append(('guild + user', 'QuoteStore, warm', await measure(
+        samples, lambda: store.random(pick_guild(), pick_user())
+    )))
+    await store.close()
+
+    table = TabularData()
+    table.set_columns(['Picks from', 'Method', 'Picks', 'p50 (µs)', 'p99 (µs)'])
+    for scope, method, histogram in results:
+        table.add_row([scope, method, histogram.count, _us(histogram.percentile(50)), _us(histogram.percentile(99))])
+    print(table.render())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--quotes', type=int, default=1_000_000, help='How many quotes the database has.')
+    parser.add_argument('--guilds', type=int, default=1000, help='How many guilds they are spread across.')
+    parser.add_argument('--samples', type=int, default=2000, help='How many picks to time per method.')
+    parser.add_argument('--path', help='Where to keep the database between runs.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.path or os.path.join(directory, 'quotes.db')
+        start = time.perf_counter()
+        populate(path, args.quotes, args.guilds)
+        print(f'Database ready in {time.perf_counter() - start:.1f}s')
+        asyncio.run(run(path, args.guilds, args.samples))
+
+
+if __name__ == '__main__':
+    main()
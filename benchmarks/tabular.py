@@ -0,0 +1,54 @@
+"""Compares the column oriented TabularData with the row oriented one it replaced.
+
+Run with ``python -m benchmarks.tabular`` from the repository root.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable
+
+from tests.tabular_reference import RowTabularData, build, sample_rows
+from utilFunc.formats import TabularData
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> tuple[float, Any]:
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000, help='How many rows the table has.')
+    parser.add_argument('--repeat', type=int, default=5, help='How often to run each step, the best run counts.')
+    args = parser.parse_args()
+
+    rows = sample_rows(args.rows)
+    results = TabularData()
+    results.set_columns(['Implementation', 'add_rows (s)', 'render (s)', 'total (s)'])
+
+    outputs = []
+    for name, cls in (('row oriented (old)', RowTabularData), ('column oriented', TabularData)):
+        build_time, table = best_of(args.repeat, lambda: build(cls, rows))
+        render_time, output = best_of(args.repeat, table.render)
+        outputs.append(output)
+        results.add_row([name, f'{build_time:.3f}', f'{render_time:.3f}', f'{build_time + render_time:.3f}'])
+
+    table = build(TabularData, rows)
+    stream_time, _ = best_of(args.repeat, lambda: sum(1 for _ in table.render_iter()))
+    results.add_row(['column oriented, render_iter', '--', f'{stream_time:.3f}', '--'])
+    print(results.render())
+
+    if outputs[0] != outputs[1]:
+        raise SystemExit('The outputs differ')
+    print(f'Both render the same {len(outputs[0])} characters for {args.rows} rows')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Compares UserFriendlyTime parse times with and without the fast path.
+
+Run with ``python -m benchmarks.time_parsing`` from the repository root.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import time
+
+from discord.ext import commands
+
+from tests.time_reference import CORPUS, convert, parsedatetime_only
+from utilFunc import metrics
+from utilFunc.formats import TabularData
+from utilFunc.time import FastTimeParser
+
+
+async def measure(arguments: list[str], *, cold: bool, rounds: int) -> metrics.Histogram:
+    histogram = metrics.Histogram('parse_seconds', '', {})
+    for _ in range(rounds):
+        for argument in arguments:
+            if cold:
+                FastTimeParser.scan.cache_clear()
+            start = time.perf_counter()
+            try:
+                await convert(argument)
+            except commands.BadArgument:
+                # Failing to parse takes time too
+                pass
+            histogram.observe(time.perf_counter() - start)
+    return histogram
+
+
+def _us(value: float) -> str:
+    return '--' if math.isnan(value) else f'{value * 1e6:.0f}'
+
+
+async def run(rounds: int) -> None:
+    fast_phrases = [argument for argument in CORPUS if FastTimeParser.scan(argument) is not None]
+    other_phrases = [argument for argument in CORPUS if argument not in fast_phrases]
+
+    results = []
+    with parsedatetime_only():
+        results.append(('fast path phrases', 'parsedatetime', await measure(fast_phrases, cold=False, rounds=rounds)))
+    results.append(('fast path phrases', 'fast, cold LRU', await measure(fast_phrases, cold=True, rounds=rounds)))
+    results.append(('fast path phrases', 'fast, warm LRU', await measure(fast_phrases, cold=False, rounds=rounds)))
+    results.append(('other phrases', 'fallback', await measure(other_phrases, cold=False, rounds=rounds)))
+
+    table = TabularData()
+    table.set_columns(['Phrases', 'Path', 'Parses', 'p50 (µs)', 'p99 (µs)'])
+    for phrases, path, histogram in results:
+        table.add_row([phrases, path, histogram.count, _us(histogram.percentile(50)), _us(histogram.percentile(99))])
+    print(table.render())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=200, help='How often to parse each phrase.')
+    args = parser.parse_args()
+    asyncio.run(run(args.rounds))
+
+
+if __name__ == '__main__':
+    main()
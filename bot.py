@@ -11,12 +11,13 @@ from typing import Iterable, AsyncIterator, TYPE_CHECKING, Optional, Union
 import aiohttp
 import asyncpg
 import discord
-from PyQt6.QtWidgets import QApplication
 from discord.ext import commands
 
 import utilFunc.config
-from gui import BotGUI
+from utilFunc import instrumentation, logs
 from utilFunc.context import Context
+from utilFunc.loophealth import LatencyHistory, LoopMonitor
+from utilFunc.startup import StartupOrchestrator
 
 if TYPE_CHECKING:
     from cogs.reminders import Reminder
@@ -47,6 +48,10 @@ initial_extensions = [
     'cogs.userSettings'
 ]
 
+# Extensions that have to be loaded before the given extension, e.g.
+# 'cogs.foo': ('cogs.bar',). Everything else is loaded concurrently.
+extension_dependencies: dict[str, tuple[str, ...]] = {}
+
 
 class RemoveNoise(logging.Filter):
     def __init__(self):
@@ -61,6 +66,9 @@ class RemoveNoise(logging.Filter):
 
 def setup_logging():
     log = logging.getLogger()
+    if logs.pipeline is not None:
+        # Already set up, e.g. by main() before it created the bot
+        return log
 
     # Remove any existing handlers to avoid duplicates
     for handler in log.handlers[:]:
@@ -76,7 +84,6 @@ def setup_logging():
                                        datefmt='%Y-%m-%d %H:%M:%S',
                                        style='{')
     console_handler.setFormatter(console_format)
-    log.addHandler(console_handler)
 
     # File Handler
     file_handler = logging.handlers.RotatingFileHandler(
@@ -86,11 +93,16 @@ def setup_logging():
         backupCount=5
     )
     file_handler.setLevel(logging.INFO)
-    file_format = logging.Formatter('[{asctime}] [{levelname:<8}] {name}: {message}',
-                                    datefmt='%Y-%m-%d %H:%M:%S',
-                                    style='{')
+    if getattr(utilFunc.config, 'LOG_JSON', False):
+        file_format = logs.JSONFormatter()
+    else:
+        file_format = logging.Formatter('[{asctime}] [{levelname:<8}] {name}: {message}',
+                                        datefmt='%Y-%m-%d %H:%M:%S',
+                                        style='{')
     file_handler.setFormatter(file_format)
-    log.addHandler(file_handler)
+
+    # The handlers run on a listener thread, logging calls only put the record on a queue
+    logs.install([console_handler, file_handler])
 
     # Discord.py specific logging
     discord_logger = logging.getLogger('discord')
@@ -168,34 +180,55 @@ class OmelettePy(commands.AutoShardedBot):
         self.pool = None
         self.resumes: defaultdict[int, list[datetime.datetime]] = defaultdict(list)
         self.identifies: defaultdict[int, list[datetime.datetime]] = defaultdict(list)
-
+        self.loop_monitor: LoopMonitor = LoopMonitor()
+        self.latency_history: LatencyHistory = LatencyHistory()
+        self.startup: StartupOrchestrator = StartupOrchestrator(self)
+        self.metrics_server: Optional[instrumentation.MetricsServer] = None
 
     async def setup_hook(self) -> None:
         try:
-            self.session = aiohttp.ClientSession()
+            self.loop_monitor.start()
+            self.session = aiohttp.ClientSession(trace_configs=[instrumentation.http_trace_config()])
             self.pool = await create_pool()
             self.bot_app_info = await self.application_info()
             self.owner_id = self.bot_app_info.team.owner_id
 
             if not self.pool:
                 raise RuntimeError("Failed to create DB pool.")
-            # Load all extensions
-            for extension in initial_extensions:
-                try:
-                    await self.load_extension(extension)
-                    self.log.info('Loaded extension %s.', extension)
-                except Exception as e:
-                    self.log.exception('Failed to load extension %s.',
-                                       extension + f'\n{e}')
+            instrumentation.instrument_pool(self.pool)
+            await self.start_metrics_server()
+            # Load all extensions, failures are logged and don't stop the others
+            await self.startup.load(initial_extensions, extension_dependencies)
         except Exception as e:
             self.log.exception('Failed to initialize bot: %s', e)
             raise
 
+    async def start_metrics_server(self) -> None:
+        port = getattr(utilFunc.config, 'METRICS_PORT', None)
+        if port is None:
+            return
+
+        server = instrumentation.MetricsServer(port, host=getattr(utilFunc.config, 'METRICS_HOST', '127.0.0.1'))
+        try:
+            await server.start()
+        except OSError as e:
+            # The bot works fine without it
+            self.log.error('Could not start the metrics server on port %s: %s', port, e)
+        else:
+            self.metrics_server = server
+
     @property
     def owner(self) -> discord.User:
         return self.bot_app_info.owner
 
+    async def on_command(self, ctx: Context) -> None:
+        instrumentation.command_started(ctx)
+
+    async def on_command_completion(self, ctx: Context) -> None:
+        instrumentation.command_finished(ctx, 'ok')
+
     async def on_command_error(self, ctx: Context, error: commands.CommandError) -> None:
+        instrumentation.command_finished(ctx, 'error')
         if isinstance(error, commands.NoPrivateMessage):
             await ctx.author.send('This command cannot be used in private messages.')
         elif isinstance(error, commands.DisabledCommand):
@@ -330,11 +363,28 @@ class OmelettePy(commands.AutoShardedBot):
         if not hasattr(self, 'uptime'):
             self.uptime = discord.utils.utcnow()
         self.log.info('Logged in as %s (ID: %s)', self.user.name, self.user.id)
+        self.startup.mark_ready()
+
+    async def before_identify_hook(self, shard_id: int, *, initial: bool = False) -> None:
+        self.identifies[shard_id].append(discord.utils.utcnow())
+        await super().before_identify_hook(shard_id, initial=initial)
 
     async def on_shard_resumed(self, shard_id: int) -> None:
         log.info('Shard ID %s has resumed...', shard_id)
         self.resumes[shard_id].append(discord.utils.utcnow())
 
+    async def load_extension(self, name: str, *, package: Optional[str] = None) -> None:
+        await super().load_extension(name, package=package)
+        self.dispatch('extension_change', name)
+
+    async def unload_extension(self, name: str, *, package: Optional[str] = None) -> None:
+        await super().unload_extension(name, package=package)
+        self.dispatch('extension_change', name)
+
+    async def reload_extension(self, name: str, *, package: Optional[str] = None) -> None:
+        await super().reload_extension(name, package=package)
+        self.dispatch('extension_change', name)
+
     async def get_context(self, origin: Union[discord.Interaction, discord.Message], /, *, cls=Context) -> Context:
         return await super().get_context(origin, cls=cls)
 
@@ -380,6 +430,10 @@ class OmelettePy(commands.AutoShardedBot):
             for task in asyncio.all_tasks(self.loop):
                 if task is not asyncio.current_task(self.loop):
                     task.cancel()
+            self.loop_monitor.stop()
+            self.startup.cancel()
+            if self.metrics_server is not None:
+                await self.metrics_server.close()
             # close connection
             if hasattr(self, 'session'):
                 await self.session.close()
@@ -398,7 +452,7 @@ class OmelettePy(commands.AutoShardedBot):
 
     @property
     def reminder(self) -> Optional[Reminder]:
-        return self.get_cog('Reminders')
+        return self.get_cog('Reminder')
 
     @property
     def config_cog(self) -> Optional[ConfigCog]:
@@ -406,6 +460,13 @@ class OmelettePy(commands.AutoShardedBot):
 
 
 def main():
+    # The GUI is optional, the headless launcher never imports Qt
+    import sys
+
+    from PyQt6.QtWidgets import QApplication
+
+    from gui import BotGUI
+
     app = QApplication(sys.argv)
     log = setup_logging()
     try:
@@ -427,10 +488,7 @@ def main():
         log.info('=' * 50)  # Add separator line after session end
         log.info('End of bot session')
         log.info('=' * 50)
-        handlers = log.handlers[:]
-        for hdlr in handlers:
-            hdlr.close()
-            log.removeHandler(hdlr)
+        logs.shutdown()
     return 0
 
 
@@ -6,9 +6,7 @@ import re
 import zlib
 from typing import TYPE_CHECKING, Generator, NamedTuple, Optional, Union
 
-import asyncpg
 import discord
-import lxml.etree as etree
 from discord import app_commands
 from discord.ext import commands
 
@@ -113,11 +111,10 @@ class API(commands.Cog):
         self.issue = re.compile(r'##(?P<number>[0-9]+)')
 
     async def cog_load(self) -> None:
-        self.db = await asyncpg.connect(database="OmelettePy",
-                                        user="postgres",
-                                        password="Astra",
-                                        host="localhost",
-                                        port="5432")
+        # Both need the network and are built on first use anyway, so they
+        # don't hold up startup
+        self.bot.startup.defer('rtfm', self.build_rtfm_lookup_table)
+        self.bot.startup.defer('faq', self.refresh_faq_cache)
 
 
     @property
@@ -230,7 +227,7 @@ class API(commands.Cog):
 
         if ctx.guild and ctx.guild.id in DISCORD_API_ID:
             query = 'INSERT INTO rtfm (user_id) VALUES ($1) ON CONFLICT (user_id) DO UPDATE SET count = rtfm.count + 1;'
-            await self.db.execute(query, ctx.author.id)
+            await self.bot.pool.execute(query, ctx.author.id)
 
     def transform_rtfm_language_key(self, ctx: Union[discord.Interaction, Context], prefix: str):
         if ctx.guild is not None:
@@ -326,7 +323,7 @@ class API(commands.Cog):
         e.set_author(name=str(member), icon_url=member.display_avatar.url)
 
         query = 'SELECT count FROM rtfm WHERE user_id=$1;'
-        record = await self.db.fetchrow(query, member.id)
+        record = await self.bot.pool.fetchrow(query, member.id)
 
         if record is None:
             count = 0
@@ -343,14 +340,14 @@ class API(commands.Cog):
     async def stats(self, ctx: Context, *, member: discord.Member = None):
         """Shows statistics on RTFM usage on a member or the server."""
         query = 'SELECT SUM(count) AS total_uses FROM rtfm;'
-        record: Record = await self.db.fetchrow(query)
+        record: Record = await self.bot.pool.fetchrow(query)
         total_uses: int = record['total_uses']
 
         if member is not None:
             return await self._member_stats(ctx, member, total_uses)
 
         query = 'SELECT user_id, count FROM rtfm ORDER BY count DESC LIMIT 10;'
-        records: list[Record] = await self.db.fetch(query)
+        records: list[Record] = await self.bot.pool.fetch(query)
 
         output = []
         output.append(f'**Total uses**: {total_uses}')
@@ -389,6 +386,8 @@ class API(commands.Cog):
         await ctx.send(f'Found {len(feeds)} feeds.\n{names}')
 
     async def refresh_faq_cache(self):
+        import lxml.etree as etree
+
         self.faq_entries = {}
         base_url = 'https://discordpy.readthedocs.io/en/latest/faq.html'
         async with self.bot.session.get(base_url) as resp:
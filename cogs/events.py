@@ -1,5 +1,4 @@
 import re
-import sqlite3
 import time
 import traceback
 from datetime import datetime
@@ -9,13 +8,7 @@ from discord import app_commands
 from discord.ext import commands
 
 from utilFunc.context import GuildContext, Context
-
-db = sqlite3.connect('quotes.db', timeout=30000)
-cursor = db.cursor()
-cursor.execute('CREATE TABLE IF NOT EXISTS quotes(hash TEXT primary key, '
-               'user TEXT, message TEXT, date_added TEXT, guild_id INT)')
-print("Loaded Quotes database")
-db.commit()
+from utilFunc.quotes import QuoteStore
 
 def to_emoji(c):
     base = 0x1f1e6
@@ -96,6 +89,14 @@ class DisambiguateMember(commands.IDConverter, app_commands.Transformer):
 class Events(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot: commands.Bot = bot
+        self.quotes: QuoteStore = QuoteStore('quotes.db')
+
+    async def cog_load(self) -> None:
+        await self.quotes.open()
+        print("Loaded Quotes database")
+
+    async def cog_unload(self) -> None:
+        await self.quotes.close()
 
     @commands.Cog.listener()
     async def on_ready(self):
@@ -115,31 +116,20 @@ class Events(commands.Cog):
         :param message: The message being quoted
         """
         guild = interaction.guild
-        uniqueID = hash(user + message)
 
         # date and time of the message
         time = datetime.now()
         formatted_time = str(time.strftime("%a, %d %b %Y %H:%M:%S"))
 
-        # find if message is in the db already
-        cursor.execute("SELECT count(*) FROM quotes WHERE hash = ? AND guild_id = ?",
-                       (uniqueID, guild.id))
-        find = cursor.fetchone()[0]
-
-        if find > 0:
+        # insert into database, unless the message is in there already
+        count = await self.quotes.add(guild.id, user, message, formatted_time)
+        if count is None:
             return
 
-        # insert into database
-        cursor.execute("INSERT INTO quotes VALUES(?,?,?,?,?)",
-                       (uniqueID, user, message, formatted_time, guild.id))
         await interaction.response.send_message("Quote added!", ephemeral=True)
 
-        db.commit()
-
-        # number of words in the database
-        rows = cursor.execute("SELECT * from quotes")
         # print logging
-        print(str(len(rows.fetchall())) + ". added - " + str(user) + ": \"" + str(
+        print(str(count) + ". added - " + str(user) + ": \"" + str(
             message) + "\" to database at " + formatted_time)
 
     @commands.hybrid_command(name="get-quote")
@@ -154,19 +144,16 @@ class Events(commands.Cog):
         # user=(user,) <-- Unnecessary, but keeping
         try:
 
-            cursor.execute(
-                "SELECT message,date_added FROM quotes WHERE user=? AND guild_id=? ORDER BY RANDOM() LIMIT 1",
-                (user, guild.id))  # pass parameters as tuple
-            query = cursor.fetchone()
+            query = await self.quotes.random(guild.id, user)
 
             if query is None:
                 await ctx.reply("No quotes found for this user.")
                 return
 
             # Adds quotes to message
-            output = f"\"{query[0]}\""
+            output = f"\"{query.message}\""
             # embeds the output to make it pretty
-            style = discord.Embed(description=f"**{output}**" + f"\n\n*Quoted User:*  {user} \n" + str(query[1]),
+            style = discord.Embed(description=f"**{output}**" + f"\n\n*Quoted User:*  {user} \n" + str(query.date_added),
                                   colour=discord.Color.random())
             # style.set_author(name=output)
             await ctx.reply(embed=style)
@@ -174,8 +161,6 @@ class Events(commands.Cog):
         except Exception as e:
             await ctx.reply(f"Error occurred in command: \n`{str(e)}`")
 
-        db.commit()
-
     @commands.hybrid_command(name="random-quote")
     @commands.cooldown(1, 3, commands.BucketType.user)
     async def rq(self, ctx: GuildContext):
@@ -183,17 +168,17 @@ class Events(commands.Cog):
         This command will get a random quote from a random user.
         """
         guild = ctx.guild
-        cursor.execute("SELECT user,message,date_added FROM quotes WHERE guild_id=(?) ORDER BY RANDOM() LIMIT 1",
-                       (guild.id,))  # tuple parameter for guild ID
-        query = cursor.fetchone()
+        query = await self.quotes.random(guild.id)
+        if query is None:
+            return await ctx.reply("No quotes found in this server.")
 
         # log
-        print(query[0] + ": \"" + query[1] + "\" printed to the screen " + str(query[2]))
+        print(query.user + ": \"" + query.message + "\" printed to the screen " + str(query.date_added))
 
         # embeds the output
         style = discord.Embed(title="responding quote",
-                              description=str(query[1]) +
-                                          "\n\n- "+ str(query[0]) + " " + "\n"+str(query[2]),
+                              description=str(query.message) +
+                                          "\n\n- "+ str(query.user) + " " + "\n"+str(query.date_added),
                               colour=discord.Color.random())
         await ctx.reply(embed=style)
 
@@ -2,19 +2,24 @@ from __future__ import annotations
 
 import asyncio
 import copy
+import datetime
+import heapq
 import inspect
 import io
+import logging
+import re
+import tempfile
 import time
 import traceback
 from contextlib import redirect_stdout
-from typing import TYPE_CHECKING, Any, Awaitable, Callable, Union, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, Literal, Union, Optional
 
 import discord
-import requests
 from discord import app_commands
 from discord.ext import commands
 
 from utilFunc.config import GITHUB_TOKEN
+from utilFunc.github import GitHubClient, GitHubError, GitHubResponse, ResponseCache
 
 # to expose to the eval command
 
@@ -22,6 +27,11 @@ if TYPE_CHECKING:
     from typing_extensions import Self
     from asyncpg import Record
     from utilFunc.context import Context
+    from utilFunc.formats import TabularData
+
+log = logging.getLogger(__name__)
+
+_NEXT_LINK = re.compile(r'<([^>]+)>;\s*rel="next"')
 
 
 class PerformanceMocker:
@@ -81,8 +91,9 @@ class CreateIssue(discord.ui.Modal, title='Create New Issue'):
         max_length=2000
     )
 
-    def __init__(self):
+    def __init__(self, github: GitHubClient):
         super().__init__()
+        self.github: GitHubClient = github
         self.repo_owner = None
         self.repo_name = None
 
@@ -96,32 +107,27 @@ class CreateIssue(discord.ui.Modal, title='Create New Issue'):
 
     async def on_submit(self, interaction: discord.Interaction):
         # GitHub API request to create an issue
-        url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/issues"
-        headers = {
-            "Authorization": f"token {GITHUB_TOKEN}",
-            "Accept": "application/vnd.github+json"
-        }
         data = {
             "title": self.name.value,  # Use the `name` input field for the issue title
             "body": self.content.value  # Use the `content` input field for the issue body
         }
 
-        response = requests.post(url, headers=headers, json=data)
+        response = await self.github.post(f"/repos/{self.repo_owner}/{self.repo_name}/issues", json=data)
 
-        if response.status_code == 201:  # Issue created successfully
-            issue_url = response.json().get("html_url", "Unknown URL")
+        if response.status == 201:  # Issue created successfully
+            issue_url = response.data.get("html_url", "Unknown URL")
             await interaction.response.send_message(
                 f"Issue created successfully! [View Issue]({issue_url})",
                 ephemeral=True
             )
-        elif response.status_code == 404:
+        elif response.status == 404:
             await interaction.response.send_message(
                 "Failed to create issue: Repository not found.",
                 ephemeral=True
             )
         else:
             await interaction.response.send_message(
-                f"Failed to create issue: {response.status_code} {response.text}",
+                f"Failed to create issue: {response.status} {response.data}",
                 ephemeral=True
             )
 
@@ -130,11 +136,346 @@ class CreateIssue(discord.ui.Modal, title='Create New Issue'):
         traceback.print_exception(type(error), error, error.__traceback__)
 
 
+def _parse_github_date(value: str) -> datetime.datetime:
+    # Timestamps are stored as naive UTC
+    return datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+
+
+def _format_github_date(value: datetime.datetime) -> str:
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class RepoWatcher:
+    """Mirrors the commits and issues of every watched repository into Postgres.
+
+    All repositories share one scheduler task that syncs whichever one is due next.
+    Syncs are incremental: the newest commit date and issue update seen are used as
+    ``since`` cursors, and the ETag of the last response is sent back so that an
+    unchanged repository only costs a ``304``, which does not count against the
+    rate limit. When there are more than ``MAX_PAGES`` pages, the rest is fetched
+    in later rounds: commits come newest first, so the cursor stays put and the
+    older ones are fetched with an ``until`` bound, issues come oldest first and
+    the cursor simply moves on.
+    """
+
+    SYNC_INTERVAL = 300.0
+    # How many pages of a single endpoint to fetch per sync, the rest is picked up next time
+    MAX_PAGES = 3
+    # How soon to come back to a repository that had more pages left
+    BACKLOG_DELAY = 5.0
+    ERROR_DELAY = 900.0
+
+    def __init__(self, bot: commands.Bot, github: GitHubClient):
+        self.bot: commands.Bot = bot
+        self.github: GitHubClient = github
+        self._queue: list[tuple[float, str]] = []
+        self._due: dict[str, float] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, full_name: str) -> bool:
+        return full_name in self._due
+
+    async def start(self) -> None:
+        query = "SELECT full_name, last_synced FROM github_repos;"
+        records = await self.bot.pool.fetch(query)
+        now = time.time()
+        for record in records:
+            last_synced = record['last_synced']
+            if last_synced is None:
+                self.schedule(record['full_name'], now)
+            else:
+                synced_at = last_synced.replace(tzinfo=datetime.timezone.utc).timestamp()
+                self.schedule(record['full_name'], max(now, synced_at + self.SYNC_INTERVAL))
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def schedule(self, full_name: str, when: Optional[float] = None) -> None:
+        when = time.time() if when is None else when
+        self._due[full_name] = when
+        heapq.heappush(self._queue, (when, full_name))
+        self._wakeup.set()
+
+    def discard(self, full_name: str) -> None:
+        # The heap entry is skipped once it comes up
+        self._due.pop(full_name, None)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            if not self._queue:
+                await self._wakeup.wait()
+                continue
+
+            when, full_name = self._queue[0]
+            if self._due.get(full_name) != when:
+                heapq.heappop(self._queue)
+                continue
+
+            delay = when - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._queue)
+            del self._due[full_name]
+            error: Optional[str] = None
+            try:
+                backlog = await self.sync(full_name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning('Could not sync GitHub repository %s', full_name, exc_info=e)
+                error = str(e)
+                next_sync = self.ERROR_DELAY
+            else:
+                next_sync = self.BACKLOG_DELAY if backlog else self.SYNC_INTERVAL
+
+            # This task is shared by every repository, so a database error here must not end it
+            try:
+                if error is not None:
+                    await self.bot.pool.execute(
+                        "UPDATE github_repos SET sync_error = $2 WHERE full_name = $1;", full_name, error
+                    )
+                # It might have been unwatched while syncing
+                exists = await self.bot.pool.fetchval("SELECT 1 FROM github_repos WHERE full_name = $1;", full_name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning('Could not update the sync state of GitHub repository %s', full_name, exc_info=e)
+                exists = True
+                next_sync = self.ERROR_DELAY
+
+            if exists and full_name not in self._due:
+                self.schedule(full_name, time.time() + next_sync)
+
+    async def _fetch_pages(
+            self, path: str, params: dict[str, Any], etag: Optional[str]
+    ) -> tuple[Optional[GitHubResponse], list[Any], bool]:
+        """Returns the first response, every item, and whether pages were left over.
+
+        The first response is ``None`` if nothing changed since ``etag``.
+        """
+        headers = {'If-None-Match': etag} if etag else None
+        first = await self.github.request('GET', path, params=params, headers=headers)
+        if first.status == 304:
+            return None, [], False
+        if first.status != 200:
+            raise GitHubError(first.status, str(first.data))
+
+        items = list(first.data)
+        response = first
+        for _ in range(self.MAX_PAGES - 1):
+            match = _NEXT_LINK.search(response.headers.get('Link', ''))
+            if match is None:
+                return first, items, False
+
+            response = await self.github.request('GET', match.group(1))
+            if response.status != 200:
+                raise GitHubError(response.status, str(response.data))
+            items.extend(response.data)
+
+        return first, items, _NEXT_LINK.search(response.headers.get('Link', '')) is not None
+
+    async def sync(self, full_name: str) -> bool:
+        """Syncs a single repository. Returns ``True`` if it has more to fetch."""
+        record = await self.bot.pool.fetchrow("SELECT * FROM github_repos WHERE full_name = $1;", full_name)
+        if record is None:
+            return False
+
+        commits_backlog = await self._sync_commits(record)
+        issues_backlog = await self._sync_issues(record)
+        query = "UPDATE github_repos SET last_synced = (now() at time zone 'utc'), sync_error = NULL WHERE full_name = $1;"
+        await self.bot.pool.execute(query, full_name)
+        return commits_backlog or issues_backlog
+
+    async def _sync_commits(self, record: Record) -> bool:
+        full_name = record['full_name']
+        since: Optional[datetime.datetime] = record['commits_since']
+        until: Optional[datetime.datetime] = record['commits_until']
+        params: dict[str, Any] = {'per_page': 100}
+        if since is not None:
+            params['since'] = _format_github_date(since)
+        if until is not None:
+            params['until'] = _format_github_date(until)
+
+        # The ETag only applies to the URL it came from, a backlog round asks for a different one
+        etag = record['commits_etag'] if until is None else None
+        response, commits, backlog = await self._fetch_pages(f'/repos/{full_name}/commits', params, etag)
+        if response is None:
+            return False
+
+        # The first sync only wants the recent history, not the whole repository
+        if since is None:
+            backlog = False
+
+        rows = [
+            (
+                full_name,
+                commit['sha'],
+                commit['commit']['message'],
+                commit['commit']['author']['name'] if commit['commit']['author'] else None,
+                commit['html_url'],
+                _parse_github_date(commit['commit']['committer']['date']),
+            )
+            for commit in commits
+        ]
+        seen = [date for date in (since, record['commits_pending'], *(row[5] for row in rows)) if date is not None]
+        newest = max(seen, default=None)
+        if backlog:
+            # Commits come newest first, so whatever is left is older than everything fetched.
+            # The cursor stays put until those are fetched too, up to the oldest commit of this round.
+            cursor, until, pending, etag = since, min(row[5] for row in rows), newest, None
+        else:
+            cursor, pending = newest, None
+            # The ETag belongs to the URL with the old cursor, it's only worth keeping if the cursor stays
+            etag = response.headers.get('ETag') if newest == since and until is None else None
+            until = None
+
+        async with self.bot.pool.acquire() as con:
+            async with con.transaction():
+                if rows:
+                    query = """INSERT INTO github_commits (repo, sha, message, author, url, committed_at)
+                               VALUES ($1, $2, $3, $4, $5, $6)
+                               ON CONFLICT (repo, sha) DO NOTHING;
+                            """
+                    await con.executemany(query, rows)
+                query = """UPDATE github_repos
+                           SET commits_since = $2, commits_etag = $3, commits_until = $4, commits_pending = $5
+                           WHERE full_name = $1;
+                        """
+                await con.execute(query, full_name, cursor, etag, until, pending)
+        return backlog
+
+    async def _sync_issues(self, record: Record) -> bool:
+        full_name = record['full_name']
+        since: Optional[datetime.datetime] = record['issues_since']
+        params: dict[str, Any] = {'state': 'all', 'sort': 'updated', 'direction': 'asc', 'per_page': 100}
+        if since is not None:
+            params['since'] = _format_github_date(since)
+
+        response, issues, backlog = await self._fetch_pages(
+            f'/repos/{full_name}/issues', params, record['issues_etag']
+        )
+        if response is None:
+            return False
+
+        rows = [
+            (
+                full_name,
+                issue['number'],
+                issue['title'],
+                issue['html_url'],
+                issue['state'],
+                'pull_request' in issue,
+                _parse_github_date(issue['updated_at']),
+            )
+            for issue in issues
+        ]
+        newest = max((row[6] for row in rows), default=since)
+        etag = response.headers.get('ETag') if newest == since else None
+
+        async with self.bot.pool.acquire() as con:
+            async with con.transaction():
+                if rows:
+                    query = """INSERT INTO github_issues (repo, number, title, url, state, is_pull, updated_at)
+                               VALUES ($1, $2, $3, $4, $5, $6, $7)
+                               ON CONFLICT (repo, number) DO UPDATE
+                               SET title = EXCLUDED.title,
+                                   url = EXCLUDED.url,
+                                   state = EXCLUDED.state,
+                                   updated_at = EXCLUDED.updated_at;
+                            """
+                    await con.executemany(query, rows)
+                # Issues come oldest update first, until the backlog is drained the mirror is missing the recent ones
+                query = """UPDATE github_repos
+                           SET issues_since = $2, issues_etag = $3, issues_complete = issues_complete OR $4
+                           WHERE full_name = $1;
+                        """
+                await con.execute(query, full_name, newest, etag, not backlog)
+        return backlog
+
+
+class SQLResult:
+    """The outcome of :meth:`Git.stream_sql`."""
+
+    __slots__ = ('table', 'status', 'rows', 'truncated', 'server_time', 'client_time')
+
+    def __init__(self):
+        self.table: Optional[TabularData] = None
+        self.status: str = ''
+        self.rows: int = 0
+        self.truncated: bool = False
+        self.server_time: float = 0.0
+        self.client_time: float = 0.0
+
+    def add_batch(self, records: list[Record]) -> None:
+        assert self.table is not None
+        start = time.perf_counter()
+        limit = Git.SQL_CELL_LIMIT
+        self.table.add_rows(
+            [value if len(value) <= limit else f'{value[:limit - 1]}…' for value in map(str, record.values())]
+            for record in records
+        )
+        self.rows += len(records)
+        self.client_time += time.perf_counter() - start
+
+
 class Git(commands.Cog):
+    github: GitHubClient
+    watcher: RepoWatcher
+
+    SQL_ROW_LIMIT = 5000
+    SQL_BATCH_SIZE = 500
+    # Longer cells are cut short, otherwise one huge JSON column makes the whole table unreadable
+    SQL_CELL_LIMIT = 200
+    # In seconds
+    SQL_TIMEOUT = 30.0
+    # Results bigger than this (in bytes) are spooled to disk before being uploaded
+    SQL_SPOOL_SIZE = 1024 * 1024
+
     def __init__(self, bot: commands.Bot):
         self.bot: commands.Bot = bot
         self._last_result: Optional[Any] = None
         self.sessions: set[int] = set()
+        # cProfile and the stack sampler see everything on the thread, so only one profile runs at a time
+        self._profiling = asyncio.Lock()
+
+    async def cog_load(self) -> None:
+        cache = ResponseCache(ttl=60.0, path='github_cache.sqlite3')
+        self.github = GitHubClient(self.bot.session, token=GITHUB_TOKEN or None, cache=cache)
+        self.watcher = RepoWatcher(self.bot, self.github)
+        await self.watcher.start()
+
+    async def cog_unload(self) -> None:
+        self.watcher.stop()
+        if self.github.cache is not None:
+            self.github.cache.close()
+
+    async def cog_command_error(self, ctx: commands.Context, error: commands.CommandError):
+        if isinstance(error, commands.CommandInvokeError) and isinstance(error.original, GitHubError):
+            await ctx.send(f'GitHub request failed: {error.original.message}')
+
+    async def cog_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        original = getattr(error, 'original', error)
+        if isinstance(original, GitHubError):
+            message = f'GitHub request failed: {original.message}'
+            if interaction.response.is_done():
+                await interaction.followup.send(message, ephemeral=True)
+            else:
+                await interaction.response.send_message(message, ephemeral=True)
 
     def cleanup_code(self, content: str) -> str:
         """Automatically removes code blocks from the code."""
@@ -149,36 +490,51 @@ class Git(commands.Cog):
         return f'```py\n{e.text}{"^":>{e.offset}}\n{e.__class__.__name__}: {e}```'
 
 
-    # Function to fetch the latest commit from a GitHub repository
-    @staticmethod
-    def get_latest_commit(repo_owner, repo_name):
-        url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/commits"
-        headers = {"Authorization": f"token {GITHUB_TOKEN}"} if GITHUB_TOKEN else {}
+    async def is_mirrored(self, full_name: str, *, issues: bool = False) -> bool:
+        """Whether the mirror can answer for a repository instead of the API.
 
-        response = requests.get(url, headers=headers)
+        Issues are only mirrored completely once the first pass over them finished.
+        """
+        if issues:
+            query = "SELECT last_synced IS NOT NULL AND issues_complete FROM github_repos WHERE full_name = $1;"
+        else:
+            query = "SELECT last_synced IS NOT NULL FROM github_repos WHERE full_name = $1;"
+        return bool(await self.bot.pool.fetchval(query, full_name))
 
-        if response.status_code == 200:
-            commit_data = response.json()[0]  # Get the latest commit
+    # Function to fetch the latest commit from a GitHub repository
+    async def get_latest_commit(self, repo_owner: str, repo_name: str) -> str:
+        full_name = f'{repo_owner}/{repo_name}'.lower()
+        if await self.is_mirrored(full_name):
+            query = """SELECT message, author, url
+                       FROM github_commits
+                       WHERE repo = $1
+                       ORDER BY committed_at DESC
+                       LIMIT 1;
+                    """
+            record = await self.bot.pool.fetchrow(query, full_name)
+            if record is not None:
+                return f"Latest Commit: \n**Message**: {record['message']}\n**Author**: {record['author']}\n[View Commit]({record['url']})"
+
+        response = await self.github.get(f"/repos/{repo_owner}/{repo_name}/commits", params={"per_page": 1})
+
+        if response.status == 200:
+            commit_data = response.data[0]  # Get the latest commit
             commit_message = commit_data['commit']['message']
             author = commit_data['commit']['author']['name']
             commit_url = commit_data['html_url']
             return f"Latest Commit: \n**Message**: {commit_message}\n**Author**: {author}\n[View Commit]({commit_url})"
-        elif response.status_code == 404:
+        elif response.status == 404:
             return "Repository not found. Please check the owner and repository name."
         else:
-            return f"Failed to fetch commit data. HTTP Status: {response.status_code}"
+            return f"Failed to fetch commit data. HTTP Status: {response.status}"
 
-    @staticmethod
     # Function to search repositories on GitHub
-    def search_repositories(query, sort="stars", order="desc"):
-        url = "https://api.github.com/search/repositories"
-        headers = {"Authorization": f"token {GITHUB_TOKEN}"} if GITHUB_TOKEN else {}
-        params = {"q": query, "sort": sort, "order": order}
-
-        response = requests.get(url, headers=headers, params=params)
+    async def search_repositories(self, query: str, sort: str = "stars", order: str = "desc") -> str:
+        params = {"q": query, "sort": sort, "order": order, "per_page": 3}
+        response = await self.github.get("/search/repositories", params=params)
 
-        if response.status_code == 200:
-            repo_data = response.json()
+        if response.status == 200:
+            repo_data = response.data
             if repo_data["total_count"] == 0:
                 return "No repositories found matching the search query."
 
@@ -193,17 +549,30 @@ class Git(commands.Cog):
 
             return result
         else:
-            return f"Failed to search repositories. HTTP Status: {response.status_code}"
+            return f"Failed to search repositories. HTTP Status: {response.status}"
+
+    async def get_open_issues(self, repo_owner: str, repo_name: str) -> str:
+        full_name = f'{repo_owner}/{repo_name}'.lower()
+        if await self.is_mirrored(full_name, issues=True):
+            query = """SELECT number, title, url
+                       FROM github_issues
+                       WHERE repo = $1 AND state = 'open'
+                       ORDER BY number DESC
+                       LIMIT 5;
+                    """
+            records = await self.bot.pool.fetch(query, full_name)
+            if not records:
+                return "No open issues found in this repository."
 
-    @staticmethod
-    def get_open_issues(repo_owner, repo_name):
-        url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/issues"
-        headers = {"Authorization": f"token {GITHUB_TOKEN}"} if GITHUB_TOKEN else {}
+            result = "**Open Issues:**\n"
+            for record in records:
+                result += f"🔹 **#{record['number']}: [{record['title']}]({record['url']})**\n"
+            return result
 
-        response = requests.get(url, headers=headers)
+        response = await self.github.get(f"/repos/{repo_owner}/{repo_name}/issues", params={"per_page": 5})
 
-        if response.status_code == 200:
-            issues = response.json()
+        if response.status == 200:
+            issues = response.data
             if not issues:
                 return "No open issues found in this repository."
 
@@ -216,10 +585,10 @@ class Git(commands.Cog):
                 result += f"🔹 **#{issue_number}: [{issue_title}]({issue_url})**\n"
 
             return result
-        elif response.status_code == 404:
+        elif response.status == 404:
             return "Repository not found. Please check the owner and repository name."
         else:
-            return f"Failed to fetch issues. HTTP Status: {response.status_code}"
+            return f"Failed to fetch issues. HTTP Status: {response.status}"
 
     # Define the hybrid command to get the latest commit
     @commands.hybrid_command(name="latest_commit", description="Get the latest commit from a GitHub repository")
@@ -227,7 +596,7 @@ class Git(commands.Cog):
     async def latest_commit(self, ctx: commands.Context, owner: str, repo: str):
         await ctx.defer()  # Defers the response to allow time for processing
 
-        commit_info = self.get_latest_commit(owner, repo)  # call static func
+        commit_info = await self.get_latest_commit(owner, repo)
         await ctx.send(commit_info)
 
     @app_commands.command(name="create_issue", description="Create a new issue")
@@ -241,7 +610,7 @@ class Git(commands.Cog):
             )
             return
 
-        modal = CreateIssue()
+        modal = CreateIssue(self.github)
         modal.set_repo(repo_owner=owner, repo_name=repo)
         await interaction.response.send_modal(modal)
 
@@ -252,7 +621,7 @@ class Git(commands.Cog):
     async def search_repos(self, interaction: discord.Interaction, query: str, sort: str = "stars",
                            order: str = "desc"):
         await interaction.response.defer()  # Defers the response to allow time for processing
-        search_result = self.search_repositories(query, sort, order)
+        search_result = await self.search_repositories(query, sort, order)
         await interaction.followup.send(search_result)
 
     # Define the slash command to list open issues
@@ -261,7 +630,7 @@ class Git(commands.Cog):
     async def list_issues(self, interaction: discord.Interaction, owner: str, repo: str):
         await interaction.response.defer()  # Defer response for processing time
 
-        issues = self.get_open_issues(owner, repo)
+        issues = await self.get_open_issues(owner, repo)
         await interaction.followup.send(issues)
 
     # Show user github profile depending on whether they have it stored in user_settings or not
@@ -282,14 +651,11 @@ class Git(commands.Cog):
             git = record['github_username']
 
         # fetch boy, fetch
-        url = f"https://api.github.com/users/{git}"
-        headers = {"Authorization": f"token {GITHUB_TOKEN}"} if GITHUB_TOKEN else {}
         try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
+            response = await self.github.get(f"/users/{git}")
 
-            if response.status_code == 200:
-                data = response.json()
+            if response.status == 200:
+                data = response.data
                 embed = discord.Embed(
                     title=data['login'],
                     url=data['html_url'],
@@ -316,57 +682,233 @@ class Git(commands.Cog):
                 embed.set_footer(text=f"Profile created: {data['created_at'][:10]}")
 
                 await interaction.followup.send(embed=embed)
-            elif response.status_code == 404:
+            elif response.status == 404:
                 await interaction.followup.send(f"GitHub user `{git}` not found.")
             else:
-                await interaction.followup.send(f"Failed to fetch GitHub profile. Status code: {response.status_code}")
+                await interaction.followup.send(f"Failed to fetch GitHub profile. Status code: {response.status}")
         except Exception as e:
             await interaction.followup.send(f"Error occurd {str(e)}")
 
+    @commands.hybrid_group(name='github')
+    @commands.guild_only()
+    @app_commands.guild_only()
+    async def github_group(self, ctx: Context):
+        """Manages the GitHub repositories this server watches."""
+        await ctx.send_help(ctx.command)
+
+    @github_group.command(name='watch')
+    @commands.guild_only()
+    @commands.has_guild_permissions(manage_guild=True)
+    @app_commands.describe(owner="Owner of the repository", repo="Name of the repository")
+    async def github_watch(self, ctx: Context, owner: str, repo: str):
+        """Keeps a local copy of a repository's commits and issues.
+
+        Commands asking about a watched repository are answered from
+        the local copy instead of asking GitHub every time.
+        """
+        assert ctx.guild is not None
+        await ctx.defer()
+        response = await self.github.get(f'/repos/{owner}/{repo}')
+        if response.status == 404:
+            return await ctx.send('Repository not found. Please check the owner and repository name.')
+        if response.status != 200:
+            return await ctx.send(f'Failed to fetch the repository. HTTP Status: {response.status}')
+
+        owner, repo = response.data['owner']['login'], response.data['name']
+        full_name = f'{owner}/{repo}'.lower()
+        async with self.bot.pool.acquire() as con:
+            async with con.transaction():
+                query = """INSERT INTO github_repos (full_name, owner, name)
+                           VALUES ($1, $2, $3)
+                           ON CONFLICT (full_name) DO NOTHING;
+                        """
+                await con.execute(query, full_name, owner, repo)
+                query = """INSERT INTO github_watched_repos (guild_id, repo)
+                           VALUES ($1, $2)
+                           ON CONFLICT (guild_id, repo) DO NOTHING
+                           RETURNING id;
+                        """
+                created = await con.fetchval(query, ctx.guild.id, full_name)
+
+        if created is None:
+            return await ctx.send(f'Already watching {owner}/{repo}.')
+
+        if full_name not in self.watcher:
+            self.watcher.schedule(full_name)
+        await ctx.send(f'Now watching {owner}/{repo}.')
+
+    @github_group.command(name='unwatch')
+    @commands.guild_only()
+    @commands.has_guild_permissions(manage_guild=True)
+    @app_commands.describe(owner="Owner of the repository", repo="Name of the repository")
+    async def github_unwatch(self, ctx: Context, owner: str, repo: str):
+        """Stops watching a repository."""
+        assert ctx.guild is not None
+        full_name = f'{owner}/{repo}'.lower()
+        async with self.bot.pool.acquire() as con:
+            async with con.transaction():
+                query = "DELETE FROM github_watched_repos WHERE guild_id = $1 AND repo = $2 RETURNING id;"
+                deleted = await con.fetchval(query, ctx.guild.id, full_name)
+                if deleted is None:
+                    return await ctx.send('This server is not watching that repository.')
+
+                # Drop the mirror once nobody is watching it anymore
+                query = """DELETE FROM github_repos
+                           WHERE full_name = $1
+                           AND NOT EXISTS (SELECT 1 FROM github_watched_repos WHERE repo = $1)
+                           RETURNING full_name;
+                        """
+                dropped = await con.fetchval(query, full_name)
+
+        if dropped is not None:
+            self.watcher.discard(full_name)
+        await ctx.send(f'No longer watching {owner}/{repo}.')
+
+    @github_group.command(name='watching')
+    @commands.guild_only()
+    async def github_watching(self, ctx: Context):
+        """Lists the repositories this server watches."""
+        assert ctx.guild is not None
+        query = """SELECT r.owner, r.name, r.last_synced, r.sync_error
+                   FROM github_watched_repos w
+                   INNER JOIN github_repos r ON r.full_name = w.repo
+                   WHERE w.guild_id = $1
+                   ORDER BY w.created_at;
+                """
+        records = await ctx.db.fetch(query, ctx.guild.id)
+        if not records:
+            return await ctx.send('This server is not watching any repositories.')
+
+        lines = []
+        for record in records:
+            if record['last_synced'] is None:
+                status = 'not synced yet'
+            else:
+                synced = record['last_synced'].replace(tzinfo=datetime.timezone.utc)
+                status = f'synced {discord.utils.format_dt(synced, "R")}'
+            if record['sync_error']:
+                status += ' (last sync failed)'
+            lines.append(f"- {record['owner']}/{record['name']}: {status}")
+        await ctx.send('\n'.join(lines))
+
     @commands.group(hidden=True, invoke_without_command=True)
     @commands.is_owner()
     async def sql(self, ctx: Context, *, query: str):
-        """Run some SQL."""
+        """Run some SQL.
+
+        Results are streamed from a cursor and capped at a few thousand rows,
+        so a careless query on a big table cannot take the bot down.
+        """
         # the imports are here because I imagine some people would want to use
         # this cog as a base for their other cog, and since this one is kinda
         # odd and unnecessary for most people, I will make it easy to remove
         # for those people.
-        from utilFunc.formats import TabularData, plural
-        import time
+        from utilFunc.formats import plural
 
         query = self.cleanup_code(query)
-
         is_multistatement = query.count(';') > 1
-        strategy: Callable[[str], Union[Awaitable[list[Record]], Awaitable[str]]]
-        if is_multistatement:
-            # fetch does not support multiple statements
-            strategy = ctx.db.execute
-        else:
-            strategy = ctx.db.fetch
 
         try:
-            start = time.perf_counter()
-            results = await strategy(query)
-            dt = (time.perf_counter() - start) * 1000.0
+            if is_multistatement:
+                # cursors do not support multiple statements
+                start = time.perf_counter()
+                status = await ctx.db.execute(query)
+                dt = (time.perf_counter() - start) * 1000.0
+                return await ctx.send(f'`{dt:.2f}ms: {status}`')
+
+            result = await self.stream_sql(query)
         except Exception:
             return await ctx.send(f'```py\n{traceback.format_exc()}\n```')
 
-        rows = len(results)
-        if isinstance(results, str) or rows == 0:
-            return await ctx.send(f'`{dt:.2f}ms: {results}`')
+        if result.table is None:
+            return await ctx.send(f'`{result.server_time * 1000.0:.2f}ms: {result.status}`')
 
-        headers = list(results[0].keys())
-        table = TabularData()
-        table.set_columns(headers)
-        table.add_rows(list(r.values()) for r in results)
-        render = table.render()
+        truncated = ' (truncated)' if result.truncated else ''
+        rate = result.rows / result.server_time if result.server_time else 0.0
+        footer = (
+            f'*Returned {plural(result.rows):row}{truncated} in {result.server_time * 1000.0:.2f}ms '
+            f'({rate:,.0f} rows/s), formatted in {result.client_time * 1000.0:.2f}ms*'
+        )
+        await self.send_table(ctx, result.table, footer=footer)
+
+    async def stream_sql(self, query: str, *args: Any) -> SQLResult:
+        """Runs a single statement through a cursor, keeping at most ``SQL_ROW_LIMIT`` rows.
+
+        The time spent waiting on Postgres and the time spent formatting rows are
+        measured separately.
+        """
+        from utilFunc.formats import TabularData
 
-        fmt = f'```\n{render}\n```\n*Returned {plural(rows):row} in {dt:.2f}ms*'
-        if len(fmt) > 2000:
-            fp = io.BytesIO(fmt.encode('utf-8'))
-            await ctx.send('Too many results...', file=discord.File(fp, 'results.txt'))
+        result = SQLResult()
+        async with self.bot.pool.acquire() as con:
+            async with con.transaction():
+                await con.execute(f"SET LOCAL statement_timeout = {int(self.SQL_TIMEOUT * 1000)};")
+                start = time.perf_counter()
+                stmt = await con.prepare(query)
+                attributes = stmt.get_attributes()
+                if not attributes:
+                    await stmt.fetch(*args)
+                    result.server_time = time.perf_counter() - start
+                    result.status = stmt.get_statusmsg()
+                    return result
+
+                table = result.table = TabularData()
+                table.set_columns([attr.name for attr in attributes])
+                cursor = stmt.cursor(*args, prefetch=self.SQL_BATCH_SIZE)
+                batch = []
+                async for record in cursor:
+                    if result.rows + len(batch) >= self.SQL_ROW_LIMIT:
+                        result.truncated = True
+                        break
+
+                    batch.append(record)
+                    if len(batch) >= self.SQL_BATCH_SIZE:
+                        result.server_time += time.perf_counter() - start
+                        result.add_batch(batch)
+                        batch = []
+                        start = time.perf_counter()
+
+                result.server_time += time.perf_counter() - start
+                result.add_batch(batch)
+
+        return result
+
+    async def send_table(self, ctx: Context, table: TabularData, *, footer: str = '', filename: str = 'results.txt'):
+        """Sends a table inline if it fits in a message, otherwise as a file.
+
+        The file is written in chunks to a spooled temporary file, so large tables
+        never exist as one string in memory.
+        """
+        lines = table.render_iter()
+        head: list[str] = []
+        size = len(footer) + 8
+        for line in lines:
+            head.append(line)
+            size += len(line) + 1
+            if size > 2000:
+                break
         else:
-            await ctx.send(fmt)
+            fmt = '\n'.join(head)
+            return await ctx.send(f'```\n{fmt}\n```\n{footer}')
+
+        fp = tempfile.SpooledTemporaryFile(max_size=self.SQL_SPOOL_SIZE)
+        self._write_lines(fp, head)
+        await asyncio.to_thread(self._write_lines, fp, lines)
+        fp.seek(0)
+        await ctx.send(f'Too many results...\n{footer}', file=discord.File(fp, filename))
+
+    @staticmethod
+    def _write_lines(fp: Any, lines: Iterable[str], chunk_size: int = 1000) -> None:
+        chunk: list[str] = []
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                chunk.append('')
+                fp.write('\n'.join(chunk).encode('utf-8'))
+                chunk = []
+        if chunk:
+            chunk.append('')
+            fp.write('\n'.join(chunk).encode('utf-8'))
 
     async def send_sql_results(self, ctx: Context, records: list[Any]):
         from utilFunc.formats import TabularData
@@ -375,14 +917,7 @@ class Git(commands.Cog):
         table = TabularData()
         table.set_columns(headers)
         table.add_rows(list(r.values()) for r in records)
-        render = table.render()
-
-        fmt = f'```\n{render}\n```'
-        if len(fmt) > 2000:
-            fp = io.BytesIO(fmt.encode('utf-8'))
-            await ctx.send('Too many results...', file=discord.File(fp, 'results.txt'))
-        else:
-            await ctx.send(fmt)
+        await self.send_table(ctx, table)
 
     @sql.command(name='schema', hidden=True)
     async def sql_schema(self, ctx: Context, *, table_name: str):
@@ -577,6 +1112,89 @@ class Git(commands.Cog):
 
         await ctx.send(f'Status: ✅ Time: {(end - start) * 1000:.2f}ms')
 
+    @commands.command(hidden=True)
+    @commands.is_owner()
+    async def profile(
+            self,
+            ctx: Context,
+            runs: Optional[int] = 10,
+            profiler: Optional[Literal['cprofile', 'sample']] = None,
+            *,
+            command: str,
+    ):
+        """Profiles a command over multiple runs, suppressing Discord calls like perf does.
+
+        Reports the p50/p95/p99 timings and the number of database queries and
+        HTTP requests per run. The profiler can be "cprofile" for deterministic
+        profiling or "sample" for a sampling profile, which is uploaded as
+        collapsed stacks that flame graph tools can read.
+        """
+        import cProfile
+        import pstats
+
+        from utilFunc.formats import plural
+        from utilFunc.profiling import CallCounter, StackSampler, percentile
+
+        runs = max(1, min(runs or 10, 100))
+        msg = copy.copy(ctx.message)
+        msg.content = ctx.prefix + command
+
+        durations: list[float] = []
+        failures = 0
+        sampler = StackSampler() if profiler == 'sample' else None
+        cprofiler = cProfile.Profile() if profiler == 'cprofile' else None
+
+        if self._profiling.locked():
+            return await ctx.send('Another profile is already running, try again once it is done.')
+
+        async with self._profiling:
+            with CallCounter() as counter:
+                for _ in range(runs):
+                    new_ctx = await self.bot.get_context(msg, cls=type(ctx))
+                    new_ctx._state = PerformanceMocker()  # type: ignore
+                    new_ctx.channel = PerformanceMocker()  # type: ignore
+                    if new_ctx.command is None:
+                        return await ctx.send('No command found')
+
+                    if sampler is not None:
+                        sampler.start()
+                    if cprofiler is not None:
+                        cprofiler.enable()
+
+                    start = time.perf_counter()
+                    try:
+                        await new_ctx.command.invoke(new_ctx)
+                    except commands.CommandError:
+                        failures += 1
+                    finally:
+                        durations.append(time.perf_counter() - start)
+                        if cprofiler is not None:
+                            cprofiler.disable()
+                        if sampler is not None:
+                            sampler.stop()
+
+        def ms(seconds: float) -> str:
+            return f'{seconds * 1000:.2f}ms'
+
+        status = '✅' if failures == 0 else f'❌ ({plural(failures):failure})'
+        lines = [
+            f'Status: {status} over {plural(runs):run}',
+            f'p50: {ms(percentile(durations, 50))} p95: {ms(percentile(durations, 95))} '
+            f'p99: {ms(percentile(durations, 99))} max: {ms(max(durations))}',
+            f'DB queries: {counter["db"] / runs:g}/run HTTP requests: {counter["http"] / runs:g}/run',
+        ]
+
+        files = []
+        if sampler is not None:
+            lines.append(f'Samples: {sampler.total}')
+            files.append(discord.File(io.BytesIO(sampler.collapsed().encode('utf-8')), 'profile.collapsed'))
+        if cprofiler is not None:
+            buffer = io.StringIO()
+            pstats.Stats(cprofiler, stream=buffer).sort_stats('cumulative').print_stats(50)
+            files.append(discord.File(io.BytesIO(buffer.getvalue().encode('utf-8')), 'profile.txt'))
+
+        await ctx.send('\n'.join(lines), files=files)
+
 
 async def setup(bot):
     await bot.add_cog(Git(bot))
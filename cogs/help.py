@@ -1,7 +1,9 @@
 import asyncio
+import bisect
 import inspect
 import math
-from typing import List, Optional, Union, Any, Dict, TypeVar
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Union, Any, Dict, TypeVar
 
 import discord
 from discord import app_commands
@@ -24,11 +26,12 @@ BotT = TypeVar('BotT', bound=commands.Bot)
 class HelpView(discord.ui.View):
 
     def __init__(self, cog: 'HelpCog', ctx: ContextType,
-                 categories: Dict[str, List[CommandType]]):
+                 categories: Dict[str, List['HelpEntry']], is_owner: bool = False):
         super().__init__(timeout=VIEW_TIMEOUT)
         self.cog: HelpCog = cog
         self.ctx: ContextType = ctx
-        self.categories: Dict[str, List[CommandType]] = categories
+        self.categories: Dict[str, List['HelpEntry']] = categories
+        self.is_owner: bool = is_owner
         self.current_category: Optional[str] = None
         self.current_page: int = 0
         self.last_interaction_time: float = asyncio.get_event_loop().time()
@@ -108,43 +111,10 @@ class HelpView(discord.ui.View):
             self.next_button.disabled = True
 
     def create_home_embed(self) -> discord.Embed:
-        embed = discord.Embed(
-            title=f"**{self.cog.embed_title}**",
-            description=
-            "This is a help menu.\n"
-            "Use the buttons to switch between file types and commands.",
-            color=self.cog.embed_color)
-        for category, commands in self.categories.items():
-            if category not in ["Home", "Owner"]:
-                embed.add_field(name=f"**{category}**",
-                                value=f"`{len(commands)}` commands",
-                                inline=True)
-        embed.set_footer(text=self.cog.embed_footer.format(
-            prefix=self.get_prefix()))
-        return embed
+        return self.cog.index.home_embed(self.get_prefix(), self.is_owner)
 
     def create_category_embed(self, category: str) -> discord.Embed:
-        commands = self.categories[category]
-        start_idx = self.current_page * COMMANDS_PER_PAGE
-        end_idx = start_idx + COMMANDS_PER_PAGE
-        page_commands = commands[start_idx:end_idx]
-
-        embed = discord.Embed(title=f"**{category} Commands**",
-                              color=self.cog.embed_color)
-
-        for command in page_commands:
-            cmd_name = self.get_command_name(command)
-            embed.add_field(name=f"**`{cmd_name}`**",
-                            value=command.description
-                            or "No description available.",
-                            inline=False)
-
-        total_pages = math.ceil(len(commands) / COMMANDS_PER_PAGE)
-        embed.set_footer(
-            text=
-            f"Page {self.current_page + 1}/{total_pages} • {self.cog.embed_footer.format(prefix=self.get_prefix())}"
-        )
-        return embed
+        return self.cog.index.category_embed(category, self.current_page, self.get_prefix(), self.is_owner)
 
     def get_prefix(self) -> str:
         if isinstance(self.ctx, commands.Context):
@@ -165,6 +135,186 @@ class HelpView(discord.ui.View):
             self.ctx, commands.Context) else self.ctx.user
 
 
+class HelpEntry(NamedTuple):
+    qualified_name: str
+    description: str
+    usage: str
+    owner_only: bool
+    category: str
+    command: CommandType
+
+
+class HelpIndex:
+    """Everything the help command needs, computed once.
+
+    The index is marked stale whenever an extension is loaded, unloaded or
+    reloaded and rebuilt the next time it is used. Menu embeds for the default
+    prefix are rendered while building, those for other prefixes on first use,
+    and all of them are kept until the next rebuild.
+    """
+
+    MAX_RENDERED = 256
+
+    def __init__(self, cog: 'HelpCog'):
+        self.cog: HelpCog = cog
+        self.stale: bool = True
+        self._entries: Dict[str, HelpEntry] = {}
+        # Lower cased names, sorted, for prefix searches
+        self._names: List[str] = []
+        self._lookup: Dict[str, str] = {}
+        self._categories: Dict[bool, Dict[str, List[HelpEntry]]] = {}
+        self._embeds: OrderedDict[tuple[Any, ...], discord.Embed] = OrderedDict()
+
+    def invalidate(self) -> None:
+        self.stale = True
+
+    def _ensure(self) -> None:
+        if self.stale:
+            self.build()
+
+    def build(self) -> None:
+        cog = self.cog
+        bot = cog.bot
+        entries: Dict[str, HelpEntry] = {}
+        # Category name -> entries for (non owners, owners)
+        public: Dict[str, List[HelpEntry]] = {"Home": []}
+        private: Dict[str, List[HelpEntry]] = {"Home": []}
+
+        def add(command: CommandType, category: str, listed: bool) -> None:
+            owner_only = cog.is_owner_only(command) or bool(cog.is_jishaku_command(command))
+            flag_converter = getattr(command, 'flags', None)
+            entry = HelpEntry(
+                qualified_name=command.qualified_name,
+                description=command.description or "No description available.",
+                usage=cog.generate_usage(command, flag_converter),
+                owner_only=owner_only,
+                category=category,
+                command=command,
+            )
+            entries[entry.qualified_name] = entry
+            if not listed:
+                return
+            private.setdefault(category, []).append(entry)
+            if not owner_only:
+                public.setdefault(category, []).append(entry)
+
+        for command in sorted(bot.tree.walk_commands(), key=lambda c: c.name):
+            if isinstance(command, app_commands.Command) and command.binding and \
+               command.binding.__class__.__name__ != "HelpCog":
+                add(command, command.binding.__class__.__name__, True)
+
+        for command in sorted(bot.walk_commands(), key=lambda c: c.qualified_name):
+            if command.qualified_name in entries or not command.cog or command.cog.qualified_name == "HelpCog":
+                continue
+            # Only top level commands are listed in the menu, subcommands are searchable
+            add(command, command.cog.qualified_name, command.parent is None)
+
+        self._entries = entries
+        self._names = sorted(name.lower() for name in entries)
+        self._lookup = {name.lower(): name for name in entries}
+        self._categories = {False: public, True: private}
+        self._embeds.clear()
+        self.stale = False
+
+        # Pre-render the menu for the default prefix, other prefixes are rendered on first use
+        for is_owner, categories in self._categories.items():
+            self.home_embed('.', is_owner)
+            for category, category_entries in categories.items():
+                for page in range(math.ceil(len(category_entries) / COMMANDS_PER_PAGE)):
+                    self.category_embed(category, page, '.', is_owner)
+
+    def get(self, name: str) -> Optional[HelpEntry]:
+        self._ensure()
+        return self._entries.get(name)
+
+    def categories(self, is_owner: bool) -> Dict[str, List[HelpEntry]]:
+        self._ensure()
+        return self._categories[is_owner]
+
+    def search(self, query: str, is_owner: bool, limit: int = 25) -> List[HelpEntry]:
+        """Returns the commands whose name starts with the query, then those that contain it."""
+        self._ensure()
+        query = query.lower()
+        names = self._names
+        start = bisect.bisect_left(names, query)
+        end = bisect.bisect_left(names, query + '\uffff', lo=start)
+        prefixed = names[start:end]
+        contained = [name for name in names if query in name and not name.startswith(query)] if query else []
+
+        results: List[HelpEntry] = []
+        for name in prefixed + contained:
+            entry = self._entries[self._lookup[name]]
+            if entry.owner_only and not is_owner:
+                continue
+            results.append(entry)
+            if len(results) >= limit:
+                break
+        return results
+
+    def _cached(self, key: tuple[Any, ...], render: Any) -> discord.Embed:
+        try:
+            embed = self._embeds[key]
+        except KeyError:
+            embed = self._embeds[key] = render()
+            if len(self._embeds) > self.MAX_RENDERED:
+                self._embeds.popitem(last=False)
+        else:
+            self._embeds.move_to_end(key)
+        return embed
+
+    def home_embed(self, prefix: str, is_owner: bool) -> discord.Embed:
+        self._ensure()
+        return self._cached(('home', prefix, is_owner), lambda: self._render_home(prefix, is_owner))
+
+    def category_embed(self, category: str, page: int, prefix: str, is_owner: bool) -> discord.Embed:
+        self._ensure()
+        return self._cached(
+            ('category', category, page, prefix, is_owner),
+            lambda: self._render_category(category, page, prefix, is_owner),
+        )
+
+    def _render_home(self, prefix: str, is_owner: bool) -> discord.Embed:
+        cog = self.cog
+        embed = discord.Embed(
+            title=f"**{cog.embed_title}**",
+            description=
+            "This is a help menu.\n"
+            "Use the buttons to switch between file types and commands.",
+            color=cog.embed_color)
+        for category, entries in self._categories[is_owner].items():
+            if category not in ["Home", "Owner"]:
+                embed.add_field(name=f"**{category}**",
+                                value=f"`{len(entries)}` commands",
+                                inline=True)
+        embed.set_footer(text=cog.embed_footer.format(prefix=prefix))
+        return embed
+
+    def _render_category(self, category: str, page: int, prefix: str, is_owner: bool) -> discord.Embed:
+        cog = self.cog
+        entries = self._categories[is_owner].get(category, [])
+        start_idx = page * COMMANDS_PER_PAGE
+        end_idx = start_idx + COMMANDS_PER_PAGE
+
+        embed = discord.Embed(title=f"**{category} Commands**",
+                              color=cog.embed_color)
+
+        for entry in entries[start_idx:end_idx]:
+            if isinstance(entry.command, app_commands.Command):
+                cmd_name = entry.command.name
+            else:
+                cmd_name = f"{prefix}{entry.command.name}"
+            embed.add_field(name=f"**`{cmd_name}`**",
+                            value=entry.description,
+                            inline=False)
+
+        total_pages = math.ceil(len(entries) / COMMANDS_PER_PAGE)
+        embed.set_footer(
+            text=
+            f"Page {page + 1}/{total_pages} • {cog.embed_footer.format(prefix=prefix)}"
+        )
+        return embed
+
+
 class HelpCog(commands.Cog):
 
     def __init__(self, bot: BotT):
@@ -179,10 +329,18 @@ class HelpCog(commands.Cog):
         self.embed_footer: str = DEFAULT_EMBED_FOOTER
         self.owner_only_message: str = DEFAULT_OWNER_ONLY_MESSAGE
         self.no_category_name: str = DEFAULT_NO_CATEGORY_NAME
+        self.index: HelpIndex = HelpIndex(self)
+
+    async def cog_load(self) -> None:
+        self.index.build()
 
     async def cog_unload(self) -> None:
         self.bot.help_command = self._original_help_command
 
+    @commands.Cog.listener()
+    async def on_extension_change(self, name: str) -> None:
+        self.index.invalidate()
+
     @staticmethod
     def generate_usage(command: CommandType,
                        flag_converter: Optional[type[
@@ -268,35 +426,11 @@ class HelpCog(commands.Cog):
     async def command_autocomplete(
             self, interaction: discord.Interaction,
             current: str) -> List[app_commands.Choice[str]]:
-        choices: List[app_commands.Choice[str]] = []
         is_owner = await self.is_owner(interaction.user)
-        seen_commands = set()
-
-        for cmd in self.bot.walk_commands():
-            if isinstance(cmd, (commands.Command, app_commands.Command)) and \
-               current.lower() in cmd.qualified_name.lower() and \
-               (not self.is_owner_only(cmd) or is_owner) and \
-               (not self.is_jishaku_command(cmd) or is_owner) and \
-               cmd.cog and cmd.cog.qualified_name != "HelpCog":
-                if cmd.qualified_name not in seen_commands:
-                    choices.append(
-                        app_commands.Choice(name=f"{cmd.qualified_name}",
-                                            value=cmd.qualified_name))
-                    seen_commands.add(cmd.qualified_name)
-
-        for cmd in self.bot.tree.walk_commands():
-            if isinstance(cmd, (commands.Command, app_commands.Command)) and \
-               current.lower() in cmd.qualified_name.lower() and \
-               (not self.is_owner_only(cmd) or is_owner) and \
-               (not self.is_jishaku_command(cmd) or is_owner) and \
-               cmd.binding and cmd.binding.__class__.__name__ != "HelpCog":
-                if cmd.qualified_name not in seen_commands:
-                    choices.append(
-                        app_commands.Choice(name=f"{cmd.qualified_name}",
-                                            value=cmd.qualified_name))
-                    seen_commands.add(cmd.qualified_name)
-
-        return sorted(choices, key=lambda c: c.name)[:25]
+        return [
+            app_commands.Choice(name=entry.qualified_name, value=entry.qualified_name)
+            for entry in self.index.search(current, is_owner)
+        ]
 
     async def send_command_help(self, ctx: ContextType, command_name: str,
                                 prefix: str) -> None:
@@ -304,17 +438,22 @@ class HelpCog(commands.Cog):
         is_owner = await self.is_owner(
             ctx.author if isinstance(ctx, commands.Context) else ctx.user)
 
-        command = self.bot.get_command(
-            command_name) or self.bot.tree.get_command(command_name)
-        if isinstance(command, (commands.Command, app_commands.Command)):
-            if (self.is_owner_only(command)
-                    or self.is_jishaku_command(command)) and not is_owner:
+        entry = self.index.get(command_name)
+        if entry is None:
+            # Not a qualified name, but it might still be an alias
+            command = self.bot.get_command(command_name)
+            entry = command and self.index.get(command.qualified_name)
+        if entry is not None:
+            if entry.owner_only and not is_owner:
                 await self.send_owner_only_message(ctx)
                 return
-            embed.title = f"**Help for {command.qualified_name}**"
-            embed.description = f"> {command.description or 'No description available.'}"
-            flag_converter = getattr(command, 'flags', None)
-            usage = self.generate_usage(command, flag_converter, prefix)
+            command = entry.command
+            embed.title = f"**Help for {entry.qualified_name}**"
+            embed.description = f"> {entry.description}"
+            if prefix == '.':
+                usage = entry.usage
+            else:
+                usage = self.generate_usage(command, getattr(command, 'flags', None), prefix)
             embed.add_field(name="**Usage**",
                             value=f"```\n{usage}\n```",
                             inline=False)
@@ -337,32 +476,9 @@ class HelpCog(commands.Cog):
                                     prefix: str) -> None:
         is_owner = await self.is_owner(
             ctx.author if isinstance(ctx, commands.Context) else ctx.user)
-        cog_commands: Dict[str, List[CommandType]] = {"Home": []}
-        seen_commands = set()
-
-        for command in sorted(self.bot.tree.walk_commands(),
-                              key=lambda c: c.name):
-            if isinstance(command, app_commands.Command) and \
-               (not self.is_owner_only(command) or is_owner) and \
-               (not self.is_jishaku_command(command) or is_owner) and \
-               command.binding and command.binding.__class__.__name__ != "HelpCog":
-                cog_name = command.binding.__class__.__name__ if command.binding else self.no_category_name
-                if cog_name not in cog_commands:
-                    cog_commands[cog_name] = []
-                cog_commands[cog_name].append(command)
-                seen_commands.add(command.qualified_name)
-
-        for command in sorted(self.bot.commands, key=lambda c: c.name):
-            if command.qualified_name not in seen_commands and \
-               (not self.is_owner_only(command) or is_owner) and \
-               (not self.is_jishaku_command(command) or is_owner) and \
-               command.cog and command.cog.qualified_name != "HelpCog":
-                cog_name = command.cog.qualified_name if command.cog else self.no_category_name
-                if cog_name not in cog_commands:
-                    cog_commands[cog_name] = []
-                cog_commands[cog_name].append(command)
-
-        view = HelpView(self, ctx, cog_commands)
+        cog_commands = self.index.categories(is_owner)
+
+        view = HelpView(self, ctx, cog_commands, is_owner)
         view.category_select.options = [
             discord.SelectOption(label="Home",
                                  description="Return to the main help menu",
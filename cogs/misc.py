@@ -1,16 +1,29 @@
-import aiohttp
+import datetime
+from typing import Any, Optional
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 import utilFunc.config
+from utilFunc.weather import LocationNotFound, WeatherError, WeatherPrefetcher, WeatherService
 
 
 class Misc(commands.Cog, name="Misc"):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot: commands.Bot = bot
-        self.weather_cache = {}
-        self.cach_timeout = 300  # 5 minutes
+        self.weather_service = WeatherService(bot.session, utilFunc.config.OW_API, ttl=300.0)  # 5 minutes
+        self.weather_prefetcher = WeatherPrefetcher(
+            self.weather_service,
+            top=getattr(utilFunc.config, 'WEATHER_PREFETCH_TOP', 10),
+            budget=getattr(utilFunc.config, 'WEATHER_CALLS_PER_MINUTE', 30),
+        )
+
+    async def cog_load(self) -> None:
+        self.weather_prefetcher.start()
+
+    async def cog_unload(self) -> None:
+        self.weather_prefetcher.stop()
 
     @commands.hybrid_command(name="ping")
     async def ping(self, ctx: commands.Context) -> None:
@@ -48,101 +61,108 @@ class Misc(commands.Cog, name="Misc"):
 
         unit_system = "imperial" if units is None else units.value
 
-        # check if the city is in the cache
-        cache_key = f"{city}_{unit_system}"
-        if cache_key in self.weather_cache:
-            cached_data = self.weather_cache[cache_key]
-            if (discord.utils.utcnow() - cached_data['timestamp']).total_seconds() < self.cach_timeout:
-                await interaction.response.send_message(embed=cached_data['embed'])
-                return
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                    f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={utilFunc.config.OW_API}&units={unit_system}") as response:
-                data = await response.json()
-
-                if data['cod'] == 200:
-                    temp_unit = "°F" if unit_system == "imperial" else "°C"
-                    speed_unit = "mph" if unit_system == "imperial" else "km/h"
-
-                    weather_description = data['weather'][0]['description']
-                    temperature = data['main']['temp']
-                    humidity = data['main']['humidity']
-                    wind_speed = data['wind']['speed']
-
-                    embed = discord.Embed(
-                        title=f"Weather in {data['name']} {data.get('sys', {}).get('country', '')}",
-                        color=self._get_weather_color(data['weather'][0]['id'])
-                    )
-
-                    # Basic weather info reply
-                    embed.add_field(
-                        name="Current Conditions",
-                        value=f"Temperature: {data['main']['temp']}{temp_unit}\n"
-                              f"Feels like: {data['main']['feels_like']}{temp_unit}\n"
-                              f"Wind Speed: {data['wind']['speed']}{speed_unit}\n"
-                              f"Humidity: {data['main']['humidity']}%\n",
-                        inline=False
-
-                    )
-
-                    # Weather iconm
-                    icon_code = data['weather'][0]['icon']
-                    embed.set_thumbnail(url=f"http://openweathermap.org/img/wn/{icon_code}.png")
-
-                    if detailed:
-                        # Convert visibility from meters
-                        visibility = data.get('visibility', 0)
-                        if visibility:
-                            if unit_system == "imperial":
-                                # Convert meters to miles
-                                visibility_converted = round(visibility * 0.000621371, 2)
-                                visibility_unit = "mi"
-                            else:
-                                # Convert meters to kilometers
-                                visibility_converted = round(visibility / 1000, 2)
-                                visibility_unit = "km"
-
-                            visibility_text = f"{visibility_converted} {visibility_unit}"
-                        else:
-                            visibility_text = "N/A"
-
-                    # Detailed weather info
-                    if detailed:
-                        embed.add_field(
-                            name="Additional Details",
-                            value=f"Sunrise: <t:{data['sys']['sunrise']}:t>\n"
-                                  f"Sunset: <t:{data['sys']['sunset']}:t>\n"
-                                  f"Min Temperature: {data['main']['temp_min']}{temp_unit}\n"
-                                  f"Max Temperature: {data['main']['temp_max']}{temp_unit}\n"
-                                  f"Visibility: {visibility_text}\n"
-                                  f"Cloudiness: {data['clouds']['all']}%\n",
-                            inline=False
-                        )
-                        if 'rain' in data:
-                            embed.add_field(
-                                name="Rain",
-                                value=f"1h: {data['rain'].get('1h', 'N/A')}mm\n"
-                                      f"3h: {data['rain'].get('3h', 'N/A')}mm\n",
-                                inline=False
-                            )
-                    embed.set_footer(text=f"Last updated: {discord.utils.utcnow().strftime('%Y-%m-%d %H:%M:%S')}")
-
-                    if 'alerts' in data:
-                        alerts = data['alerts']
-                        alert_text = '\n'.join(f"⚠️ {alert['event']}" for alert in alerts[:3])
-                        embed.add_field(name="Weather Alerts", value=alert_text, inline=False)
-
-                    # Cache the data
-                    self.weather_cache[cache_key] = {
-                        'embed': embed,
-                        'timestamp': discord.utils.utcnow()
-                    }
-
-                    await interaction.response.send_message(embed=embed)
+        try:
+            data = await self.weather_service.current(city, unit_system)
+            self.weather_prefetcher.record(data['id'], unit_system)
+            forecast = None
+            if detailed:
+                forecast = await self.weather_service.forecast_by_id(data['id'], unit_system)
+        except LocationNotFound:
+            await interaction.response.send_message(f"Could not find data for {city}", ephemeral=True)
+            return
+        except WeatherError as e:
+            await interaction.response.send_message(f"Could not get the weather: {e}", ephemeral=True)
+            return
+
+        embed = self._build_weather_embed(data, unit_system, forecast)
+        await interaction.response.send_message(embed=embed)
+
+    def _build_weather_embed(
+            self, data: dict[str, Any], unit_system: str, forecast: Optional[dict[str, Any]] = None
+    ) -> discord.Embed:
+        temp_unit = "°F" if unit_system == "imperial" else "°C"
+        speed_unit = "mph" if unit_system == "imperial" else "km/h"
+
+        embed = discord.Embed(
+            title=f"Weather in {data['name']} {data.get('sys', {}).get('country', '')}",
+            color=self._get_weather_color(data['weather'][0]['id'])
+        )
+
+        # Basic weather info reply
+        embed.add_field(
+            name="Current Conditions",
+            value=f"Temperature: {data['main']['temp']}{temp_unit}\n"
+                  f"Feels like: {data['main']['feels_like']}{temp_unit}\n"
+                  f"Wind Speed: {data['wind']['speed']}{speed_unit}\n"
+                  f"Humidity: {data['main']['humidity']}%\n",
+            inline=False
+
+        )
+
+        # Weather iconm
+        icon_code = data['weather'][0]['icon']
+        embed.set_thumbnail(url=f"http://openweathermap.org/img/wn/{icon_code}.png")
+
+        # Detailed weather info
+        if forecast is not None:
+            # Convert visibility from meters
+            visibility = data.get('visibility', 0)
+            if visibility:
+                if unit_system == "imperial":
+                    # Convert meters to miles
+                    visibility_converted = round(visibility * 0.000621371, 2)
+                    visibility_unit = "mi"
                 else:
-                    # Handle error response
-                    await interaction.response.send_message(f"Could not find data for {city}", ephemeral=True)
+                    # Convert meters to kilometers
+                    visibility_converted = round(visibility / 1000, 2)
+                    visibility_unit = "km"
+
+                visibility_text = f"{visibility_converted} {visibility_unit}"
+            else:
+                visibility_text = "N/A"
+
+            embed.add_field(
+                name="Additional Details",
+                value=f"Sunrise: <t:{data['sys']['sunrise']}:t>\n"
+                      f"Sunset: <t:{data['sys']['sunset']}:t>\n"
+                      f"Min Temperature: {data['main']['temp_min']}{temp_unit}\n"
+                      f"Max Temperature: {data['main']['temp_max']}{temp_unit}\n"
+                      f"Visibility: {visibility_text}\n"
+                      f"Cloudiness: {data['clouds']['all']}%\n",
+                inline=False
+            )
+            if 'rain' in data:
+                embed.add_field(
+                    name="Rain",
+                    value=f"1h: {data['rain'].get('1h', 'N/A')}mm\n"
+                          f"3h: {data['rain'].get('3h', 'N/A')}mm\n",
+                    inline=False
+                )
+
+            upcoming = forecast.get('list', [])[:4]
+            if upcoming:
+                embed.add_field(
+                    name="Forecast",
+                    value='\n'.join(
+                        f"<t:{entry['dt']}:t>: {entry['main']['temp']}{temp_unit}, {entry['weather'][0]['description']}"
+                        for entry in upcoming
+                    ),
+                    inline=False
+                )
+
+        # Use the payload's own timestamp, it may have come from the cache
+        if 'dt' in data:
+            updated = datetime.datetime.fromtimestamp(data['dt'], tz=datetime.timezone.utc)
+        else:
+            updated = discord.utils.utcnow()
+        embed.set_footer(text=f"Last updated: {updated.strftime('%Y-%m-%d %H:%M:%S')}")
+
+        if 'alerts' in data:
+            alerts = data['alerts']
+            alert_text = '\n'.join(f"⚠️ {alert['event']}" for alert in alerts[:3])
+            embed.add_field(name="Weather Alerts", value=alert_text, inline=False)
+
+        return embed
 
     def _get_weather_color(self, weather_id: int) -> discord.Color:
         """Return color based on weather condition code"""
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import datetime
 import importlib
 import io
 import os
@@ -12,7 +13,10 @@ import traceback
 from contextlib import redirect_stdout
 from typing import TYPE_CHECKING, Optional, Any
 
-from discord.ext import commands
+import discord
+from discord.ext import commands, tasks
+
+from utilFunc.formats import TabularData, plural
 
 if TYPE_CHECKING:
     from utilFunc.context import Context
@@ -26,6 +30,16 @@ class Owner(commands.Cog):
 
         # self.tree = app_commands.CommandTree(self)
 
+    async def cog_load(self) -> None:
+        self.sample_latencies.start()
+
+    async def cog_unload(self) -> None:
+        self.sample_latencies.cancel()
+
+    @tasks.loop(seconds=60.0)
+    async def sample_latencies(self):
+        self.bot.latency_history.record(self.bot.latencies)
+
     async def run_process(self, command: str) -> list[str]:
         try:
             process = await asyncio.create_subprocess_shell(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
@@ -199,6 +213,65 @@ class Owner(commands.Cog):
                 self._last_result = ret
                 await ctx.send(f'```py\n{value}{ret}\n```')
 
+    @commands.group(hidden=True, invoke_without_command=True)
+    async def health(self, ctx: Context):
+        """Shows how responsive the event loop and the gateway are."""
+        monitor = self.bot.loop_monitor
+        cutoff = discord.utils.utcnow() - datetime.timedelta(days=1)
+        resumes = sum(1 for dates in self.bot.resumes.values() for dt in dates if dt > cutoff)
+        identifies = sum(1 for dates in self.bot.identifies.values() for dt in dates if dt > cutoff)
+        status = 'running' if monitor.running else 'stopped'
+
+        lines = [
+            f'Loop monitor: {status}, probing every {monitor.interval * 1000:.0f}ms',
+            f'Loop lag: p50 {monitor.lag(50) * 1000:.2f}ms, p99 {monitor.lag(99) * 1000:.2f}ms',
+            f'Slow callbacks (>{monitor.threshold * 1000:.0f}ms): {len(monitor.slow_callbacks)} recent',
+            f'Gateway latency: {self.bot.latency * 1000:.2f}ms over {plural(self.bot.shard_count or 1):shard}',
+            f'Last 24 hours: {plural(resumes):resume}, {plural(identifies):identify|identifies}',
+        ]
+        await ctx.send('\n'.join(lines))
+
+    @health.command(name='slow', hidden=True)
+    async def health_slow(self, ctx: Context, count: int = 5):
+        """Shows where the event loop was blocked most recently."""
+        entries = list(self.bot.loop_monitor.slow_callbacks)[-count:]
+        if not entries:
+            return await ctx.send('The event loop has not been blocked recently.')
+
+        parts = []
+        for entry in reversed(entries):
+            parts.append(f'{entry.started_at:%Y-%m-%d %H:%M:%S} UTC, blocked for {entry.duration:.3f}s\n{entry.stack}')
+
+        fmt = '\n'.join(parts)
+        if len(fmt) > 1990:
+            fp = io.BytesIO(fmt.encode('utf-8'))
+            await ctx.send(file=discord.File(fp, 'slow_callbacks.txt'))
+        else:
+            await ctx.send(f'```\n{fmt}\n```')
+
+    @health.command(name='shards', hidden=True)
+    async def health_shards(self, ctx: Context):
+        """Shows the latency history of every shard."""
+        history = self.bot.latency_history
+        cutoff = discord.utils.utcnow() - datetime.timedelta(days=1)
+
+        table = TabularData()
+        table.set_columns(['Shard', 'Now', 'Avg', 'Max', 'Samples', 'Resumes (24h)', 'Identifies (24h)'])
+        current = dict(self.bot.latencies)
+        for shard_id in sorted(set(current) | set(history.shards())):
+            values = [latency for _, latency in history.series(shard_id)]
+            table.add_row([
+                shard_id,
+                f'{current.get(shard_id, float("nan")) * 1000:.0f}ms',
+                f'{sum(values) / len(values) * 1000:.0f}ms' if values else '-',
+                f'{max(values) * 1000:.0f}ms' if values else '-',
+                len(values),
+                sum(1 for dt in self.bot.resumes.get(shard_id, []) if dt > cutoff),
+                sum(1 for dt in self.bot.identifies.get(shard_id, []) if dt > cutoff),
+            ])
+
+        await ctx.send(f'```\n{table.render()}\n```')
+
 
 async def setup(bot):
     await bot.add_cog(Owner(bot))
\ No newline at end of file
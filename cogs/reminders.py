@@ -1,22 +1,22 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import datetime
+import heapq
 import json
 import random
 import textwrap
-from typing import TYPE_CHECKING, Any, Optional, Sequence, NamedTuple
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Sequence, NamedTuple
 
 import asyncpg
-import dateutil.tz
 import discord
-from dateutil.zoneinfo import get_zonefile_instance
 from discord import app_commands
 from discord.ext import commands
-from lxml import etree
 from typing_extensions import Annotated
 
-from utilFunc import time, formats, cache, fuzzy
+from utilFunc import time, formats, cache, metrics
+from utilFunc.timezones import TimezoneRegistry
 
 if TYPE_CHECKING:
     from typing_extensions import Self
@@ -24,6 +24,30 @@ if TYPE_CHECKING:
     from bot import OmelettePy
 
 
+DISPATCH_LAG = metrics.registry.histogram(
+    'reminder_dispatch_lag_seconds', 'Time between a timer expiring and it being dispatched.'
+)
+QUEUE_DEPTH = metrics.registry.gauge(
+    'reminder_queue_depth', 'Timers handed to the in-process scheduler that have not fired yet.'
+)
+TIMERS_FIRED = metrics.registry.counter('reminder_timers_fired_total', 'Timers dispatched by the scheduler.')
+DELIVERY_FAILURES = metrics.registry.counter(
+    'reminder_delivery_failures_total', 'Reminders that could not be delivered to their channel.'
+)
+
+
+def dispatcher_restarts(reason: str) -> metrics.Counter:
+    return metrics.registry.counter(
+        'reminder_dispatcher_restarts_total', 'Restarts of the timer dispatch loop.', reason=reason
+    )
+
+
+def db_latency(operation: str) -> metrics.Histogram:
+    return metrics.registry.histogram(
+        'reminder_db_latency_seconds', 'Latency of reminder database operations.', operation=operation
+    )
+
+
 class MaybeAcquire:
     def __init__(self, connection: Optional[asyncpg.Connection], *, pool: asyncpg.Pool) -> None:
         self._connection: Optional[asyncpg.Connection] = connection
@@ -119,12 +143,10 @@ class TimeZone(NamedTuple):
     async def convert(cls, ctx: Context, argument: str) -> Self:
         assert isinstance(ctx.cog, Reminder)
 
-        # Prioritise aliases because they handle short codes slightly better
-        if argument in ctx.cog._timezone_aliases:
-            return cls(key=ctx.cog._timezone_aliases[argument], label=argument)
-
-        if argument in ctx.cog.valid_timezones:
-            return cls(key=argument, label=argument)
+        resolved = ctx.cog.timezones.resolve(argument)
+        if resolved is not None:
+            label, key = resolved
+            return cls(key=key, label=label)
 
         timezones = ctx.cog.find_timezones(argument)
 
@@ -138,7 +160,7 @@ class TimeZone(NamedTuple):
 
 
 class Timer:
-    __slots__ = ('args', 'kwargs', 'event', 'id', 'created_at', 'expires', 'timezone')
+    __slots__ = ('args', 'kwargs', 'event', 'id', 'created_at', 'expires', 'timezone', 'recurrence')
 
     def __init__(self, *, record: asyncpg.Record):
         self.id: int = record['id']
@@ -154,6 +176,7 @@ class Timer:
         self.created_at: datetime.datetime = record['created']
         self.expires: datetime.datetime = record['expires']
         self.timezone: str = record['timezone']
+        self.recurrence: Optional[datetime.timedelta] = record.get('recurrence')
 
     @classmethod
     def temporary(
@@ -165,6 +188,7 @@ class Timer:
             args: Sequence[Any],
             kwargs: dict[str, Any],
             timezone: str,
+            recurrence: Optional[datetime.timedelta] = None,
     ) -> Self:
         pseudo = {
             'id': None,
@@ -173,9 +197,16 @@ class Timer:
             'created': created,
             'expires': expires,
             'timezone': timezone,
+            'recurrence': recurrence,
         }
         return cls(record=pseudo)
 
+    def rescheduled(self, expires: datetime.datetime) -> Self:
+        """Returns a copy of this recurring timer for its next occurrence."""
+        timer = copy.copy(self)
+        timer.expires = expires
+        return timer
+
     def __eq__(self, other: object) -> bool:
         try:
             return self.id == other.id  # type: ignore
@@ -185,9 +216,16 @@ class Timer:
     def __hash__(self) -> int:
         return hash(self.id)
 
+    @property
+    def previous_occurrence(self) -> datetime.datetime:
+        """When this timer was set or, for recurring timers, when it last fired."""
+        if self.recurrence is None:
+            return self.created_at
+        return max(self.created_at, self.expires - self.recurrence)
+
     @property
     def human_delta(self) -> str:
-        return time.format_relative(self.created_at)
+        return time.format_relative(self.previous_occurrence)
 
     @property
     def author_id(self) -> Optional[int]:
@@ -199,11 +237,136 @@ class Timer:
         return f'<Timer created={self.created_at} expires={self.expires} event={self.event}>'
 
 
-class CLDRDataEntry(NamedTuple):
-    description: str
-    aliases: list[str]
-    deprecated: bool
-    preferred: Optional[str]
+def _json_safe(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, (discord.Object, discord.Member, discord.User)):
+        return str(value.id)
+    return value
+
+
+class TimerScheduler:
+    """Fires timers that are about to expire from a single in-process heap.
+
+    Every timer within :attr:`Reminder.SHORT_TIMER_HORIZON` seconds of expiring is
+    handed over to this scheduler, either directly by :meth:`Reminder.create_timer`
+    or by the dispatch loop. Due timers are deleted from the database in one batch
+    and only the rows that were actually deleted get dispatched, so a timer can
+    never fire twice even if it got scheduled more than once.
+    """
+
+    def __init__(self, cog: Reminder) -> None:
+        self.cog: Reminder = cog
+        self._heap: list[tuple[datetime.datetime, int, Timer]] = []
+        self._pending: set[int] = set()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def __contains__(self, timer_id: int) -> bool:
+        return timer_id in self._pending
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def pending_ids(self) -> list[int]:
+        return list(self._pending)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def schedule(self, timer: Timer) -> None:
+        if timer.id is None or timer.id in self._pending:
+            return
+
+        self._pending.add(timer.id)
+        heapq.heappush(self._heap, (timer.expires, timer.id, timer))
+        if self._heap[0][1] == timer.id:
+            self._wakeup.set()
+
+    def discard(self, timer_id: int) -> None:
+        # The heap entry is skipped lazily once it is popped
+        self._pending.discard(timer_id)
+
+    async def _run(self) -> None:
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            now = datetime.datetime.utcnow()
+            expires = self._heap[0][0]
+            if expires > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=(expires - now).total_seconds())
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due: list[Timer] = []
+            while self._heap and self._heap[0][0] <= now:
+                _, timer_id, timer = heapq.heappop(self._heap)
+                if timer_id in self._pending:
+                    due.append(timer)
+
+            if due:
+                await self._fire(due)
+
+    async def _fire(self, due: list[Timer]) -> None:
+        # One-off timers are deleted, recurring timers are moved to their next
+        # occurrence in place. The expires check makes both idempotent.
+        query = """
+            WITH deleted AS (
+                DELETE FROM reminders
+                WHERE id = ANY($1::int[]) AND recurrence IS NULL
+                RETURNING id, NULL::timestamp AS next_expires
+            ), rescheduled AS (
+                UPDATE reminders
+                SET expires = expires + recurrence * (
+                    FLOOR(EXTRACT(EPOCH FROM ($2::timestamp - expires)) / EXTRACT(EPOCH FROM recurrence)) + 1
+                )
+                WHERE id = ANY($1::int[]) AND recurrence IS NOT NULL AND expires <= $2::timestamp
+                RETURNING id, expires AS next_expires
+            )
+            SELECT * FROM deleted UNION ALL SELECT * FROM rescheduled;
+        """
+        ids = [timer.id for timer in due]
+        now = datetime.datetime.utcnow()
+        try:
+            with db_latency('fire').time():
+                records = await self.cog.bot.pool.fetch(query, ids, now)
+        except (OSError, asyncpg.PostgresError) as e:
+            self.cog.bot.log.error(f'Failed to delete {len(ids)} due timers, retrying: {e}')
+            for timer in due:
+                self._pending.discard(timer.id)
+                self.schedule(timer)
+            await asyncio.sleep(1)
+            return
+
+        self._pending.difference_update(ids)
+        fired = {record['id']: record['next_expires'] for record in records}
+        for timer in due:
+            if timer.id not in fired:
+                continue
+
+            DISPATCH_LAG.observe(max(0.0, (now - timer.expires).total_seconds()))
+            TIMERS_FIRED.inc()
+            self.cog.bot.dispatch(f'{timer.event}_timer_complete', timer)
+            next_expires = fired[timer.id]
+            if next_expires is not None:
+                self.cog.track_timer(timer.rescheduled(next_expires))
 
 
 class Reminder(commands.Cog):
@@ -244,56 +407,41 @@ class Reminder(commands.Cog):
         'cnsha',  # Asia/Shanghai
     )
 
+    # Timers expiring within this many seconds are fired by the in-process scheduler
+    SHORT_TIMER_HORIZON = 60
+
     def __init__(self, bot: OmelettePy) -> None:
         self.bot: OmelettePy = bot
         self.pool = bot.pool
         self._have_data = asyncio.Event()
         self._current_timer: Optional[Timer] = None
-        self._task = bot.loop.create_task(self.dispatch_timers())
-        self.valid_timezones: set[str] = set(get_zonefile_instance().zones)
-        # User-friendly timezone names, some manual and most from the CLDR database.
-        self._timezone_aliases: dict[str, str] = {
-            'Eastern Time': 'America/New_York',
-            'Central Time': 'America/Chicago',
-            'Mountain Time': 'America/Denver',
-            'Pacific Time': 'America/Los_Angeles',
-            # (Unfortunately) special case American timezone abbreviations
-            'EST': 'America/New_York',
-            'CST': 'America/Chicago',
-            'MST': 'America/Denver',
-            'PST': 'America/Los_Angeles',
-            'EDT': 'America/New_York',
-            'CDT': 'America/Chicago',
-            'MDT': 'America/Denver',
-            'PDT': 'America/Los_Angeles',
-        }
-        self._default_timezones: list[app_commands.Choice[str]] = []
+        self._scheduler = TimerScheduler(self)
+        QUEUE_DEPTH.set_function(lambda: len(self._scheduler))
+        self.timezones = TimezoneRegistry(popular_ids=self.DEFAULT_POPULAR_TIMEZONE_IDS)
 
     async def cog_load(self) -> None:
         try:
-            await self.parse_bcp47_timezones()
-
-            # check for pending timers
-            query = """
-                SELECT * FROM reminders
-                WHERE expires < CURRENT_TIMESTAMP
-                ORDER BY expires;
-            """
-
-            pending_count = await self.bot.pool.fetch(query)
-            if pending_count:
-                self.bot.log.warning(f'Found {pending_count} pending timers in the database.')
-                for record in pending_count:
-                    timer = Timer(record=record)
-                    # schedule the timer for dispatch
-                    self.bot.loop.create_task(self.call_timer(timer))
-
-                # set data flag to trigger normal timer dispatch
-                self._have_data.set()
+            # The CLDR data comes from the disk cache and is only revalidated once
+            # the bot is ready, timezone lookups never have to wait on the network.
+            await self.timezones.load()
+            if self.timezones.is_stale:
+                self.bot.startup.defer('cldr', self.refresh_timezones)
+
+            # Hand every overdue or soon to expire timer to the scheduler in one go,
+            # this way nothing gets lost between restarts.
+            query = "SELECT * FROM reminders WHERE expires < $1 ORDER BY expires;"
+            horizon = datetime.datetime.utcnow() + datetime.timedelta(seconds=self.SHORT_TIMER_HORIZON)
+            with db_latency('reconcile').time():
+                records = await self.bot.pool.fetch(query, horizon)
+            for record in records:
+                self._scheduler.schedule(Timer(record=record))
+
+            if records:
+                self.bot.log.warning(f'Found {len(records)} pending timers in the database.')
             else:
                 self.bot.log.info('No pending timers found in the database.')
 
-            # initialize the timer dispatch task
+            self._scheduler.start()
             self._task = self.bot.loop.create_task(self.dispatch_timers())
             self.bot.log.info('Reminder system initialized')
         except Exception as e:
@@ -310,6 +458,9 @@ class Reminder(commands.Cog):
                 pass
             except Exception as e:
                 self.bot.log.error(f'Error while stopping timer dispatch: {e}')
+        await self._scheduler.stop()
+        # The gauge outlives the cog, don't keep reading (and referencing) this scheduler
+        QUEUE_DEPTH.set_function(None)
         self.bot.log.info('Reminder system shutdown complete')
 
     async def cog_command_error(self, ctx: Context, error: commands.CommandError):
@@ -318,47 +469,11 @@ class Reminder(commands.Cog):
         if isinstance(error, commands.TooManyArguments):
             await ctx.send(f'You called the {ctx.command.name} command with too many arguments.')
 
-    async def parse_bcp47_timezones(self) -> None:
-        async with self.bot.session.get(
-                'https://raw.githubusercontent.com/unicode-org/cldr/main/common/bcp47/timezone.xml'
-        ) as resp:
-            if resp.status != 200:
-                return
-
-            parser = etree.XMLParser(ns_clean=True, recover=True, encoding='utf-8')
-            tree = etree.fromstring(await resp.read(), parser=parser)
-
-            # Build a temporary dictionary to resolve "preferred" mappings
-            entries: dict[str, CLDRDataEntry] = {
-                node.attrib['name']: CLDRDataEntry(
-                    description=node.attrib['description'],
-                    aliases=node.get('alias', 'Etc/Unknown').split(' '),
-                    deprecated=node.get('deprecated', 'false') == 'true',
-                    preferred=node.get('preferred'),
-                )
-                for node in tree.iter('type')
-                # Filter the Etc/ entries (except UTC)
-                if not node.attrib['name'].startswith(('utcw', 'utce', 'unk'))
-                   and not node.attrib['description'].startswith('POSIX')
-            }
-
-            for entry in entries.values():
-                # These use the first entry in the alias list as the "canonical" name to use when mapping the
-                # timezone to the IANA database.
-                # The CLDR database is not particularly correct when it comes to these, but neither is the IANA database.
-                # It turns out the notion of a "canonical" name is a bit of a mess. This works fine for users where
-                # this is only used for display purposes, but it's not ideal.
-                if entry.preferred is not None:
-                    preferred = entries.get(entry.preferred)
-                    if preferred is not None:
-                        self._timezone_aliases[entry.description] = preferred.aliases[0]
-                else:
-                    self._timezone_aliases[entry.description] = entry.aliases[0]
-
-            for key in self.DEFAULT_POPULAR_TIMEZONE_IDS:
-                entry = entries.get(key)
-                if entry is not None:
-                    self._default_timezones.append(app_commands.Choice(name=entry.description, value=entry.aliases[0]))
+    async def refresh_timezones(self) -> None:
+        try:
+            await self.timezones.refresh(self.bot.session)
+        except Exception as e:
+            self.bot.log.warning(f'Could not refresh CLDR timezone data: {e}')
 
     @cache.cache()
     async def get_timezone(self, user_id: int, /) -> Optional[str]:
@@ -371,118 +486,68 @@ class Reminder(commands.Cog):
         tz = await self.get_timezone(user_id)
         if tz is None:
             return datetime.timezone.utc
-        return dateutil.tz.gettz(tz) or datetime.timezone.utc
+        return self.timezones.get_tzinfo(tz) or datetime.timezone.utc
 
     def find_timezones(self, query: str) -> list[TimeZone]:
-        # A bit hacky, but if '/' is in the query then it's looking for a raw identifier
-        # otherwise it's looking for a CLDR alias
-        if '/' in query:
-            return [TimeZone(key=a, label=a) for a in fuzzy.finder(query, self.valid_timezones)]
-
-        keys = fuzzy.finder(query, self._timezone_aliases.keys())
-        return [TimeZone(label=k, key=self._timezone_aliases[k]) for k in keys]
+        return [TimeZone(label=label, key=key) for label, key in self.timezones.find(query)]
 
     async def get_active_timer(self, *, connection: Optional[asyncpg.Connection] = None, days: int = 7) -> Optional[
         Timer]:
+        # Timers already handed to the scheduler are skipped
         query = """
             SELECT * FROM reminders
             WHERE (expires AT TIME ZONE 'UTC' AT TIME ZONE timezone) < (CURRENT_TIMESTAMP + $1::interval)
+            AND id <> ALL($2::int[])
             ORDER BY expires
             LIMIT 1;
         """
         con = connection or self.bot.pool
 
-        record = await con.fetchrow(query, datetime.timedelta(days=days))
+        with db_latency('active_timer').time():
+            record = await con.fetchrow(query, datetime.timedelta(days=days), self._scheduler.pending_ids)
         return Timer(record=record) if record else None
 
     async def wait_for_active_timers(self, *, connection: Optional[asyncpg.Connection] = None, days: int = 7) -> Timer:
         async with MaybeAcquire(connection, pool=self.bot.pool) as con:
-            timer = await self.get_active_timer(connection=con, days=days)
-            if timer is not None:
-                self._have_data.set()
-                return timer
-
-            self._have_data.clear()
-            self._current_timer = None
-            await self._have_data.wait()
-
-            # At this point we always have data
-            return await self.get_active_timer(connection=con, days=days)  # type: ignore
-
-    async def call_timer(self, timer: Timer) -> None:
-        try:
-            # delete the timer
-            query = "DELETE FROM reminders WHERE id=$1;"
-            async with MaybeAcquire(None, pool=self.bot.pool) as conn:
-                result = await conn.execute(query, timer.id)
-                if result == "DELETE 0":
-                    # Timer was already deleted
-                    return
-
-            # dispatch the event
-            event_name = f'{timer.event}_timer_complete'
-            self.bot.dispatch(event_name, timer)
-            self.bot.log.info(f'Successfully called timer {timer.id} for event {timer.event}')
-        except Exception as e:
-            self.bot.log.error(f'Error calling timer {timer.id} for event {timer.event}: {e}')
-            # attempt cleanup
-            try:
-                query = "DELETE FROM reminders WHERE id=$1;"
-                await self.bot.pool.execute(query, timer.id)
-            except Exception as e2:
-                self.bot.log.error(f'Failed to cleanup timer {timer.id}: {e2}')
+            while True:
+                timer = await self.get_active_timer(connection=con, days=days)
+                if timer is not None:
+                    self._have_data.set()
+                    return timer
+
+                # The data flag might have been set for a timer that already went
+                # to the scheduler in the meantime, so this has to loop.
+                self._have_data.clear()
+                self._current_timer = None
+                await self._have_data.wait()
 
     async def dispatch_timers(self) -> None:
         self.pool = self.bot.pool
-        processed_timers = set()
         try:
             while not self.bot.is_closed():
                 timer = self._current_timer = await self.wait_for_active_timers(days=40)
                 now = datetime.datetime.utcnow()
 
-                # Skip if already processed
-                if timer.id in processed_timers:
-                    continue
-
-                if timer.expires >= now:
-                    to_sleep = (timer.expires - now).total_seconds()
+                # Sleep until the timer is close enough for the scheduler to take over
+                to_sleep = (timer.expires - now).total_seconds() - self.SHORT_TIMER_HORIZON
+                if to_sleep > 0:
                     await asyncio.sleep(to_sleep)
 
-                # Process the timer only once
-                try:
-                    await self.call_timer(timer)
-                    processed_timers.add(timer.id)
-                    # prevent set from growing indefinitely
-                    if len(processed_timers) > 100:
-                        processed_timers.clear()
-                except asyncio.CancelledError:
-                    raise
-                except Exception as e:
-                    self.bot.log.error(f'Error processing timer {timer.id}: {e}')
+                self._scheduler.schedule(timer)
 
         except asyncio.CancelledError:
             self.bot.log.info('Timer dispatch task cancelled')
             raise
         except (OSError, discord.ConnectionClosed, asyncpg.PostgresConnectionError):
-            self._task.cancel()
-            self._task = self.bot.loop.create_task(self.dispatch_timers())
+            self.restart_dispatcher('connection')
         except Exception as e:
             self.bot.log.error(f'Timer dispatch task failed: {e}')
-            self._task.cancel()
-            self._task = self.bot.loop.create_task(self.dispatch_timers())
+            self.restart_dispatcher('error')
 
-
-    async def short_timer_optimisation(self, seconds: float, timer: Timer) -> None:
-        try:
-            await asyncio.sleep(seconds)
-            event_name = f'{timer.event}_timer_complete'
-            self.bot.dispatch(event_name, timer)
-        except Exception as e:
-            self.bot.log.error(f'Error in short timer optimization: {e}')
-            # Fallback to normal timer handling
-            if self._current_timer and timer.expires < self._current_timer.expires:
-                self._task.cancel()
-                self._task = self.bot.loop.create_task(self.dispatch_timers())
+    def restart_dispatcher(self, reason: str) -> None:
+        dispatcher_restarts(reason).inc()
+        self._task.cancel()
+        self._task = self.bot.loop.create_task(self.dispatch_timers())
 
     async def get_timer(self, event: str, /, **kwargs: Any) -> Optional[Timer]:
         r"""Gets a timer from the database.
@@ -525,12 +590,43 @@ class Reminder(commands.Cog):
                            enumerate(kwargs.keys(), start=2)]
         query = f"DELETE FROM reminders WHERE event = $1 AND {' AND '.join(filtered_clause)} RETURNING id"
         record: Any = await self.bot.pool.fetchrow(query, event, *kwargs.values())
+        if record is not None:
+            self._scheduler.discard(record['id'])
 
         # if the current timer is being deleted
         if record is not None and self._current_timer and self._current_timer.id == record['id']:
             # cancel the task and re-run it
-            self._task.cancel()
-            self._task = self.bot.loop.create_task(self.dispatch_timers())
+            self.restart_dispatcher('deleted')
+
+    def track_timer(self, timer: Timer) -> None:
+        """Makes sure a freshly stored timer gets dispatched on time."""
+        now = datetime.datetime.utcnow()
+        delta = (timer.expires - now).total_seconds()
+
+        # Short timers skip the dispatch loop entirely
+        if delta <= self.SHORT_TIMER_HORIZON:
+            self._scheduler.schedule(timer)
+            return
+
+        # only set the data check if it can be waited on
+        if delta <= (86400 * 40):  # 40 days
+            self._have_data.set()
+
+        # check if this timer is earlier than our currently run timer
+        if self._current_timer and timer.expires < self._current_timer.expires:
+            # cancel the task and re-run it
+            self.restart_dispatcher('earlier_timer')
+
+    def _serialize_extra(self, args: Sequence[Any], kwargs: dict[str, Any]) -> str:
+        try:
+            extra = {
+                'args': [_json_safe(arg) for arg in args],
+                'kwargs': {k: _json_safe(v) for k, v in kwargs.items()},
+            }
+            return json.dumps(extra)
+        except (TypeError, ValueError) as e:
+            self.bot.log.error(f'Failed to serialize timer data: {e}')
+            raise commands.BadArgument(f'Could not serialize timer data: {e}') from None
 
     async def create_timer(self, when: datetime.datetime, event: str, /, *args: Any, **kwargs: Any) -> Timer:
         r"""Creates a timer.
@@ -556,6 +652,9 @@ class Reminder(commands.Cog):
             Special keyword-only argument to use as the timezone for the
             expiry time. This automatically adjusts the expiry time to be
             in the future, should it be in the past.
+        recurrence: datetime.timedelta
+            Special keyword-only argument to make the timer repeat with
+            this interval. The same row is moved forward every time it fires.
 
         Note
         ------
@@ -566,92 +665,107 @@ class Reminder(commands.Cog):
         :class:`Timer`
         """
 
-        pool = self.bot.pool
-
         try:
             now = kwargs.pop('created')
         except KeyError:
             now = discord.utils.utcnow()
 
+        connection = kwargs.pop('connection', None)
         timezone_name = kwargs.pop('timezone', 'UTC')
+        recurrence = kwargs.pop('recurrence', None)
         # Remove timezone information since the database does not deal with it
         when = when.astimezone(datetime.timezone.utc).replace(tzinfo=None)
         now = now.astimezone(datetime.timezone.utc).replace(tzinfo=None)
 
         timer = Timer.temporary(event=event, args=args, kwargs=kwargs, expires=when, created=now,
-                                timezone=timezone_name)
-        delta = (when - now).total_seconds()
+                                timezone=timezone_name, recurrence=recurrence)
+        json_data = self._serialize_extra(args, kwargs)
 
-        # Ensure all args and kwargs are JSON serializable
-        try:
-            # Convert any non-serializable objects to strings
-            serializable_args = []
-            for arg in args:
-                if isinstance(arg, (datetime.datetime, datetime.date)):
-                    serializable_args.append(arg.isoformat())
-                elif isinstance(arg, (discord.Object, discord.Member, discord.User)):
-                    serializable_args.append(str(arg.id))
-                else:
-                    serializable_args.append(arg)
-
-            serializable_kwargs = {}
-            for k, v in kwargs.items():
-                if isinstance(v, (datetime.datetime, datetime.date)):
-                    serializable_kwargs[k] = v.isoformat()
-                elif isinstance(v, (discord.Object, discord.Member, discord.User)):
-                    serializable_kwargs[k] = str(v.id)
-                else:
-                    serializable_kwargs[k] = v
+        query = """INSERT INTO reminders (event, extra, expires, created, timezone, recurrence)
+                  VALUES ($1, $2::jsonb, $3, $4, $5, $6)
+                  RETURNING id;
+               """
 
-            # Test JSON serialization before database insert
-            extra_data = {'args': serializable_args, 'kwargs': serializable_kwargs}
-            json_data = json.dumps(extra_data)  # Convert to JSON string
+        try:
+            async with MaybeAcquire(connection, pool=self.bot.pool) as conn:
+                with db_latency('create').time():
+                    row = await conn.fetchrow(query, event, json_data, when, now, timezone_name, recurrence)
+                timer.id = row['id']
+        except asyncpg.DataError as e:
+            self.bot.log.error(f'Failed to create timer - Data error: {e}')
+            raise
+        except asyncpg.PostgresError as e:
+            self.bot.log.error(f'Failed to create timer - Database error: {e}')
+            raise
 
-            query = """INSERT INTO reminders (event, extra, expires, created, timezone)
-                      VALUES ($1, $2::jsonb, $3, $4, $5)
-                      RETURNING id;
-                   """
+        self.track_timer(timer)
+        return timer
 
-            try:
-                async with MaybeAcquire(None, pool=self.bot.pool) as conn:
-                    row = await conn.fetchrow(
-                        query,
-                        event,
-                        json_data,
-                        when,
-                        now,
-                        timezone_name
-                    )
-                    timer.id = row['id']
-            except asyncpg.DataError as e:
-                self.bot.log.error(f'Failed to create timer - Data error: {e}')
-                raise
-            except asyncpg.PostgresError as e:
-                self.bot.log.error(f'Failed to create timer - Database error: {e}')
-                raise
+    async def create_timers(
+            self,
+            event: str,
+            /,
+            entries: Iterable[tuple[datetime.datetime, Sequence[Any], dict[str, Any]]],
+            *,
+            created: Optional[datetime.datetime] = None,
+            timezone: str = 'UTC',
+            recurrence: Optional[datetime.timedelta] = None,
+            connection: Optional[asyncpg.Connection] = None,
+    ) -> list[Timer]:
+        """Creates many timers for the same event in a single round trip.
 
-        except (TypeError, ValueError) as e:
-            self.bot.log.error(f'Failed to serialize timer data: {e}')
-            raise commands.BadArgument(f'Could not serialize timer data: {e}') from None
+        Parameters
+        -----------
+        event: str
+            The name of the event to trigger.
+        entries: Iterable[tuple[datetime.datetime, Sequence[Any], dict[str, Any]]]
+            The ``(when, args, kwargs)`` of every timer to create.
+        created: Optional[datetime.datetime]
+            The creation time shared by all timers. Defaults to now.
+        timezone: str
+            The timezone shared by all timers.
+        recurrence: Optional[datetime.timedelta]
+            If given, every timer repeats with this interval.
+        connection: Optional[asyncpg.Connection]
+            A specific connection to use for the DB request.
 
-        # Short duration optimization after DB insert
-        if delta <= 60:
-            # a shortcut for small timers
-            self.bot.loop.create_task(self.short_timer_optimisation(delta, timer))
-            self.bot.log.info(f"Created short timer for {delta} seconds")
-            return timer
+        Returns
+        --------
+        list[:class:`Timer`]
+            The created timers, in the same order as the entries.
+        """
 
-        # only set the data check if it can be waited on
-        if delta <= (86400 * 40):  # 40 days
-            self._have_data.set()
+        now = (created or discord.utils.utcnow()).astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        timers: list[Timer] = []
+        rows: list[tuple[Any, ...]] = []
+        for when, args, kwargs in entries:
+            when = when.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+            timers.append(
+                Timer.temporary(event=event, args=args, kwargs=kwargs, expires=when, created=now,
+                                timezone=timezone, recurrence=recurrence)
+            )
+            rows.append((event, self._serialize_extra(args, kwargs), when, now, timezone, recurrence))
+
+        if not rows:
+            return timers
+
+        # COPY cannot return the generated IDs, so reserve them up front
+        query = "SELECT nextval(pg_get_serial_sequence('reminders', 'id')) FROM generate_series(1, $1);"
+        async with MaybeAcquire(connection, pool=self.bot.pool) as conn:
+            with db_latency('create_bulk').time():
+                async with conn.transaction():
+                    ids = [record[0] for record in await conn.fetch(query, len(rows))]
+                    await conn.copy_records_to_table(
+                        'reminders',
+                        records=[(timer_id, *row) for timer_id, row in zip(ids, rows)],
+                        columns=('id', 'event', 'extra', 'expires', 'created', 'timezone', 'recurrence'),
+                    )
 
-        # check if this timer is earlier than our currently run timer
-        if self._current_timer and when < self._current_timer.expires:
-            # cancel the task and re-run it
-            self._task.cancel()
-            self._task = self.bot.loop.create_task(self.dispatch_timers())
+        for timer_id, timer in zip(ids, timers):
+            timer.id = timer_id
+            self.track_timer(timer)
 
-        return timer
+        return timers
 
     @commands.hybrid_command(name="dbtest")
     async def db_test(self, ctx: commands.Context):
@@ -736,6 +850,46 @@ class Reminder(commands.Cog):
         delta = time.human_timedelta(when, source=timer.created_at)
         await interaction.followup.send(f"Alright {interaction.user.mention}, in {delta}: {text}")
 
+    @reminder.command(name='every', usage='<interval> [message]')
+    async def reminder_every(self, ctx: Context, interval: str, *, message: commands.clean_content = '…'):
+        """Reminds you of something repeatedly.
+
+        The interval uses the short format, e.g. "1d", "12h" or "1w2d".
+        Months and years are not supported, the shortest interval is 5 minutes.
+
+        Use the reminder delete command to stop a recurring reminder.
+        """
+
+        match = time.ShortTime.compiled.fullmatch(interval)
+        if match is None or not match.group(0):
+            return await ctx.send('Invalid interval provided, try e.g. "1d" or "12h".')
+
+        data = {k: int(v) for k, v in match.groupdict(default=0).items()}
+        if data.pop('years') or data.pop('months'):
+            return await ctx.send('Recurring reminders cannot use months or years, sorry.')
+
+        recurrence = datetime.timedelta(**data)
+        if recurrence < datetime.timedelta(minutes=5):
+            return await ctx.send('Recurring reminders must be at least 5 minutes apart.')
+
+        if len(message) >= 1500:
+            return await ctx.send('Reminder must be fewer than 1500 characters.')
+
+        zone = await self.get_timezone(ctx.author.id)
+        timer = await self.create_timer(
+            ctx.message.created_at + recurrence,
+            'reminder',
+            ctx.author.id,
+            ctx.channel.id,
+            message,
+            created=ctx.message.created_at,
+            message_id=ctx.message.id,
+            timezone=zone or 'UTC',
+            recurrence=recurrence,
+        )
+        delta = time.human_timedelta(timer.expires, source=timer.created_at)
+        await ctx.send(f"Alright {ctx.author.mention}, every {delta} (ID: {timer.id}): {message}")
+
     @reminder_set.error
     async def reminder_set_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
         if isinstance(error, time.BadTimeTransform):
@@ -744,7 +898,7 @@ class Reminder(commands.Cog):
     @reminder.command(name='list', ignore_extra=False)
     async def reminder_list(self, ctx: Context):
         """Shows the 10 latest currently running reminders."""
-        query = """SELECT id, expires, extra #>> '{args,2}'
+        query = """SELECT id, expires, extra #>> '{args,2}', recurrence
                    FROM reminders
                    WHERE event = 'reminder'
                    AND extra #>> '{args,0}' = $1
@@ -764,9 +918,13 @@ class Reminder(commands.Cog):
         else:
             e.set_footer(text=f'{len(records)} reminder{"s" if len(records) > 1 else ""}')
 
-        for _id, expires, message in records:
+        for _id, expires, message, recurrence in records:
             shorten = textwrap.shorten(message, width=512)
-            e.add_field(name=f'{_id}: {time.format_relative(expires)}', value=shorten, inline=False)
+            name = f'{_id}: {time.format_relative(expires)}'
+            if recurrence is not None:
+                every = time.human_timedelta(expires + recurrence, source=expires, suffix=False)
+                name = f'{name} (every {every})'
+            e.add_field(name=name, value=shorten, inline=False)
 
         await ctx.send(embed=e)
 
@@ -789,11 +947,12 @@ class Reminder(commands.Cog):
         if status == 'DELETE 0':
             return await ctx.send('Could not delete any reminders with that ID.')
 
+        self._scheduler.discard(id)
+
         # if the current timer is being deleted
         if self._current_timer and self._current_timer.id == id:
             # cancel the task and re-run it
-            self._task.cancel()
-            self._task = self.bot.loop.create_task(self.dispatch_timers())
+            self.restart_dispatcher('deleted')
 
         await ctx.send('Successfully deleted reminder.', ephemeral=True)
 
@@ -819,13 +978,14 @@ class Reminder(commands.Cog):
         if not confirm:
             return await ctx.send('Aborting', ephemeral=True)
 
-        query = """DELETE FROM reminders WHERE event = 'reminder' AND extra #>> '{args,0}' = $1;"""
-        await self.pool.execute(query, author_id)
+        query = """DELETE FROM reminders WHERE event = 'reminder' AND extra #>> '{args,0}' = $1 RETURNING id;"""
+        records = await self.pool.fetch(query, author_id)
+        for record in records:
+            self._scheduler.discard(record['id'])
 
         # Check if the current timer is the one being cleared and cancel it if so
         if self._current_timer and self._current_timer.author_id == ctx.author.id:
-            self._task.cancel()
-            self._task = self.bot.loop.create_task(self.dispatch_timers())
+            self.restart_dispatcher('deleted')
 
         await ctx.send(f'Successfully deleted {formats.plural(total):reminder}.', ephemeral=True)
 
@@ -863,7 +1023,7 @@ class Reminder(commands.Cog):
         """Retrieves info about a timezone."""
 
         embed = discord.Embed(title=tz.key, colour=discord.Colour.blurple())
-        dt = discord.utils.utcnow().astimezone(dateutil.tz.gettz(tz.key))
+        dt = discord.utils.utcnow().astimezone(self.timezones.get_tzinfo(tz.key))
         time = dt.strftime('%Y-%m-%d %I:%M %p')
         embed.add_field(name='Current Time', value=time)
 
@@ -881,7 +1041,7 @@ class Reminder(commands.Cog):
             self, interaction: discord.Interaction, argument: str
     ) -> list[app_commands.Choice[str]]:
         if not argument:
-            return self._default_timezones
+            return [app_commands.Choice(name=name, value=key) for name, key in self.timezones.popular]
         matches = self.find_timezones(argument)
         return [tz.to_choice() for tz in matches[:25]]
 
@@ -894,7 +1054,7 @@ class Reminder(commands.Cog):
         if tz is None:
             return await ctx.send(f'{user} has not set their timezone.')
 
-        time = discord.utils.utcnow().astimezone(dateutil.tz.gettz(tz)).strftime('%Y-%m-%d %I:%M %p')
+        time = discord.utils.utcnow().astimezone(self.timezones.get_tzinfo(tz)).strftime('%Y-%m-%d %I:%M %p')
         if self_query:
             msg = await ctx.send(f'Your timezone is {tz!r}. The current time is {time}.')
             await asyncio.sleep(5)
@@ -916,6 +1076,7 @@ class Reminder(commands.Cog):
         try:
             channel = self.bot.get_channel(channel_id) or (await self.bot.fetch_channel(channel_id))
         except discord.HTTPException:
+            DELIVERY_FAILURES.inc()
             return
 
         guild_id = channel.guild.id if isinstance(channel, (discord.TextChannel, discord.Thread)) else '@me'
@@ -930,11 +1091,32 @@ class Reminder(commands.Cog):
         try:
             msg = await channel.send(msg, view=view)  # type: ignore
         except discord.HTTPException:
+            DELIVERY_FAILURES.inc()
             return
         else:
             if view is not discord.utils.MISSING:
                 view.message = msg
 
+    def format_metrics(self) -> str:
+        restarts = metrics.registry.find('reminder_dispatcher_restarts_total')
+        restart_info = ', '.join(f'{m.labels["reason"]}: {m.value:g}' for m in restarts) or 'none'
+        lines = [
+            'Scheduler Metrics:',
+            f'- Dispatch lag: p50 {DISPATCH_LAG.percentile(50) * 1000:.1f}ms, '
+            f'p99 {DISPATCH_LAG.percentile(99) * 1000:.1f}ms, max {max(DISPATCH_LAG.max, 0) * 1000:.1f}ms',
+            f'- Queue depth: {QUEUE_DEPTH.value:g}',
+            f'- Timers fired: {TIMERS_FIRED.value:g}',
+            f'- Delivery failures: {DELIVERY_FAILURES.value:g}',
+            f'- Dispatcher restarts: {sum(m.value for m in restarts):g} ({restart_info})',
+            '- DB latency:',
+        ]
+        for histogram in metrics.registry.find('reminder_db_latency_seconds'):
+            lines.append(
+                f'  - {histogram.labels["operation"]}: {histogram.count} calls, '
+                f'p50 {histogram.percentile(50) * 1000:.1f}ms, p99 {histogram.percentile(99) * 1000:.1f}ms'
+            )
+        return '\n'.join(lines)
+
     @app_commands.command(name='debugreminder')
     @commands.is_owner()
     async def debug_reminder(self, interaction: discord.Interaction):
@@ -951,9 +1133,12 @@ class Reminder(commands.Cog):
             status = f"""Reminder System Status:
 - Total reminders: {count}
 - Current timer: {current_info}
+- Scheduled short timers: {len(self._scheduler)}
 - Have data flag: {self._have_data.is_set()}
 - Task running: {not self._task.done() if hasattr(self, '_task') else False}
-- Bot Latency: {self.bot.latency * 1000:.2f}ms"""
+- Bot Latency: {self.bot.latency * 1000:.2f}ms
+
+{self.format_metrics()}"""
 
             await interaction.response.send_message(f"```\n{status}\n```", ephemeral=False)
         except Exception as e:
@@ -5,29 +5,38 @@ import threading
 
 import discord
 from PyQt6.QtCore import QTimer
-from PyQt6.QtGui import QTextCursor
 from PyQt6.QtWidgets import QLabel
-from git import Repo
+
+from gui.remote import RemoteBot
+from utilFunc import dashboard, logs
+
+log = logging.getLogger(__name__)
+
+# Log entries moved from the queue into the log views per tick at most, the rest wait for the next tick
+MAX_LOG_BATCH = 2000
 
 
 class BotControlsMixin:
     def setup_logging(self):
         from gui.main import GUIHandler
         gui_handler = GUIHandler(self)
-        logging.getLogger().addHandler(gui_handler)
+        logs.add_handler(gui_handler)
 
     def check_msg_queue(self):
+        entries = []
         try:
-            while True:
-                msg = self.msg_queue.get_nowait()
-                # Use QMetaObject.invokeMethod for thread-safe updates
-                self.log_text.document().setMaximumBlockCount(1000)  # Limit line count
-                current = self.log_text.toHtml()
-                new_html = current[:-14] + msg + '<br></body></html>'
-                self.log_text.setHtml(new_html)
-                self.log_text.moveCursor(QTextCursor.MoveOperation.End)
+            while len(entries) < MAX_LOG_BATCH:
+                entries.append(self.msg_queue.get_nowait())
         except queue.Empty:
             pass
+
+        try:
+            if entries:
+                self.log_text.append(entry for entry in entries if entry.levelno < logging.ERROR)
+                errors = [entry for entry in entries if entry.levelno >= logging.ERROR]
+                if errors:
+                    self.error_log_text.append(errors)
+                    self.show_error_notification()
         finally:
             self.update_status()
 
@@ -52,7 +61,7 @@ class BotControlsMixin:
                 except asyncio.CancelledError:
                     pass
                 except Exception as e:
-                    self.error_log_text.append(f"Bot error: {str(e)}\n")
+                    log.error('Bot error: %s', e)
 
         self.bot_thread = threading.Thread(target=run_bot, daemon=True)
         self.bot_thread.start()
@@ -73,9 +82,9 @@ class BotControlsMixin:
 
                     # Close bot
                     await self.bot.close()
-                    self.log_text.append("Bot shutdown completed\n")
+                    log.info('Bot shutdown completed')
             except Exception as e:
-                self.error_log_text.append(f"Shutdown error: {str(e)}\n")
+                log.error('Shutdown error: %s', e)
             finally:
                 # Clean up timers
                 if hasattr(self, 'resource_timer'):
@@ -86,6 +95,10 @@ class BotControlsMixin:
                     self.reminder_timer.stop()
                 if hasattr(self, 'timer'):
                     self.timer.stop()
+                if hasattr(self, 'metrics_timer'):
+                    self.metrics_timer.stop()
+                if hasattr(self, 'metrics_sampler'):
+                    self.metrics_sampler.stop()
                 # Update UI
                 self.status_label.setText("Status: Disconnected")
                 self.status_label.setStyleSheet("color: #e74c3c")
@@ -98,7 +111,7 @@ class BotControlsMixin:
                 future = asyncio.run_coroutine_threadsafe(shutdown(), self.gui_loop)
                 future.result(timeout=5.0)
             except Exception as e:
-                self.error_log_text.append(f"Shutdown error: {str(e)}\n")
+                log.error('Shutdown error: %s', e)
                 # Force cleanup remaining tasks
                 for task in asyncio.all_tasks(self.gui_loop):
                     task.cancel()
@@ -108,9 +121,9 @@ class BotControlsMixin:
             try:
                 for extension in self.bot.extensions.copy():
                     await self.bot.reload_extension(extension)
-                self.log_text.append("All cogs reloaded successfully\n")
+                log.info('All cogs reloaded successfully')
             except Exception as e:
-                self.error_log_text.append(f"Error reloading cogs: {str(e)}\n")
+                log.error('Error reloading cogs: %s', e)
 
         asyncio.run_coroutine_threadsafe(_reload(), self.gui_loop)
 
@@ -122,9 +135,9 @@ class BotControlsMixin:
         async def _load():
             try:
                 await self.bot.load_extension(f"cogs.{cog_name}")
-                self.log_text.append(f"Loaded cog: {cog_name}\n")
+                log.info('Loaded cog: %s', cog_name)
             except Exception as e:
-                self.error_log_text.append(f"Error loading cog {cog_name}: {str(e)}\n")
+                log.error('Error loading cog %s: %s', cog_name, e)
 
         asyncio.run_coroutine_threadsafe(_load(), self.gui_loop)
 
@@ -136,14 +149,16 @@ class BotControlsMixin:
         async def _unload():
             try:
                 await self.bot.unload_extension(f"cogs.{cog_name}")
-                self.log_text.append(f"Unloaded cog: {cog_name}\n")
+                log.info('Unloaded cog: %s', cog_name)
             except Exception as e:
-                self.error_log_text.append(f"Error unloading cog {cog_name}: {str(e)}\n")
+                log.error('Error unloading cog %s: %s', cog_name, e)
 
         asyncio.run_coroutine_threadsafe(_unload(), self.gui_loop)
 
     def check_git_status(self):
         try:
+            from git import Repo
+
             repo = Repo(".")
             status = repo.git.status()
             current = repo.head.commit
@@ -151,10 +166,12 @@ class BotControlsMixin:
             self.git_commit_label.setText(f"Current Commit: {current.hexsha[:7]}")
         except Exception as e:
             self.git_status_label.setText("Git Status: Error")
-            self.error_log_text.append(f"Git error: {str(e)}\n")
+            log.error('Git error: %s', e)
 
     def update_repo(self):
         try:
+            from git import Repo
+
             repo = Repo(".")
             current = repo.head.commit
             repo.remotes.origin.pull()
@@ -167,7 +184,7 @@ class BotControlsMixin:
         except Exception as e:
             self.git_update_status.setText("Update Status: Error")
             self.git_update_status.setStyleSheet("color: #e74c3c")
-            self.error_log_text.append(f"Update error: {str(e)}\n")
+            log.error('Update error: %s', e)
 
     def add_uptime_monitor(self):
         # Initialize label with proper styling
@@ -186,7 +203,7 @@ class BotControlsMixin:
                 else:
                     self.uptime_label.setText("Uptime: --:--:--")
             except Exception as e:
-                self.error_log_text.append(f"Uptime error: {str(e)}\n")
+                log.error('Uptime error: %s', e)
 
         # Store timer as instance variable
         self.uptime_timer = QTimer(self)
@@ -196,13 +213,19 @@ class BotControlsMixin:
     def add_reminder_monitor(self):
         def update_reminders():
             try:
+                stats = None
                 if hasattr(self.bot, 'is_ready') and self.bot.is_ready() and self.bot.reminder:
-                    active_reminders = len(self.bot.reminder._current_timer)
-                    self.reminder_label.setText(f"Active Reminders: {active_reminders}")
-                else:
-                    self.reminder_label.setText("No active reminders")
+                    # Attached to a daemon the metrics live in the daemon, this process has none
+                    stats = self.bot.reminders if isinstance(self.bot, RemoteBot) else dashboard.reminders()
+
+                self.reminder_label.setVisible(stats is not None)
+                if stats is not None:
+                    depth, lag = stats['queue_depth'], stats['lag_p99']
+                    depth_text = '--' if depth is None else f"{depth:g}"
+                    lag_text = '--' if lag is None else f"{lag * 1000:.0f}ms"
+                    self.reminder_label.setText(f"Scheduled Reminders: {depth_text} (p99 lag: {lag_text})")
             except Exception as e:
-                self.error_log_text.append(f"Reminder monitor error: {str(e)}\n")
+                log.error('Reminder monitor error: %s', e)
 
         # Store timer as instance variable
         self.reminder_timer = QTimer(self)
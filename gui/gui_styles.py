@@ -48,7 +48,7 @@ class GUIStylesMixin:
         QLabel {
             color: #ffffff;
         }
-        QTextEdit {
+        QTextEdit, QPlainTextEdit {
             background-color: rgba(43, 43, 43, 130);  /* More translucent */
             color: #ffffff;
             border: 1px solid rgba(80, 80, 80, 130);  /* More translucent */
@@ -85,21 +85,15 @@ class GUIStylesMixin:
     """)
 
     def setup_log_colors(self):
-        # Initialize with default HTML only if not already set
-        if not self.log_text.toHtml().strip():
-            self.log_text.setHtml('<html><body></body></html>')
-        if not self.error_log_text.toHtml().strip():
-            self.error_log_text.setHtml('<html><body></body></html>')
-
         # Set default text colors
-        self.log_text.setStyleSheet("""
-            QTextEdit {
+        self.log_text.editor.setStyleSheet("""
+            QPlainTextEdit {
                 color: #ffffff;
                 background-color: #2b2b2b;
             }
         """)
-        self.error_log_text.setStyleSheet("""
-            QTextEdit {
+        self.error_log_text.editor.setStyleSheet("""
+            QPlainTextEdit {
                 color: #e74c3c;
                 background-color: #2b2b2b;
             }
@@ -124,8 +118,8 @@ class GUIStylesMixin:
             entry.setFont(text_font)
 
         # Set monospace font for log outputs
-        self.log_text.setFont(mono_font)
-        self.error_log_text.setFont(mono_font)
+        self.log_text.editor.setFont(mono_font)
+        self.error_log_text.editor.setFont(mono_font)
 
     def setup_status_indicators(self):
         # Apply trans flag gradient to status label
@@ -0,0 +1,118 @@
+import logging
+from collections import deque
+from typing import Iterable, NamedTuple
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QAction, QTextCursor
+from PyQt6.QtWidgets import QComboBox, QHBoxLayout, QLineEdit, QPlainTextEdit, QVBoxLayout, QWidget
+
+
+class LogEntry(NamedTuple):
+    levelno: int
+    name: str
+    html: str
+
+
+class LogView(QWidget):
+    """An append-only log pane.
+
+    Entries are kept in a ring buffer of ``capacity`` entries and the document is
+    capped to the same number of blocks, one block per entry. New entries are
+    appended in one edit block per batch through a cursor at the end of the
+    document, so appending never touches what is already shown. Changing the level
+    or logger filter re-renders the buffer.
+    """
+
+    LEVELS = {
+        'All levels': logging.NOTSET,
+        'Debug': logging.DEBUG,
+        'Info': logging.INFO,
+        'Warning': logging.WARNING,
+        'Error': logging.ERROR,
+    }
+
+    def __init__(self, *, capacity: int = 5000, parent=None):
+        super().__init__(parent)
+        self.capacity: int = capacity
+        self.entries: deque[LogEntry] = deque(maxlen=capacity)
+        self.min_level: int = logging.NOTSET
+        self.logger_filter: str = ''
+
+        self.level_box = QComboBox()
+        self.level_box.addItems(self.LEVELS)
+        self.level_box.currentTextChanged.connect(self._level_changed)
+
+        self.logger_box = QLineEdit()
+        self.logger_box.setPlaceholderText("Logger (e.g. 'discord.gateway')")
+        self.logger_box.textChanged.connect(self._logger_changed)
+
+        self.editor = QPlainTextEdit()
+        self.editor.setReadOnly(True)
+        self.editor.setUndoRedoEnabled(False)
+        self.editor.setMaximumBlockCount(capacity)
+
+        self.editor.setContextMenuPolicy(Qt.ContextMenuPolicy.ActionsContextMenu)
+        clear_action = QAction("Clear Log", self.editor)
+        clear_action.triggered.connect(self.clear)
+        self.editor.addAction(clear_action)
+
+        filters = QHBoxLayout()
+        filters.addWidget(self.level_box)
+        filters.addWidget(self.logger_box)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(filters)
+        layout.addWidget(self.editor)
+
+    def matches(self, entry: LogEntry) -> bool:
+        if entry.levelno < self.min_level:
+            return False
+        if self.logger_filter:
+            return entry.name == self.logger_filter or entry.name.startswith(self.logger_filter + '.')
+        return True
+
+    def append(self, entries: Iterable[LogEntry]) -> None:
+        entries = list(entries)
+        self.entries.extend(entries)
+        # Anything before the last capacity entries would be dropped straight away
+        self._insert([entry for entry in entries[-self.capacity:] if self.matches(entry)])
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.editor.clear()
+
+    def _insert(self, entries: list[LogEntry]) -> None:
+        if not entries:
+            return
+
+        scrollbar = self.editor.verticalScrollBar()
+        follow = scrollbar.value() >= scrollbar.maximum() - 4
+
+        document = self.editor.document()
+        first = document.isEmpty()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        for entry in entries:
+            if first:
+                first = False
+            else:
+                cursor.insertBlock()
+            cursor.insertHtml(entry.html)
+        cursor.endEditBlock()
+
+        # Only keep scrolling if the user hasn't scrolled up to read something
+        if follow:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def _refilter(self) -> None:
+        self.editor.clear()
+        self._insert([entry for entry in self.entries if self.matches(entry)])
+
+    def _level_changed(self, text: str) -> None:
+        self.min_level = self.LEVELS[text]
+        self._refilter()
+
+    def _logger_changed(self, text: str) -> None:
+        self.logger_filter = text.strip()
+        self._refilter()
@@ -1,17 +1,19 @@
 import asyncio
+import html
 import logging
 import queue
 
 import psutil
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QTextCursor, QAction
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QTextEdit, QLineEdit, QGroupBox, QScrollArea, QSizePolicy, QListWidget
+    QPushButton, QLabel, QLineEdit, QGroupBox, QScrollArea, QSizePolicy, QListWidget
 )
 
 from gui.bot_controls import BotControlsMixin
 from gui.gui_styles import GUIStylesMixin
+from gui.log_view import LogEntry, LogView
+from gui.metrics_panel import MetricsPanel, MetricsSampler
 
 
 class ColoredFormatter(logging.Formatter):
@@ -25,7 +27,8 @@ class ColoredFormatter(logging.Formatter):
 
     def format(self, record):
         color = self.COLORS.get(record.levelname, '#ffffff')
-        return f'<span style="color: {color}">{super().format(record)}</span>'
+        text = html.escape(super().format(record)).replace('\n', '<br>')
+        return f'<span style="color: {color}">{text}</span>'
 
 
 class GUIHandler(logging.Handler):
@@ -35,16 +38,9 @@ class GUIHandler(logging.Handler):
         self.formatter = ColoredFormatter('[%(asctime)s] [%(levelname)-8s] %(name)s: %(message)s')
 
     def emit(self, record):
+        # Called from any thread, the widgets are only touched by the GUI thread when it drains the queue
         try:
-            msg = self.formatter.format(record)
-            if record.levelno >= logging.ERROR:
-                current = self.gui.error_log_text.toHtml()
-                new_html = current[:-14] + msg + '<br></body></html>'
-                self.gui.error_log_text.setHtml(new_html)
-                self.gui.error_log_text.moveCursor(QTextCursor.MoveOperation.End)
-                self.gui.show_error_notification()
-            else:
-                self.gui.msg_queue.put(msg)
+            self.gui.msg_queue.put(LogEntry(record.levelno, record.name, self.formatter.format(record)))
         except Exception:
             self.handleError(record)
 
@@ -124,6 +120,7 @@ class BotGUI(QMainWindow, BotControlsMixin, GUIStylesMixin):
         self.create_git_group(scroll_layout)
         self.create_cog_group(scroll_layout)
         self.create_cog_status_group(scroll_layout)
+        self.create_metrics_group(scroll_layout)
         self.create_log_groups(scroll_layout)
 
         self.add_uptime_monitor()
@@ -218,33 +215,36 @@ class BotGUI(QMainWindow, BotControlsMixin, GUIStylesMixin):
         group.setLayout(layout)
         parent_layout.addWidget(group)
 
+    def create_metrics_group(self, parent_layout):
+        # Attached to a daemon the samples arrive over IPC, otherwise they're taken here off the GUI thread
+        samples = getattr(self.bot, 'samples', None)
+        if samples is None:
+            self.metrics_sampler = MetricsSampler(self.bot)
+            self.metrics_sampler.start()
+            samples = self.metrics_sampler.samples
+
+        self.metrics_panel = MetricsPanel(samples)
+        parent_layout.addWidget(self.metrics_panel)
+
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.metrics_panel.consume)
+        self.metrics_timer.start(1000)
+
     def create_log_groups(self, parent_layout):
         # Log Output
         log_group = QGroupBox("Log Output")
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
+        self.log_text = LogView(capacity=5000)
         log_group.setLayout(QVBoxLayout())
         log_group.layout().addWidget(self.log_text)
         parent_layout.addWidget(log_group)
 
         # Error Log
         error_group = QGroupBox("Error Log")
-        self.error_log_text = QTextEdit()
-        self.error_log_text.setReadOnly(True)
+        self.error_log_text = LogView(capacity=1000)
         error_group.setLayout(QVBoxLayout())
         error_group.layout().addWidget(self.error_log_text)
         parent_layout.addWidget(error_group)
 
-        self.log_text.setContextMenuPolicy(Qt.ContextMenuPolicy.ActionsContextMenu)
-        clear_action = QAction("Clear Log", self.log_text)
-        clear_action.triggered.connect(lambda: self.log_text.clear())
-        self.log_text.addAction(clear_action)
-
-        self.error_log_text.setContextMenuPolicy(Qt.ContextMenuPolicy.ActionsContextMenu)
-        clear_error_action = QAction("Clear Error Log", self.error_log_text)
-        clear_error_action.triggered.connect(lambda: self.error_log_text.clear())
-        self.error_log_text.addAction(clear_error_action)
-
         self.log_text.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.error_log_text.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
 
@@ -0,0 +1,214 @@
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Optional
+
+from PyQt6.QtCore import QPointF, Qt
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen
+from PyQt6.QtWidgets import QGridLayout, QGroupBox, QLabel, QSizePolicy, QVBoxLayout, QWidget
+
+from utilFunc import dashboard
+from utilFunc.formats import TabularData
+
+log = logging.getLogger(__name__)
+
+
+class MetricsSampler:
+    """Takes dashboard samples of an in-process bot from a background thread.
+
+    Samples are handed to the GUI through a deque, appending and popping from
+    either end of a deque is atomic so neither side takes a lock.
+    """
+
+    def __init__(self, bot, *, interval: float = 1.0):
+        self.bot = bot
+        self.interval: float = interval
+        self.samples: deque[dict[str, Any]] = deque(maxlen=60)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='metrics-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.samples.append(dashboard.sample(self.bot))
+            except RuntimeError:
+                # Something changed size while it was being read, the next sample will do
+                continue
+            except Exception:
+                log.exception('Could not take a metrics sample')
+
+
+class Sparkline(QWidget):
+    """A small line chart of the last ``capacity`` values. ``None`` values leave a gap."""
+
+    def __init__(self, title: str, fmt: Callable[[float], str], *, capacity: int = 120, color: str = '#5bcefa'):
+        super().__init__()
+        self.title: str = title
+        self.fmt: Callable[[float], str] = fmt
+        self.values: deque[Optional[float]] = deque(maxlen=capacity)
+        self.color = QColor(color)
+        self.setMinimumSize(160, 48)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+
+    def push(self, value: Optional[float]) -> None:
+        self.values.append(value)
+        self.update()
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        width = self.width()
+        height = self.height()
+        text_height = 14
+
+        current = next((v for v in reversed(self.values) if v is not None), None)
+        painter.setPen(QColor('#ffffff'))
+        painter.setFont(QFont('Segoe UI', 8))
+        label = f'{self.title}: {"--" if current is None else self.fmt(current)}'
+        painter.drawText(0, 0, width, text_height, Qt.AlignmentFlag.AlignLeft, label)
+
+        present = [v for v in self.values if v is not None]
+        if not present:
+            return
+
+        top = max(present) or 1.0
+        chart_height = height - text_height - 2
+        step = width / max(1, self.values.maxlen - 1)
+        offset = self.values.maxlen - len(self.values)
+
+        painter.setPen(QPen(self.color, 1.5))
+        previous: Optional[QPointF] = None
+        for index, value in enumerate(self.values):
+            if value is None:
+                previous = None
+                continue
+            point = QPointF((offset + index) * step, height - 1 - value / top * chart_height)
+            if previous is not None:
+                painter.drawLine(previous, point)
+            previous = point
+
+
+def _ms(value: float) -> str:
+    return f'{value * 1000:.1f}ms'
+
+
+def _number(value: float) -> str:
+    return f'{value:g}'
+
+
+def _percent(value: float) -> str:
+    return f'{value:.0%}'
+
+
+class MetricsPanel(QGroupBox):
+    """Plots dashboard samples. Call :meth:`consume` from a timer on the GUI thread."""
+
+    def __init__(self, samples: deque[dict[str, Any]]):
+        super().__init__("Metrics")
+        self.samples: deque[dict[str, Any]] = samples
+        self._previous: Optional[dict[str, Any]] = None
+
+        self.grid = QGridLayout()
+        self.lines: dict[str, Sparkline] = {}
+        for key, title, fmt in (
+            ('commands', 'Commands/s', lambda v: f'{v:.2f}'),
+            ('command_latency', 'Command latency (mean)', _ms),
+            ('loop_lag', 'Event loop lag (mean)', _ms),
+            ('reminders', 'Reminder queue depth', _number),
+            ('pool_used', 'DB connections in use', _number),
+            ('pool_idle', 'DB connections idle', _number),
+            ('pool_waiters', 'Tasks waiting for a DB connection', _number),
+        ):
+            self._add_line(key, title, fmt)
+
+        self.command_table = QLabel("No commands run yet")
+        self.command_table.setFont(QFont('Consolas', 9))
+        self.command_table.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+
+        layout = QVBoxLayout()
+        layout.addLayout(self.grid)
+        layout.addWidget(self.command_table)
+        self.setLayout(layout)
+
+    def _add_line(self, key: str, title: str, fmt: Callable[[float], str], color: str = '#5bcefa') -> Sparkline:
+        line = self.lines[key] = Sparkline(title, fmt, color=color)
+        index = len(self.lines) - 1
+        self.grid.addWidget(line, index // 2, index % 2)
+        return line
+
+    def _line(self, key: str, title: str, fmt: Callable[[float], str], color: str) -> Sparkline:
+        try:
+            return self.lines[key]
+        except KeyError:
+            return self._add_line(key, title, fmt, color)
+
+    def consume(self) -> None:
+        while True:
+            try:
+                sample = self.samples.popleft()
+            except IndexError:
+                break
+            self._plot(sample)
+
+    @staticmethod
+    def _rate(current: float, previous: float, elapsed: float) -> Optional[float]:
+        return (current - previous) / elapsed if elapsed > 0 else None
+
+    @staticmethod
+    def _mean(current: dict[str, float], previous: dict[str, float]) -> Optional[float]:
+        count = current['count'] - previous['count']
+        return (current['sum'] - previous['sum']) / count if count > 0 else None
+
+    def _plot(self, sample: dict[str, Any]) -> None:
+        previous, self._previous = self._previous, sample
+        pool = sample['pool']
+        used = pool['size'] - pool['idle'] if pool['size'] is not None and pool['idle'] is not None else None
+        self.lines['pool_used'].push(used)
+        self.lines['pool_idle'].push(pool['idle'])
+        self.lines['pool_waiters'].push(pool['waiters'])
+        self.lines['reminders'].push(sample['reminder_queue_depth'])
+
+        for shard_id, latency in sorted(sample['shards'].items(), key=lambda item: int(item[0])):
+            self._line(f'shard:{shard_id}', f'Shard {shard_id} latency', _ms, '#f5a9b8').push(latency)
+
+        self._update_command_table(sample['per_command'])
+        if previous is None:
+            # Rates need two samples
+            return
+
+        elapsed = sample['time'] - previous['time']
+        self.lines['commands'].push(self._rate(sample['commands'], previous['commands'], elapsed))
+        self.lines['command_latency'].push(self._mean(sample['command_latency'], previous['command_latency']))
+        self.lines['loop_lag'].push(self._mean(sample['loop_lag'], previous['loop_lag']))
+
+        for name, counts in sample['caches'].items():
+            before = previous['caches'].get(name, {'hits': 0.0, 'total': 0.0})
+            total = counts['total'] - before['total']
+            rate = (counts['hits'] - before['hits']) / total if total > 0 else None
+            # Keyed by the cache label, e.g. "github" or "weather_payloads"
+            title = name.replace('_', ' ').capitalize() + ' hit rate'
+            self._line(f'cache:{name}', title, _percent, '#2ecc71').push(rate)
+
+    def _update_command_table(self, per_command: list[dict[str, Any]]) -> None:
+        if not per_command:
+            return
+
+        def fmt(value: Optional[float]) -> str:
+            return '--' if value is None else f'{value * 1000:.0f}'
+
+        table = TabularData()
+        table.set_columns(['Command', 'Uses', 'p50 (ms)', 'p95 (ms)', 'p99 (ms)'])
+        for entry in per_command:
+            table.add_row([entry['command'], entry['count'], fmt(entry['p50']), fmt(entry['p95']), fmt(entry['p99'])])
+        self.command_table.setText(table.render())
@@ -0,0 +1,113 @@
+import asyncio
+import datetime
+import logging
+from collections import deque
+from typing import Any, Optional, Union
+
+from utilFunc.ipc import DEFAULT_ADDRESS, IPCClient, IPCError
+
+log = logging.getLogger(__name__)
+
+
+class RemoteBot:
+    """Stands in for the bot when the GUI is attached to a daemon over IPC.
+
+    It has the parts of the bot's interface the GUI uses. The status is polled
+    once a second along with a dashboard sample, and log records from the daemon are re-emitted locally so the
+    GUI's log handler shows them like its own.
+    """
+
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, address: Union[str, tuple[str, int]] = DEFAULT_ADDRESS):
+        self.client = IPCClient(address)
+        self.client.on_event = self._on_event
+        self._status: dict[str, Any] = {}
+        self._closed = asyncio.Event()
+        # Dashboard samples, the GUI thread takes them from the other end
+        self.samples: deque[dict[str, Any]] = deque(maxlen=60)
+
+    @property
+    def config(self):
+        import utilFunc.config
+        return utilFunc.config
+
+    def is_ready(self) -> bool:
+        return self.client.connected and self._status.get('ready', False)
+
+    @property
+    def user(self) -> Optional[str]:
+        return self._status.get('user')
+
+    @property
+    def latency(self) -> float:
+        latency = self._status.get('latency')
+        return float('nan') if latency is None else latency
+
+    @property
+    def uptime(self) -> Optional[datetime.datetime]:
+        uptime = self._status.get('uptime')
+        return datetime.datetime.fromisoformat(uptime) if uptime else None
+
+    @property
+    def extensions(self) -> dict[str, None]:
+        return dict.fromkeys(self._status.get('extensions', ()))
+
+    @property
+    def reminder(self) -> bool:
+        return self._status.get('reminder', False)
+
+    @property
+    def reminders(self) -> Optional[dict[str, Optional[float]]]:
+        """The daemon's :func:`dashboard.reminders`, ``None`` without the reminder cog."""
+        return self._status.get('reminders')
+
+    def _on_event(self, message: dict[str, Any]) -> None:
+        if message['event'] != 'log':
+            return
+
+        data = message['record']
+        if data.get('dropped'):
+            log.warning('%s log records from the bot were dropped', data['dropped'])
+        record = logging.makeLogRecord(data)
+        logging.getLogger(record.name).handle(record)
+
+    async def start(self, token: Optional[str] = None) -> None:
+        """Connects to the daemon and keeps the status current until :meth:`close` is called.
+
+        The token is only there to match the bot's signature, the daemon is already logged in.
+        """
+        self._closed.clear()
+        await self.client.connect()
+        await self.client.request('subscribe')
+        while not self._closed.is_set():
+            try:
+                self._status = await self.client.request('status')
+                self.samples.append(await self.client.request('sample'))
+            except IPCError:
+                self._status = {}
+                raise
+            try:
+                await asyncio.wait_for(self._closed.wait(), timeout=self.POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def load_extension(self, name: str) -> None:
+        await self.client.request('load', name=name)
+
+    async def unload_extension(self, name: str) -> None:
+        await self.client.request('unload', name=name)
+
+    async def reload_extension(self, name: str) -> None:
+        await self.client.request('reload', name=name)
+
+    async def close(self) -> None:
+        """Shuts the daemon down and disconnects."""
+        try:
+            # Not waiting for the reply, the connection goes away with the daemon
+            self.client.send('shutdown')
+        except IPCError:
+            pass
+        self._closed.set()
+        self._status = {}
+        await self.client.close()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+import sys
+
+import click
+
+
+def use_uvloop() -> None:
+    """Makes new event loops uvloop ones where it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+async def run_daemon(ipc: bool) -> None:
+    from bot import OmelettePy
+    from utilFunc.ipc import IPCServer
+
+    log = logging.getLogger('ommiepy')
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows, where Ctrl+C raises KeyboardInterrupt instead
+            pass
+
+    bot = OmelettePy()
+    server = IPCServer(bot, on_shutdown=stop.set) if ipc else None
+    async with bot:
+        if server is not None:
+            await server.start()
+
+        runner = asyncio.create_task(bot.start(bot.config.TOKEN))
+        stopping = asyncio.create_task(stop.wait())
+        try:
+            await asyncio.wait({runner, stopping}, return_when=asyncio.FIRST_COMPLETED)
+            if stopping.done():
+                log.info('Shutting down')
+        finally:
+            stopping.cancel()
+            if server is not None:
+                await server.close()
+            if not bot.is_closed():
+                await bot.close()
+
+        if runner.done() and not runner.cancelled():
+            # Raises if the bot stopped because of an error
+            runner.result()
+
+
+@click.group(invoke_without_command=True, options_metavar='[options]')
+@click.option('--ipc/--no-ipc', default=True, help='Whether the GUI can attach to the bot.')
+@click.pass_context
+def main(ctx: click.Context, ipc: bool):
+    """Runs the bot without a GUI, stopping gracefully on SIGINT or SIGTERM."""
+    if ctx.invoked_subcommand is None:
+        use_uvloop()
+        try:
+            asyncio.run(run_daemon(ipc))
+        except KeyboardInterrupt:
+            pass
+
+
+@main.command()
+@click.option('--attach', is_flag=True, help='Attach to a bot started with the launcher instead of running one.')
+def gui(attach: bool):
+    """Runs the GUI control panel, with the bot in the same process unless attaching."""
+    if not attach:
+        import bot
+
+        sys.exit(bot.main())
+
+    from PyQt6.QtWidgets import QApplication
+
+    from gui import BotGUI
+    from gui.remote import RemoteBot
+
+    logging.basicConfig(level=logging.INFO)
+    app = QApplication(sys.argv)
+    window = BotGUI(RemoteBot())
+    window.run()
+    window.start_bot()
+    sys.exit(app.exec())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+-- Revises: V7
+-- Creation Date: 2026-10-19
+-- Reason: recurring reminders
+
+ALTER TABLE reminders
+    ADD COLUMN IF NOT EXISTS recurrence INTERVAL;
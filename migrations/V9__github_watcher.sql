@@ -0,0 +1,57 @@
+-- Revises: V8
+-- Creation Date: 2026-10-19
+-- Reason: github repository watcher
+
+CREATE TABLE IF NOT EXISTS github_repos
+(
+    full_name       TEXT PRIMARY KEY,               -- lower cased owner/name
+    owner           TEXT NOT NULL,
+    name            TEXT NOT NULL,
+    commits_since   TIMESTAMP,                      -- newest commit date seen, used as the since cursor
+    commits_until   TIMESTAMP,                      -- set while older commits are still being fetched
+    commits_pending TIMESTAMP,                      -- newest commit date seen while fetching them
+    commits_etag    TEXT,
+    issues_since    TIMESTAMP,                      -- newest issue update seen, used as the since cursor
+    issues_etag     TEXT,
+    issues_complete BOOLEAN NOT NULL DEFAULT FALSE, -- all issues have been fetched at least once
+    last_synced     TIMESTAMP,
+    sync_error      TEXT
+);
+
+CREATE TABLE IF NOT EXISTS github_watched_repos
+(
+    id         SERIAL PRIMARY KEY,
+    guild_id   BIGINT NOT NULL,
+    repo       TEXT NOT NULL REFERENCES github_repos (full_name) ON DELETE CASCADE,
+    created_at TIMESTAMP DEFAULT (now() at time zone 'utc')
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS github_watched_repos_uniq_idx ON github_watched_repos (guild_id, repo);
+CREATE INDEX IF NOT EXISTS github_watched_repos_repo_idx ON github_watched_repos (repo);
+
+CREATE TABLE IF NOT EXISTS github_commits
+(
+    repo         TEXT NOT NULL REFERENCES github_repos (full_name) ON DELETE CASCADE,
+    sha          TEXT NOT NULL,
+    message      TEXT NOT NULL,
+    author       TEXT,
+    url          TEXT NOT NULL,
+    committed_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (repo, sha)
+);
+
+CREATE INDEX IF NOT EXISTS github_commits_repo_committed_at_idx ON github_commits (repo, committed_at DESC);
+
+CREATE TABLE IF NOT EXISTS github_issues
+(
+    repo       TEXT NOT NULL REFERENCES github_repos (full_name) ON DELETE CASCADE,
+    number     INTEGER NOT NULL,
+    title      TEXT NOT NULL,
+    url        TEXT NOT NULL,
+    state      TEXT NOT NULL,
+    is_pull    BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (repo, number)
+);
+
+CREATE INDEX IF NOT EXISTS github_issues_repo_state_idx ON github_issues (repo, state, number DESC);
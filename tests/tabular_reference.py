@@ -0,0 +1,82 @@
+"""The row oriented TabularData and sample rows to compare the current one with.
+
+Used by the tests to check the output and by ``benchmarks.tabular`` to time both.
+"""
+
+from __future__ import annotations
+
+import datetime
+import random
+from typing import Any, Callable, Iterable
+
+
+class RowTabularData:
+    """The previous, row oriented implementation, kept as the reference output."""
+
+    def __init__(self):
+        self._widths: list[int] = []
+        self._columns: list[str] = []
+        self._rows: list[list[str]] = []
+
+    def set_columns(self, columns: list[str]):
+        self._columns = columns
+        self._widths = [len(c) + 2 for c in columns]
+
+    def add_row(self, row: Iterable[Any]) -> None:
+        rows = [str(r) for r in row]
+        self._rows.append(rows)
+        for index, element in enumerate(rows):
+            width = len(element) + 2
+            if width > self._widths[index]:
+                self._widths[index] = width
+
+    def add_rows(self, rows: Iterable[Iterable[Any]]) -> None:
+        for row in rows:
+            self.add_row(row)
+
+    def render(self) -> str:
+        sep = '+'.join('-' * w for w in self._widths)
+        sep = f'+{sep}+'
+
+        to_draw = [sep]
+
+        def get_entry(d):
+            elem = '|'.join(f'{e:^{self._widths[i]}}' for i, e in enumerate(d))
+            return f'|{elem}|'
+
+        to_draw.append(get_entry(self._columns))
+        to_draw.append(sep)
+
+        for row in self._rows:
+            to_draw.append(get_entry(row))
+
+        to_draw.append(sep)
+        return '\n'.join(to_draw)
+
+
+COLUMNS = ['id', 'guild_id', 'name', 'uses', 'created_at', 'owner']
+
+
+def sample_rows(count: int, *, seed: int = 0) -> list[tuple[Any, ...]]:
+    """Rows shaped like a ``SELECT * FROM tags``, with the odd NULL and non ASCII name."""
+    rng = random.Random(seed)
+    words = ['omelette', 'café', 'reminder', 'ping', 'faq', 'über', 'rtfm', 'quote', 'weather', '🍳']
+    start = datetime.datetime(2020, 1, 1)
+    return [
+        (
+            index,
+            rng.randrange(10**17, 10**18),
+            ' '.join(rng.choices(words, k=rng.randint(1, 4))),
+            rng.randint(0, 5000),
+            start + datetime.timedelta(seconds=rng.randrange(10**8)),
+            None if rng.random() < 0.05 else rng.randrange(10**17, 10**18),
+        )
+        for index in range(count)
+    ]
+
+
+def build(cls: Callable[[], Any], rows: list[tuple[Any, ...]]) -> Any:
+    table = cls()
+    table.set_columns(COLUMNS)
+    table.add_rows(rows)
+    return table
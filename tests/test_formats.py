@@ -0,0 +1,53 @@
+import unittest
+
+from tests.tabular_reference import COLUMNS, RowTabularData, build, sample_rows
+from utilFunc.formats import TabularData
+
+
+class TabularDataTest(unittest.TestCase):
+    def assertSameAsRowOriented(self, columns, rows):
+        old = RowTabularData()
+        old.set_columns(columns)
+        old.add_rows(rows)
+
+        new = TabularData()
+        new.set_columns(columns)
+        new.add_rows(rows)
+        self.assertEqual(new.render(), old.render())
+        self.assertEqual('\n'.join(new.render_iter()), old.render())
+
+    def test_matches_row_oriented_output(self):
+        rows = sample_rows(5000)
+        self.assertEqual(build(TabularData, rows).render(), build(RowTabularData, rows).render())
+
+    def test_empty_table(self):
+        self.assertSameAsRowOriented(['a', 'long header'], [])
+
+    def test_header_wider_than_cells(self):
+        self.assertSameAsRowOriented(['a very long header', 'b'], [(1, 2), (None, True)])
+
+    def test_odd_width_centering(self):
+        self.assertSameAsRowOriented(['ab', 'c'], [('x', 'yyyy'), ('xyz', ''), ('🍳', 'café')])
+
+    def test_add_row_and_add_rows_agree(self):
+        rows = sample_rows(100)
+        one_by_one = TabularData()
+        one_by_one.set_columns(COLUMNS)
+        for row in rows:
+            one_by_one.add_row(row)
+        self.assertEqual(one_by_one.render(), build(TabularData, rows).render())
+        self.assertEqual(len(one_by_one), 100)
+
+    def test_rows_of_the_wrong_length_are_rejected(self):
+        table = TabularData()
+        table.set_columns(['a', 'b'])
+        with self.assertRaises(ValueError):
+            table.add_row([1])
+        with self.assertRaises(ValueError):
+            table.add_rows([(1, 2), (1, 2, 3)])
+        # Nothing from the rejected batch was added
+        self.assertEqual(len(table), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,244 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from typing import Optional
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from utilFunc.github import CACHE_HITS, CACHE_MISSES, CACHE_REVALIDATED, GitHubClient, RateLimited, ResponseCache
+
+
+class StubGitHub:
+    """A stand-in for the GitHub API that answers from a queue of canned responses.
+
+    Once the queue is empty it answers with ``data``, and if ``etag`` is set it
+    sends that along and answers ``304`` to requests that already have it.
+    """
+
+    def __init__(self):
+        self.responses: list[web.Response] = []
+        self.data: object = {'ok': True}
+        self.etag: Optional[str] = None
+        self.if_none_match: list[Optional[str]] = []
+        self.hits: int = 0
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self.delay: float = 0.0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if self.responses:
+                return self.responses.pop(0)
+
+            self.if_none_match.append(request.headers.get('If-None-Match'))
+            if self.etag is None:
+                return web.json_response(self.data)
+            if request.headers.get('If-None-Match') == self.etag:
+                return web.Response(status=304, headers={'ETag': self.etag})
+            return web.json_response(self.data, headers={'ETag': self.etag})
+        finally:
+            self.in_flight -= 1
+
+
+def rate_limit_headers(remaining: int, reset: float, limit: int = 60) -> dict[str, str]:
+    return {
+        'X-RateLimit-Limit': str(limit),
+        'X-RateLimit-Remaining': str(remaining),
+        'X-RateLimit-Reset': str(reset),
+    }
+
+
+class StubGitHubTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.stub = StubGitHub()
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self.stub.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.session = aiohttp.ClientSession()
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.server.close()
+
+    def client(self, **kwargs) -> GitHubClient:
+        return GitHubClient(self.session, base_url=str(self.server.make_url('')), **kwargs)
+
+
+class GitHubClientTest(StubGitHubTestCase):
+    async def test_concurrency_is_limited(self):
+        self.stub.delay = 0.05
+        client = self.client(max_concurrency=3)
+        responses = await asyncio.gather(*(client.get('/repos/a/b') for _ in range(10)))
+
+        self.assertTrue(all(response.status == 200 for response in responses))
+        self.assertEqual(self.stub.hits, 10)
+        self.assertEqual(self.stub.max_in_flight, 3)
+
+    async def test_rate_limit_headers_are_tracked(self):
+        reset = time.time() + 3600
+        self.stub.responses.append(web.json_response({}, headers=rate_limit_headers(41, reset)))
+        client = self.client()
+        await client.get('/rate_limit')
+
+        self.assertEqual(client.rate_limit, 60)
+        self.assertEqual(client.rate_limit_remaining, 41)
+        self.assertAlmostEqual(client.rate_limit_reset, reset, places=3)
+
+    async def test_exhausted_rate_limit_waits_for_reset(self):
+        self.stub.responses.append(web.json_response({}, headers=rate_limit_headers(0, time.time() + 0.3)))
+        client = self.client()
+        await client.get('/first')
+
+        start = time.perf_counter()
+        response = await client.get('/second')
+        self.assertEqual(response.status, 200)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.2)
+
+    async def test_exhausted_rate_limit_raises_past_max_wait(self):
+        self.stub.responses.append(web.json_response({}, headers=rate_limit_headers(0, time.time() + 3600)))
+        client = self.client(max_rate_limit_wait=1.0)
+        await client.get('/first')
+
+        with self.assertRaises(RateLimited):
+            await client.get('/second')
+        self.assertEqual(self.stub.hits, 1)
+
+    async def test_retry_after_backs_off_and_retries(self):
+        self.stub.responses.append(web.json_response({}, status=403, headers={'Retry-After': '0.2'}))
+        client = self.client()
+
+        start = time.perf_counter()
+        response = await client.get('/repos/a/b')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(self.stub.hits, 2)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.15)
+
+    async def test_retry_after_is_only_honoured_once(self):
+        for _ in range(2):
+            self.stub.responses.append(web.json_response({}, status=429, headers={'Retry-After': '0'}))
+        client = self.client()
+
+        response = await client.get('/repos/a/b')
+        self.assertEqual(response.status, 429)
+        self.assertEqual(self.stub.hits, 2)
+
+    async def test_retry_after_past_max_wait_is_returned(self):
+        self.stub.responses.append(web.json_response({}, status=403, headers={'Retry-After': '120'}))
+        client = self.client(max_rate_limit_wait=1.0)
+
+        response = await client.get('/repos/a/b')
+        self.assertEqual(response.status, 403)
+        self.assertEqual(self.stub.hits, 1)
+
+    async def test_primary_rate_limit_403_is_retried(self):
+        reset = time.time() + 0.2
+        self.stub.responses.append(web.json_response({}, status=403, headers=rate_limit_headers(0, reset)))
+        client = self.client()
+
+        start = time.perf_counter()
+        response = await client.get('/repos/a/b')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(self.stub.hits, 2)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.1)
+
+
+def cache_counts() -> tuple[float, float, float]:
+    return CACHE_HITS.value, CACHE_REVALIDATED.value, CACHE_MISSES.value
+
+
+class ResponseCacheTest(StubGitHubTestCase):
+    def assertCounted(self, before: tuple[float, float, float], hits: int, revalidated: int, misses: int):
+        after = cache_counts()
+        self.assertEqual(
+            (after[0] - before[0], after[1] - before[1], after[2] - before[2]), (hits, revalidated, misses)
+        )
+
+    async def test_fresh_entries_are_served_from_memory(self):
+        self.stub.etag = '"v1"'
+        client = self.client(cache=ResponseCache(ttl=60.0))
+        before = cache_counts()
+
+        first = await client.get('/repos/a/b')
+        second = await client.get('/repos/a/b')
+        self.assertFalse(first.cached)
+        self.assertTrue(second.cached)
+        self.assertEqual(second.data, {'ok': True})
+        self.assertEqual(second.headers['ETag'], '"v1"')
+        self.assertEqual(self.stub.hits, 1)
+        self.assertCounted(before, hits=1, revalidated=0, misses=1)
+
+    async def test_stale_entries_are_revalidated(self):
+        self.stub.etag = '"v1"'
+        client = self.client(cache=ResponseCache(ttl=0.0))
+        before = cache_counts()
+
+        await client.get('/repos/a/b')
+        response = await client.get('/repos/a/b')
+        self.assertEqual(self.stub.if_none_match, [None, '"v1"'])
+        self.assertEqual(response.status, 200)
+        self.assertTrue(response.cached)
+        self.assertEqual(response.data, {'ok': True})
+
+        # Once it changes upstream the new version replaces the cached one
+        self.stub.etag = '"v2"'
+        self.stub.data = {'ok': False}
+        response = await client.get('/repos/a/b')
+        self.assertFalse(response.cached)
+        self.assertEqual(response.data, {'ok': False})
+        self.assertEqual(self.stub.hits, 3)
+        self.assertCounted(before, hits=0, revalidated=1, misses=2)
+
+    async def test_revalidate_skips_fresh_entries(self):
+        self.stub.etag = '"v1"'
+        client = self.client(cache=ResponseCache(ttl=60.0))
+
+        await client.get('/repos/a/b')
+        response = await client.get('/repos/a/b', revalidate=True)
+        self.assertTrue(response.cached)
+        self.assertEqual(self.stub.if_none_match, [None, '"v1"'])
+
+    async def test_responses_without_validators_are_not_cached(self):
+        client = self.client(cache=ResponseCache(ttl=60.0))
+        before = cache_counts()
+
+        await client.get('/repos/a/b')
+        response = await client.get('/repos/a/b')
+        self.assertFalse(response.cached)
+        self.assertEqual(self.stub.hits, 2)
+        self.assertEqual(len(client.cache), 0)
+        self.assertCounted(before, hits=0, revalidated=0, misses=2)
+
+    async def test_entries_survive_in_sqlite(self):
+        self.stub.etag = '"v1"'
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.sqlite3')
+            cache = ResponseCache(ttl=60.0, path=path)
+            await self.client(cache=cache).get('/repos/a/b', params={'per_page': 100})
+            cache.close()
+
+            # A new client with an empty memory tier, like after a restart
+            cache = ResponseCache(ttl=60.0, path=path)
+            before = cache_counts()
+            try:
+                response = await self.client(cache=cache).get('/repos/a/b', params={'per_page': 100})
+            finally:
+                cache.close()
+
+        self.assertTrue(response.cached)
+        self.assertEqual(response.data, {'ok': True})
+        self.assertEqual(self.stub.hits, 1)
+        self.assertCounted(before, hits=1, revalidated=0, misses=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import asyncio
+import os
+import stat
+import sys
+import tempfile
+import unittest
+
+from utilFunc.ipc import IPCClient, IPCError, IPCServer
+
+
+class StubBot:
+    latency = float('nan')
+    user = None
+    guilds = []
+    extensions = {'cogs.reminders': None}
+    reminder = None
+    latencies = []
+
+    def __init__(self):
+        self.loaded: list[str] = []
+
+    def is_ready(self) -> bool:
+        return True
+
+    async def load_extension(self, name: str) -> None:
+        self.loaded.append(name)
+
+
+@unittest.skipIf(sys.platform == 'win32', 'uses a unix socket')
+class IPCServerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.directory.name, 'bot.sock')
+        self.token_path = os.path.join(self.directory.name, 'bot.token')
+        self.bot = StubBot()
+        self.shutdowns = 0
+        self.server = IPCServer(self.bot, address=self.address, token_path=self.token_path, on_shutdown=self.shutdown)
+        await self.server.start()
+
+    def shutdown(self) -> None:
+        self.shutdowns += 1
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        self.directory.cleanup()
+
+    async def test_authenticated_client(self):
+        client = IPCClient(self.address, token_path=self.token_path)
+        await client.connect()
+        try:
+            status = await client.request('status')
+            await client.request('load', name='cogs.reminders')
+        finally:
+            await client.close()
+        self.assertEqual(status['extensions'], ['cogs.reminders'])
+        self.assertEqual(self.bot.loaded, ['cogs.reminders'])
+
+    async def test_socket_and_token_are_owner_only(self):
+        for path in (self.address, self.token_path):
+            with self.subTest(path=path):
+                self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+
+    async def test_requests_before_auth_close_the_connection(self):
+        reader, writer = await asyncio.open_unix_connection(self.address)
+        writer.write(b'{"id": 1, "op": "shutdown"}\n')
+        self.assertIn(b'not authenticated', await reader.readline())
+        self.assertEqual(await reader.readline(), b'')
+        writer.close()
+        self.assertEqual(self.shutdowns, 0)
+
+    async def test_wrong_token_is_rejected(self):
+        with open(self.token_path, 'w', encoding='utf-8') as fp:
+            fp.write('wrong')
+        client = IPCClient(self.address, token_path=self.token_path)
+        with self.assertRaises(IPCError):
+            await client.connect()
+        self.assertFalse(client.connected)
+
+    async def test_token_file_is_removed_on_close(self):
+        await self.server.close()
+        self.assertFalse(os.path.exists(self.token_path))
+        client = IPCClient(self.address, token_path=self.token_path)
+        with self.assertRaises(IPCError):
+            await client.connect()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import logging
+import threading
+import unittest
+
+from utilFunc import logs
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+        self.threads: list[str] = []
+        self.closed: bool = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.threads.append(threading.current_thread().name)
+        self.records.append(record)
+        self.format(record)
+
+    def close(self) -> None:
+        self.closed = True
+        super().close()
+
+
+class LogPipelineTest(unittest.TestCase):
+    def setUp(self):
+        self.log = logging.getLogger('tests.logs')
+        self.log.setLevel(logging.INFO)
+
+    def tearDown(self):
+        logs.shutdown()
+
+    def test_added_handlers_survive_reinstalling(self):
+        logs.install([RecordingHandler()])
+        added = RecordingHandler()
+        logs.add_handler(added)
+
+        logs.install([RecordingHandler()])
+        self.log.info('after')
+        logs.shutdown()
+
+        self.assertEqual([record.getMessage() for record in added.records], ['after'])
+        # Handlers added from outside belong to whoever added them
+        self.assertFalse(added.closed)
+
+    def test_pipeline_closes_its_own_handlers(self):
+        own = RecordingHandler()
+        logs.install([own])
+        logs.shutdown()
+        self.assertTrue(own.closed)
+
+    def test_tracebacks_are_formatted_on_the_listener_thread(self):
+        handler = RecordingHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logs.install([handler])
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            self.log.exception('failed')
+        logs.shutdown()
+
+        (record,) = handler.records
+        self.assertIsNotNone(record.exc_info)
+        self.assertIn('ValueError: boom', record.exc_text)
+        self.assertNotEqual(handler.threads[0], threading.current_thread().name)
+
+    def test_message_arguments_are_merged_when_logging(self):
+        handler = RecordingHandler()
+        logs.install([handler])
+        values = ['before']
+        self.log.info('value: %s', values)
+        values[0] = 'after'
+        logs.shutdown()
+
+        self.assertEqual(handler.records[0].getMessage(), "value: ['before']")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+
+import aiohttp
+import asyncpg
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from utilFunc.profiling import CallCounter
+
+
+def patched_methods() -> list[object]:
+    return [asyncpg.Connection.__dict__[name] for name in CallCounter.DB_METHODS] + [
+        aiohttp.ClientSession.__dict__['_request']
+    ]
+
+
+class CallCounterTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        app = web.Application()
+        app.router.add_get('/', self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.session = aiohttp.ClientSession()
+        self.originals = patched_methods()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        return web.Response(text='ok')
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.server.close()
+
+    async def request(self) -> None:
+        async with self.session.get(self.server.make_url('/')) as resp:
+            await resp.read()
+
+    async def test_originals_are_restored(self):
+        with CallCounter():
+            self.assertNotEqual(patched_methods(), self.originals)
+        self.assertEqual(patched_methods(), self.originals)
+
+    async def test_overlapping_counters_restore_the_originals(self):
+        outer_entered = asyncio.Event()
+        inner_done = asyncio.Event()
+
+        async def outer():
+            with CallCounter():
+                outer_entered.set()
+                await inner_done.wait()
+
+        async def inner():
+            await outer_entered.wait()
+            with CallCounter():
+                pass
+            inner_done.set()
+
+        # The outer counter is entered first and exits last, the inner one in between
+        await asyncio.gather(outer(), inner())
+        self.assertEqual(patched_methods(), self.originals)
+
+        # And the other way around: the first one in exits first
+        first = CallCounter().__enter__()
+        second = CallCounter().__enter__()
+        first.__exit__(None, None, None)
+        self.assertNotEqual(patched_methods(), self.originals)
+        second.__exit__(None, None, None)
+        self.assertEqual(patched_methods(), self.originals)
+
+    async def test_nested_counters_both_count(self):
+        with CallCounter() as outer:
+            await self.request()
+            with CallCounter() as inner:
+                await self.request()
+            await self.request()
+
+        self.assertEqual(outer['http'], 3)
+        self.assertEqual(inner['http'], 1)
+
+    async def test_concurrent_counters_only_count_their_task(self):
+        async def count(requests: int) -> int:
+            with CallCounter() as counter:
+                for _ in range(requests):
+                    await self.request()
+                    await asyncio.sleep(0)
+            return counter['http']
+
+        self.assertEqual(await asyncio.gather(count(2), count(5)), [2, 5])
+        self.assertEqual(patched_methods(), self.originals)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from utilFunc.quotes import MIGRATIONS, QuoteStore, quote_hash
+
+# The same quote saved from different processes got different hash() keys
+V1_ROWS = [
+    (str(hash('alice' + 'hello there')), 'alice', 'hello there', '2024-01-01', 1),
+    (str(hash('alice' + 'hello there') + 1), 'alice', 'hello there', '2024-02-01', 1),
+    # Differs only in case and whitespace
+    (str(hash('alice' + 'Hello  there')), 'Alice', 'Hello  there', '2024-03-01', 1),
+    (str(hash('bob' + 'general kenobi')), 'bob', 'general kenobi', '2024-01-02', 1),
+    # The same quote in another guild is not a duplicate
+    (str(hash('alice' + 'hello there') + 2), 'alice', 'hello there', '2024-01-03', 2),
+]
+
+
+class QuoteStoreMigrationTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'quotes.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def create_v1(self, user_version: int) -> None:
+        db = sqlite3.connect(self.path)
+        with db:
+            db.execute(
+                'CREATE TABLE quotes(hash TEXT primary key, user TEXT, message TEXT, date_added TEXT, guild_id INT)'
+            )
+            db.executemany('INSERT INTO quotes VALUES(?,?,?,?,?)', V1_ROWS)
+            if user_version:
+                MIGRATIONS[0](db)
+                db.execute(f'PRAGMA user_version = {user_version}')
+        db.close()
+
+    async def assertMigrated(self) -> None:
+        store = QuoteStore(self.path)
+        await store.open()
+        try:
+            self.assertEqual(await store.count(1), 2)
+            self.assertEqual(await store.count(2), 1)
+        finally:
+            await store.close()
+
+        # The store's connection belongs to its worker thread
+        db = sqlite3.connect(self.path)
+        try:
+            self.assertEqual(db.execute('PRAGMA user_version').fetchone()[0], len(MIGRATIONS))
+
+            rows = db.execute('SELECT hash, user, message, date_added, guild_id FROM quotes ORDER BY id').fetchall()
+            # The first of each set of duplicates is kept
+            self.assertEqual(
+                rows,
+                [
+                    (quote_hash('alice', 'hello there'), 'alice', 'hello there', '2024-01-01', 1),
+                    (quote_hash('bob', 'general kenobi'), 'bob', 'general kenobi', '2024-01-02', 1),
+                    (quote_hash('alice', 'hello there'), 'alice', 'hello there', '2024-01-03', 2),
+                ],
+            )
+
+            counts = db.execute('SELECT guild_id, count FROM quote_counts ORDER BY guild_id').fetchall()
+            self.assertEqual(counts, [(1, 2), (2, 1)])
+
+            with self.assertRaises(sqlite3.IntegrityError):
+                db.execute(
+                    'INSERT INTO quotes (hash, user, message, date_added, guild_id) VALUES(?,?,?,?,?)',
+                    (quote_hash('bob', 'general kenobi'), 'bob', 'general kenobi', '2024-05-01', 1),
+                )
+        finally:
+            db.close()
+
+    async def test_migrates_unversioned_database(self):
+        # Databases created before migrations were tracked
+        self.create_v1(0)
+        await self.assertMigrated()
+
+    async def test_migrates_v1_database(self):
+        self.create_v1(1)
+        await self.assertMigrated()
+
+    async def test_duplicates_are_skipped_after_migrating(self):
+        self.create_v1(1)
+        await self.assertMigrated()
+
+        store = QuoteStore(self.path)
+        await store.open()
+        try:
+            self.assertIsNone(await store.add(1, 'ALICE', 'hello   there', '2024-05-01'))
+            self.assertEqual(await store.add(1, 'bob', 'hello there', '2024-05-01'), 3)
+        finally:
+            await store.close()
+
+        # Opening it again doesn't run the migrations a second time
+        store = QuoteStore(self.path)
+        await store.open()
+        try:
+            self.assertEqual(await store.count(1), 3)
+            self.assertEqual(await store.count(2), 1)
+        finally:
+            await store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import datetime
+import unittest
+
+from cogs.reminders import Timer
+
+CREATED = datetime.datetime(2026, 1, 1)
+DAY = datetime.timedelta(days=1)
+
+
+def make_timer(*, expires: datetime.datetime, recurrence: datetime.timedelta | None = None) -> Timer:
+    return Timer.temporary(
+        expires=expires,
+        created=CREATED,
+        event='reminder',
+        args=(1, 2, 'stretch'),
+        kwargs={},
+        timezone='UTC',
+        recurrence=recurrence,
+    )
+
+
+class TimerTest(unittest.TestCase):
+    def test_one_off_timers_count_from_creation(self):
+        timer = make_timer(expires=CREATED + 3 * DAY)
+        self.assertEqual(timer.previous_occurrence, CREATED)
+
+    def test_first_firing_counts_from_creation(self):
+        # Set halfway through the day, so the first firing comes before a full interval
+        timer = make_timer(expires=CREATED + DAY / 2, recurrence=DAY)
+        self.assertEqual(timer.previous_occurrence, CREATED)
+
+    def test_later_firings_count_from_the_previous_one(self):
+        timer = make_timer(expires=CREATED + 30 * DAY, recurrence=DAY)
+        self.assertEqual(timer.previous_occurrence, CREATED + 29 * DAY)
+        self.assertEqual(timer.rescheduled(CREATED + 31 * DAY).previous_occurrence, CREATED + 30 * DAY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import datetime
+import unittest
+
+from discord.ext import commands
+
+from tests.time_reference import CORPUS, NOW, convert, parsedatetime_only
+from utilFunc.time import FastTimeParser, HumanTime
+
+UTC = datetime.timezone.utc
+
+# Phrases parsedatetime gets wrong that the fast path handles, with what they should parse to
+IMPROVED = {
+    # parsedatetime stops at the "and" and leaves the rest in the reminder text
+    '2 hours and 30 minutes take a break': (datetime.datetime(2026, 10, 19, 14, 30, tzinfo=UTC), 'take a break'),
+    # ... or can't find a time at all once that happens at the end
+    'review PR 2 hours and 15 minutes': (datetime.datetime(2026, 10, 19, 14, 15, tzinfo=UTC), 'review PR'),
+    # parsedatetime reads "2026" as a clock time
+    '2026-11-01T09:30 board meeting': (datetime.datetime(2026, 11, 1, 9, 30, tzinfo=UTC), 'board meeting'),
+}
+
+
+async def parse(argument: str) -> tuple[datetime.datetime, str] | type[Exception]:
+    try:
+        result = await convert(argument)
+    except commands.BadArgument as e:
+        return type(e)
+    return result.dt, result.arg
+
+
+class FastTimeParserTest(unittest.IsolatedAsyncioTestCase):
+    def test_corpus_covers_both_paths(self):
+        fast = [argument for argument in CORPUS if FastTimeParser.scan(argument) is not None]
+        self.assertGreater(len(fast), 0)
+        self.assertLess(len(fast), len(CORPUS))
+
+    async def test_fast_path_matches_parsedatetime(self):
+        for argument in CORPUS:
+            if argument in IMPROVED:
+                continue
+            with self.subTest(argument=argument):
+                fast = await parse(argument)
+                with parsedatetime_only():
+                    slow = await parse(argument)
+                self.assertEqual(fast, slow)
+
+    async def test_improved_phrases(self):
+        for argument, expected in IMPROVED.items():
+            with self.subTest(argument=argument):
+                self.assertIsNotNone(FastTimeParser.scan(argument))
+                self.assertEqual(await parse(argument), expected)
+
+    def test_human_time_matches_parsedatetime(self):
+        for argument in ('3 days', 'tomorrow', 'tomorrow at 3pm', 'at 5pm', 'in 2 weeks', '2026-12-24'):
+            with self.subTest(argument=argument):
+                self.assertIsNotNone(FastTimeParser.scan(argument))
+                fast = HumanTime(argument, now=NOW).dt
+                with parsedatetime_only():
+                    slow = HumanTime(argument, now=NOW).dt
+                self.assertEqual(fast, slow)
+
+    async def test_out_of_range_times_are_rejected(self):
+        for argument in ('99999 years x', 'x 99999 years', '99999 years'):
+            with self.subTest(argument=argument):
+                self.assertIsNotNone(FastTimeParser.scan(argument))
+                self.assertIs(await parse(argument), commands.BadArgument)
+                with self.assertRaises(commands.BadArgument):
+                    HumanTime(argument, now=NOW)
+
+    def test_phrases_needing_context_are_left_alone(self):
+        for argument in ('3 days ago', 'tomorrow 5pm', 'next friday at 5pm', '"in 3 days" quoted', 'friday'):
+            with self.subTest(argument=argument):
+                self.assertIsNone(FastTimeParser.scan(argument))
+
+
+if __name__ == '__main__':
+    unittest.main()
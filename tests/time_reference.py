@@ -0,0 +1,71 @@
+"""Reminder time phrases and a way to parse them without the fast path.
+
+The tests check the fast path against parsedatetime with these, and
+``benchmarks.time_parsing`` times both.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime
+import types
+from unittest import mock
+
+from utilFunc.time import FastTimeParser, FriendlyTimeResult, UserFriendlyTime
+
+NOW = datetime.datetime(2026, 10, 19, 12, 0, tzinfo=datetime.timezone.utc)
+
+# Reminder strings as people actually type them
+CORPUS = [
+    # Handled by the fast path
+    'in 3 days check the oven',
+    '2 hours and 30 minutes take a break',
+    'tomorrow at 3pm dentist',
+    'tomorrow call mom',
+    'today at 17:30 standup notes',
+    'at 5pm go home',
+    'at 9am tomorrow gym',
+    '2026-12-24 christmas eve',
+    'on 2026-11-01 renew passport',
+    '2026-11-01T09:30 board meeting',
+    'in 10 minutes tea',
+    '1 hour stretch',
+    'in a week follow up',
+    'an hour laundry',
+    '5 mins pizza',
+    '3 weeks dentist follow-up',
+    'in 2 months renew the domain',
+    '1 year anniversary',
+    'water the plants in 2 days',
+    'pay rent tomorrow',
+    'submit report at 6pm',
+    'buy milk in 45 minutes',
+    'review PR 2 hours and 15 minutes',
+    'feed the cat today at 8pm',
+    # Left to parsedatetime
+    'next friday at 5pm drinks',
+    '"in 3 days" quoted',
+    'tomorrow 5pm meeting',
+    'friday finish the slides',
+    'next week plan sprint',
+    'noon lunch',
+]
+
+
+def fake_context(now: datetime.datetime = NOW) -> types.SimpleNamespace:
+    """Just enough of a Context for UserFriendlyTime.convert, without a reminder cog."""
+    return types.SimpleNamespace(
+        message=types.SimpleNamespace(created_at=now),
+        bot=types.SimpleNamespace(reminder=None),
+        author=types.SimpleNamespace(id=0),
+    )
+
+
+async def convert(argument: str) -> FriendlyTimeResult:
+    """Parses ``argument`` like the reminder commands do."""
+    return await UserFriendlyTime(default='…').convert(fake_context(), argument)  # type: ignore
+
+
+def parsedatetime_only() -> contextlib.AbstractContextManager:
+    """Makes :func:`convert` skip the fast path, as it did before there was one."""
+    return mock.patch.object(FastTimeParser, 'scan', return_value=None)
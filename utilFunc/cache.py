@@ -7,6 +7,8 @@ from typing import Any, Callable, Coroutine, MutableMapping, TypeVar, Protocol
 
 import time
 
+from . import metrics
+
 R = TypeVar('R')
 
 # Can't use ParamSpec due to https://github.com/python/typing/discussions/946
@@ -29,6 +31,17 @@ class CacheProtocol(Protocol[R]):
         ...
 
 
+def request_counter(name: str, result: str) -> metrics.Counter:
+    """Returns the counter of lookups in the cache called ``name`` that ended with ``result``."""
+    documentation = 'Cache lookups by whether they were served from the cache.'
+    return metrics.registry.counter('cache_requests_total', documentation, cache=name, result=result)
+
+
+def request_counters(name: str) -> tuple[metrics.Counter, metrics.Counter]:
+    """Returns the ``(hits, misses)`` counters of the cache called ``name``."""
+    return request_counter(name, 'hit'), request_counter(name, 'miss')
+
+
 class ExpiringCache(dict):
     def __init__(self, seconds: float):
         self.__ttl: float = seconds
@@ -81,13 +94,13 @@ def cache(
         if strategy is Strategy.lru:
             # Replace functools.lru_cache usage with ExpiringCache
             _internal_cache = ExpiringCache(seconds=maxsize)
-            _stats = lambda: (0, len(_internal_cache))  # Example stats: no current hits tracking
         elif strategy is Strategy.raw:
             _internal_cache = {}
-            _stats = lambda: (0, len(_internal_cache))
         elif strategy is Strategy.timed:
             _internal_cache = ExpiringCache(maxsize)
-            _stats = lambda: (0, len(_internal_cache))
+
+        _hits, _misses = request_counters(func.__qualname__)
+        _stats = lambda: (int(_hits.value), int(_misses.value))
 
         def _make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
             # Same key generation logic as before
@@ -109,10 +122,13 @@ def cache(
         def wrapper(*args: Any, **kwargs: Any):
             key = _make_key(args, kwargs)
             try:
-                return _internal_cache[key]
+                task = _internal_cache[key]
             except KeyError:
+                _misses.inc()
                 _internal_cache[key] = task = asyncio.create_task(func(*args, **kwargs))
-                return task
+            else:
+                _hits.inc()
+            return task
 
         def _invalidate(*args: Any, **kwargs: Any) -> bool:
             try:
@@ -134,6 +134,8 @@ class Context(commands.Context):
     prefix: str
     command: commands.Command[Any, ..., Any]
     bot: OmelettePy
+    # time.perf_counter() when the command was invoked, for the latency metrics
+    invoked_at: Optional[float] = None
 
     @property
     def db(self):
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from . import metrics
+
+if TYPE_CHECKING:
+    from discord.ext import commands
+
+# Metric names the dashboard reads, the instrumentation registers them
+COMMANDS = 'commands_total'
+COMMAND_LATENCY = 'command_latency_seconds'
+POOL_SIZE = 'db_pool_size'
+POOL_IDLE = 'db_pool_idle'
+POOL_WAITERS = 'db_pool_waiters'
+LOOP_LAG = 'event_loop_lag_seconds'
+REMINDER_QUEUE_DEPTH = 'reminder_queue_depth'
+REMINDER_DISPATCH_LAG = 'reminder_dispatch_lag_seconds'
+CACHE_REQUESTS = 'cache_requests_total'
+
+# Values of the "result" label of CACHE_REQUESTS that count as a cache hit
+CACHE_HIT_RESULTS = frozenset({'hit', 'revalidated'})
+
+
+def _finite(value: float) -> Optional[float]:
+    # NaN and infinities are not valid JSON and there is nothing to plot anyway
+    return value if math.isfinite(value) else None
+
+
+def _gauge(name: str) -> Optional[float]:
+    metric = metrics.registry.get(name)
+    return _finite(metric.value) if isinstance(metric, metrics.Gauge) else None
+
+
+def reminders() -> dict[str, Optional[float]]:
+    """Returns how many reminders are scheduled and their p99 dispatch lag in seconds."""
+    lag = metrics.registry.get(REMINDER_DISPATCH_LAG)
+    return {
+        'queue_depth': _gauge(REMINDER_QUEUE_DEPTH),
+        'lag_p99': _finite(lag.percentile(99)) if isinstance(lag, metrics.Histogram) else None,
+    }
+
+
+def sample(bot: commands.Bot, *, top_commands: int = 10) -> dict[str, Any]:
+    """Takes a snapshot of the metrics the GUI dashboard plots.
+
+    Counters and histogram sums are cumulative, the dashboard turns them into
+    rates from the difference between two samples. Everything in here is plain
+    JSON, so it can be sent over IPC as is. Only reads are done, so this can be
+    called from outside the bot's thread.
+    """
+    commands_total = 0.0
+    for metric in metrics.registry.find(COMMANDS):
+        commands_total += metric.value
+
+    latency_sum = 0.0
+    latency_count = 0
+    per_command = []
+    for metric in metrics.registry.find(COMMAND_LATENCY):
+        assert isinstance(metric, metrics.Histogram)
+        latency_sum += metric.sum
+        latency_count += metric.count
+        if metric.count:
+            per_command.append({
+                'command': metric.labels.get('command', '?'),
+                'count': metric.count,
+                'p50': _finite(metric.percentile(50)),
+                'p95': _finite(metric.percentile(95)),
+                'p99': _finite(metric.percentile(99)),
+            })
+    per_command.sort(key=lambda entry: entry['count'], reverse=True)
+
+    caches: dict[str, dict[str, float]] = {}
+    for metric in metrics.registry.find(CACHE_REQUESTS):
+        entry = caches.setdefault(metric.labels.get('cache', '?'), {'hits': 0.0, 'total': 0.0})
+        entry['total'] += metric.value
+        if metric.labels.get('result') in CACHE_HIT_RESULTS:
+            entry['hits'] += metric.value
+
+    lag = metrics.registry.get(LOOP_LAG)
+    return {
+        'time': time.time(),
+        'commands': commands_total,
+        'command_latency': {'sum': latency_sum, 'count': latency_count},
+        'per_command': per_command[:top_commands],
+        'pool': {
+            'size': _gauge(POOL_SIZE),
+            'idle': _gauge(POOL_IDLE),
+            'waiters': _gauge(POOL_WAITERS),
+        },
+        'caches': caches,
+        'loop_lag': {
+            'sum': lag.sum if isinstance(lag, metrics.Histogram) else 0.0,
+            'count': lag.count if isinstance(lag, metrics.Histogram) else 0,
+        },
+        'shards': {str(shard_id): _finite(latency) for shard_id, latency in list(bot.latencies)},
+        'reminder_queue_depth': _gauge(REMINDER_QUEUE_DEPTH),
+    }
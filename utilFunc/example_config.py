@@ -23,6 +23,9 @@ GITHUB_TOKEN = "github token"
 
 # Open Weather API token
 OW_API = "open weather api token"
+# How many API calls per minute the weather cache may use to keep the most popular locations warm
+WEATHER_CALLS_PER_MINUTE = 30
+WEATHER_PREFETCH_TOP = 10
 
 # Database connection information
 DB_NAME = " "
@@ -30,6 +33,11 @@ DB_USER = " "
 DB_PASSWORD = " "
 DB_HOST = " "
 DB_PORT = " "
+# Write ommiepy.log as one JSON object per line instead of plain text
+LOG_JSON = False
+# Serve metrics for Prometheus on http://METRICS_HOST:METRICS_PORT/metrics, None to turn it off
+METRICS_PORT = None
+METRICS_HOST = "127.0.0.1"
 # Test server and channel IDs
 TestGuild_ID = 1234567890123456789
 TestChannel_ID = 1234567890123456789
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import datetime
-from typing import Any, Iterable, Optional, Sequence
+from typing import Any, Iterable, Iterator, Optional, Sequence
 
 
 class plural:
@@ -41,26 +41,69 @@ def human_join(seq: Sequence[str], delim: str = ', ', final: str = 'or') -> str:
 
 
 class TabularData:
+    """A table stored column by column.
+
+    Cells are converted to strings as they are added and widths are only
+    computed when rendering, in a single pass per column.
+    """
+
     def __init__(self):
-        self._widths: list[int] = []
         self._columns: list[str] = []
-        self._rows: list[list[str]] = []
+        self._data: list[list[str]] = []
+
+    def __len__(self) -> int:
+        return len(self._data[0]) if self._data else 0
 
     def set_columns(self, columns: list[str]):
         self._columns = columns
-        self._widths = [len(c) + 2 for c in columns]
+        self._data = [[] for _ in columns]
 
     def add_row(self, row: Iterable[Any]) -> None:
-        rows = [str(r) for r in row]
-        self._rows.append(rows)
-        for index, element in enumerate(rows):
-            width = len(element) + 2
-            if width > self._widths[index]:
-                self._widths[index] = width
+        cells = [str(r) for r in row]
+        if len(cells) != len(self._columns):
+            raise ValueError(f'expected {len(self._columns)} cells, got {len(cells)}')
+
+        for column, cell in zip(self._data, cells):
+            column.append(cell)
 
     def add_rows(self, rows: Iterable[Iterable[Any]]) -> None:
+        rows = [tuple(row) for row in rows]
+        if not rows:
+            return
+
         for row in rows:
-            self.add_row(row)
+            if len(row) != len(self._columns):
+                raise ValueError(f'expected {len(self._columns)} cells, got {len(row)}')
+
+        for column, values in zip(self._data, zip(*rows)):
+            column.extend(map(str, values))
+
+    @property
+    def widths(self) -> list[int]:
+        return [
+            max(len(name), max(map(len, column), default=0)) + 2
+            for name, column in zip(self._columns, self._data)
+        ]
+
+    def render_iter(self) -> Iterator[str]:
+        """Yields the lines of :meth:`render` one at a time.
+
+        Every column is formatted up front, so this is cheap per line and
+        suitable for streaming very large tables to a file.
+        """
+        widths = self.widths
+        sep = '+'.join('-' * w for w in widths)
+        sep = f'+{sep}+'
+
+        header = '|'.join(format(name, f'^{w}') for name, w in zip(self._columns, widths))
+        yield sep
+        yield f'|{header}|'
+        yield sep
+
+        formatted = [[format(cell, f'^{w}') for cell in column] for column, w in zip(self._data, widths)]
+        for cells in zip(*formatted):
+            yield '|' + '|'.join(cells) + '|'
+        yield sep
 
     def render(self) -> str:
         """Renders a table in rST format.
@@ -74,24 +117,7 @@ class TabularData:
         |  Bob  | 19  |
         +-------+-----+
         """
-
-        sep = '+'.join('-' * w for w in self._widths)
-        sep = f'+{sep}+'
-
-        to_draw = [sep]
-
-        def get_entry(d):
-            elem = '|'.join(f'{e:^{self._widths[i]}}' for i, e in enumerate(d))
-            return f'|{elem}|'
-
-        to_draw.append(get_entry(self._columns))
-        to_draw.append(sep)
-
-        for row in self._rows:
-            to_draw.append(get_entry(row))
-
-        to_draw.append(sep)
-        return '\n'.join(to_draw)
+        return '\n'.join(self.render_iter())
 
 
 def format_dt(dt: datetime.datetime, style: Optional[str] = None) -> str:
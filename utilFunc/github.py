@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import asyncio
+import json as _json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple, Optional
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from .cache import request_counter
+
+log = logging.getLogger(__name__)
+
+GITHUB_API = 'https://api.github.com'
+
+# A revalidated response still costs a request, but not against the rate limit
+CACHE_HITS = request_counter('github', 'hit')
+CACHE_REVALIDATED = request_counter('github', 'revalidated')
+CACHE_MISSES = request_counter('github', 'miss')
+
+
+class GitHubError(Exception):
+    def __init__(self, status: int, message: str):
+        self.status: int = status
+        self.message: str = message
+        super().__init__(f'{status}: {message}')
+
+
+class RateLimited(GitHubError):
+    def __init__(self, reset_at: float):
+        self.reset_at: float = reset_at
+        super().__init__(403, f'rate limited for another {reset_at - time.time():.0f} seconds')
+
+
+class GitHubResponse(NamedTuple):
+    status: int
+    data: Any
+    headers: CIMultiDictProxy[str]
+    cached: bool = False
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    data: Any
+    headers: list[tuple[str, str]]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    def to_response(self) -> GitHubResponse:
+        return GitHubResponse(self.status, self.data, CIMultiDictProxy(CIMultiDict(self.headers)), cached=True)
+
+
+# Only these are worth keeping around, the rest describe the original transfer
+_CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link')
+
+
+class ResponseCache:
+    """A conditional request cache for GET responses.
+
+    Entries younger than ``ttl`` are served without touching the network. Older
+    ones are revalidated with ``If-None-Match``/``If-Modified-Since``, and since a
+    ``304 Not Modified`` does not count against GitHub's rate limit, repeated
+    lookups of the same resource are essentially free.
+
+    The memory tier is an LRU bounded to ``maxsize`` entries. If ``path`` is given,
+    entries are also written to a sqlite database so they survive restarts.
+    """
+
+    def __init__(self, *, ttl: float = 60.0, maxsize: int = 1024, path: Optional[str] = None):
+        self.ttl: float = ttl
+        self.maxsize: int = maxsize
+        self.path: Optional[str] = path
+        self._memory: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        # sqlite connections are tied to a thread, so every disk operation goes through this one
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if path is not None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='github-cache')
+
+    @staticmethod
+    def key(url: str, params: Optional[dict[str, Any]] = None) -> str:
+        if not params:
+            return url
+        query = '&'.join(f'{k}={v}' for k, v in sorted(params.items()))
+        return f'{url}?{query}'
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.stored_at < self.ttl
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            assert self.path is not None
+            self._db = sqlite3.connect(self.path)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                       key TEXT PRIMARY KEY,
+                       status INTEGER NOT NULL,
+                       data TEXT NOT NULL,
+                       headers TEXT NOT NULL,
+                       etag TEXT,
+                       last_modified TEXT,
+                       stored_at REAL NOT NULL
+                   )"""
+            )
+        return self._db
+
+    def _disk_get(self, key: str) -> Optional[CachedResponse]:
+        query = 'SELECT status, data, headers, etag, last_modified, stored_at FROM responses WHERE key = ?'
+        row = self._connect().execute(query, (key,)).fetchone()
+        if row is None:
+            return None
+        status, data, headers, etag, last_modified, stored_at = row
+        return CachedResponse(
+            status, _json.loads(data), [tuple(h) for h in _json.loads(headers)], etag, last_modified, stored_at
+        )
+
+    def _disk_put(self, key: str, entry: CachedResponse) -> None:
+        db = self._connect()
+        with db:
+            db.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (
+                    key,
+                    entry.status,
+                    _json.dumps(entry.data),
+                    _json.dumps(entry.headers),
+                    entry.etag,
+                    entry.last_modified,
+                    entry.stored_at,
+                ),
+            )
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            entry = self._memory[key]
+        except KeyError:
+            pass
+        else:
+            self._memory.move_to_end(key)
+            return entry
+
+        if self._executor is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        try:
+            entry = await loop.run_in_executor(self._executor, self._disk_get, key)
+        except sqlite3.Error as e:
+            log.warning('Could not read GitHub response cache: %s', e)
+            return None
+
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    async def put(self, key: str, entry: CachedResponse) -> None:
+        self._remember(key, entry)
+        if self._executor is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, self._disk_put, key, entry)
+        except sqlite3.Error as e:
+            log.warning('Could not write GitHub response cache: %s', e)
+
+    async def store(self, key: str, response: GitHubResponse) -> None:
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag is None and last_modified is None:
+            return
+
+        headers = [(name, response.headers[name]) for name in _CACHED_HEADERS if name in response.headers]
+        await self.put(key, CachedResponse(response.status, response.data, headers, etag, last_modified, time.time()))
+
+    async def touch(self, key: str, entry: CachedResponse) -> CachedResponse:
+        """Marks a revalidated entry as fresh again."""
+        entry = entry._replace(stored_at=time.time())
+        await self.put(key, entry)
+        return entry
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+    def close(self) -> None:
+        if self._executor is None:
+            return
+
+        def close_db() -> None:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+        self._executor.submit(close_db)
+        self._executor.shutdown(wait=False)
+        self._executor = None
+
+
+class GitHubClient:
+    """A small asynchronous GitHub REST client.
+
+    Requests go through the bot's shared :class:`aiohttp.ClientSession`, so connections
+    are pooled and kept alive across commands. At most ``max_concurrency`` requests are
+    in flight at once, and the ``X-RateLimit-*`` headers are tracked so that requests
+    wait for the window to reset rather than getting rejected.
+
+    Parameters
+    -----------
+    session: aiohttp.ClientSession
+        The session to send requests through.
+    token: Optional[str]
+        The personal access token, if any.
+    base_url: str
+        The API root. Only really useful to point the client at a stub server.
+    max_concurrency: int
+        How many requests can be in flight at once.
+    max_rate_limit_wait: float
+        How long a request is allowed to wait for the rate limit to reset, in seconds.
+        Past this :exc:`RateLimited` is raised instead.
+    cache: Optional[ResponseCache]
+        Where to keep GET responses for conditional requests, if anywhere.
+    """
+
+    def __init__(
+            self,
+            session: aiohttp.ClientSession,
+            *,
+            token: Optional[str] = None,
+            base_url: str = GITHUB_API,
+            max_concurrency: int = 8,
+            max_rate_limit_wait: float = 30.0,
+            cache: Optional[ResponseCache] = None,
+    ):
+        self.session: aiohttp.ClientSession = session
+        self.cache: Optional[ResponseCache] = cache
+        self.token: Optional[str] = token
+        self.base_url: str = base_url.rstrip('/')
+        self.max_rate_limit_wait: float = max_rate_limit_wait
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.rate_limit: Optional[int] = None
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_reset: float = 0.0
+
+    def _headers(self, extra: Optional[dict[str, str]] = None) -> dict[str, str]:
+        headers = {
+            'Accept': 'application/vnd.github+json',
+            'X-GitHub-Api-Version': '2022-11-28',
+        }
+        if self.token:
+            headers['Authorization'] = f'token {self.token}'
+        if extra:
+            headers.update(extra)
+        return headers
+
+    def _update_rate_limit(self, headers: CIMultiDictProxy[str]) -> None:
+        try:
+            self.rate_limit = int(headers['X-RateLimit-Limit'])
+            self.rate_limit_remaining = int(headers['X-RateLimit-Remaining'])
+            self.rate_limit_reset = float(headers['X-RateLimit-Reset'])
+        except (KeyError, ValueError):
+            pass
+
+    async def _wait_for_rate_limit(self) -> None:
+        if self.rate_limit_remaining is None or self.rate_limit_remaining > 0:
+            return
+
+        delay = self.rate_limit_reset - time.time()
+        if delay <= 0:
+            return
+        if delay > self.max_rate_limit_wait:
+            raise RateLimited(self.rate_limit_reset)
+
+        log.warning('GitHub rate limit exhausted, waiting %.1f seconds', delay)
+        await asyncio.sleep(delay)
+
+    async def request(
+            self,
+            method: str,
+            path: str,
+            *,
+            params: Optional[dict[str, Any]] = None,
+            json: Any = None,
+            headers: Optional[dict[str, str]] = None,
+    ) -> GitHubResponse:
+        url = path if path.startswith('http') else f'{self.base_url}{path}'
+        async with self._semaphore:
+            for tries in range(2):
+                await self._wait_for_rate_limit()
+                async with self.session.request(
+                        method, url, params=params, json=json, headers=self._headers(headers)
+                ) as resp:
+                    self._update_rate_limit(resp.headers)
+
+                    # Secondary rate limits ask us to back off for a bit
+                    retry_after = resp.headers.get('Retry-After')
+                    if resp.status in (403, 429) and retry_after is not None and tries == 0:
+                        delay = float(retry_after)
+                        if delay <= self.max_rate_limit_wait:
+                            await asyncio.sleep(delay)
+                            continue
+
+                    if resp.status in (403, 429) and self.rate_limit_remaining == 0 and tries == 0:
+                        continue
+
+                    if resp.content_type == 'application/json':
+                        data = await resp.json()
+                    else:
+                        data = await resp.text()
+                    return GitHubResponse(resp.status, data, resp.headers)
+
+        # Unreachable, the second attempt always returns
+        raise RateLimited(self.rate_limit_reset)
+
+    async def get(
+            self,
+            path: str,
+            *,
+            params: Optional[dict[str, Any]] = None,
+            headers: Optional[dict[str, str]] = None,
+            revalidate: bool = False,
+    ) -> GitHubResponse:
+        """Sends a GET request, going through the response cache if there is one.
+
+        If ``revalidate`` is ``True`` a cached entry is always revalidated upstream,
+        even if it is still fresh.
+        """
+        if self.cache is None:
+            return await self.request('GET', path, params=params, headers=headers)
+
+        url = path if path.startswith('http') else f'{self.base_url}{path}'
+        key = self.cache.key(url, params)
+        entry = await self.cache.get(key)
+        if entry is not None and not revalidate and self.cache.is_fresh(entry):
+            CACHE_HITS.inc()
+            return entry.to_response()
+
+        headers = dict(headers or {})
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        response = await self.request('GET', url, params=params, headers=headers)
+        if response.status == 304 and entry is not None:
+            CACHE_REVALIDATED.inc()
+            entry = await self.cache.touch(key, entry)
+            return entry.to_response()
+
+        CACHE_MISSES.inc()
+        if response.status == 200:
+            await self.cache.store(key, response)
+        return response
+
+    async def post(self, path: str, **kwargs: Any) -> GitHubResponse:
+        return await self.request('POST', path, **kwargs)
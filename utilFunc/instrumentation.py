@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+import aiohttp
+
+from . import dashboard, metrics
+
+if TYPE_CHECKING:
+    from aiohttp import web
+    import asyncpg
+
+    from .context import Context
+
+log = logging.getLogger(__name__)
+
+POOL_ACQUIRE = metrics.registry.histogram(
+    'db_pool_acquire_seconds', 'Time spent waiting for a free connection from the pool.'
+)
+
+
+def command_started(ctx: Context) -> None:
+    ctx.invoked_at = time.perf_counter()
+
+
+def command_finished(ctx: Context, status: str) -> None:
+    """Counts a finished command and records how long it took, ``status`` is ``ok`` or ``error``."""
+    if ctx.command is None:
+        # Nothing was invoked, e.g. the command wasn't found
+        return
+
+    name = ctx.command.qualified_name
+    metrics.registry.counter(dashboard.COMMANDS, 'Commands invoked, by outcome.', command=name, status=status).inc()
+    if ctx.invoked_at is not None:
+        metrics.registry.histogram(
+            dashboard.COMMAND_LATENCY, 'Time from invoking a command to it finishing.', command=name
+        ).observe(time.perf_counter() - ctx.invoked_at)
+
+
+def instrument_pool(pool: asyncpg.Pool) -> None:
+    metrics.registry.gauge(dashboard.POOL_SIZE, 'Connections currently open in the pool.').set_function(pool.get_size)
+    metrics.registry.gauge(dashboard.POOL_IDLE, 'Open connections not in use.').set_function(pool.get_idle_size)
+    # asyncpg has no public API for these, tasks waiting for a connection wait on the pool's queue
+    queue = pool._queue  # type: ignore
+    metrics.registry.gauge(dashboard.POOL_WAITERS, 'Tasks waiting for a connection.').set_function(
+        lambda: len(getattr(queue, '_getters', ()))
+    )
+
+    get = queue.get
+
+    async def timed_get() -> Any:
+        start = time.perf_counter()
+        try:
+            return await get()
+        finally:
+            POOL_ACQUIRE.observe(time.perf_counter() - start)
+
+    queue.get = timed_get
+
+
+def http_trace_config() -> aiohttp.TraceConfig:
+    """Times the requests of a client session, per host.
+
+    The duration is measured until the response headers arrived, reading the
+    body is up to the caller.
+    """
+
+    async def on_request_start(session: aiohttp.ClientSession, context: Any, params: aiohttp.TraceRequestStartParams):
+        context.started = time.perf_counter()
+
+    def record(context: Any, host: Optional[str], status: str) -> None:
+        host = host or 'unknown'
+        metrics.registry.counter('http_requests_total', 'HTTP requests sent by the bot.', host=host, status=status).inc()
+        started = getattr(context, 'started', None)
+        if started is not None:
+            metrics.registry.histogram(
+                'http_request_duration_seconds', 'Time until the response headers of an HTTP request arrived.', host=host
+            ).observe(time.perf_counter() - started)
+
+    async def on_request_end(session: aiohttp.ClientSession, context: Any, params: aiohttp.TraceRequestEndParams):
+        record(context, params.url.host, str(params.response.status))
+
+    async def on_request_exception(
+        session: aiohttp.ClientSession, context: Any, params: aiohttp.TraceRequestExceptionParams
+    ):
+        record(context, params.url.host, 'error')
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(on_request_start)
+    config.on_request_end.append(on_request_end)
+    config.on_request_exception.append(on_request_exception)
+    return config
+
+
+class MetricsServer:
+    """Serves the metrics registry on ``/metrics`` in the Prometheus text format.
+
+    This only binds to localhost by default, there is no authentication.
+    """
+
+    def __init__(self, port: int, *, host: str = '127.0.0.1'):
+        self.host: str = host
+        self.port: int = port
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self) -> None:
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get('/metrics', self.handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        try:
+            await web.TCPSite(self._runner, self.host, self.port).start()
+        except OSError:
+            await self.close()
+            raise
+        log.info('Serving metrics on http://%s:%s/metrics', self.host, self.port)
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        from aiohttp import web
+
+        body = metrics.render_prometheus().encode('utf-8')
+        return web.Response(body=body, headers={'Content-Type': metrics.PROMETHEUS_CONTENT_TYPE})
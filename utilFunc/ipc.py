@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import os
+import secrets
+import sys
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional, Union
+
+from . import dashboard, logs
+
+if TYPE_CHECKING:
+    from bot import OmelettePy
+
+log = logging.getLogger(__name__)
+
+# A unix socket next to the bot where there are unix sockets, a loopback port otherwise
+DEFAULT_ADDRESS: Union[str, tuple[str, int]] = (
+    ('127.0.0.1', 8765) if sys.platform == 'win32' else os.path.abspath('omelettepy.sock')
+)
+# Every connection has to send the token in this file first, so only the bot's user can connect
+DEFAULT_TOKEN_PATH: str = os.path.abspath('omelettepy.token')
+
+# Lines are JSON documents, log records with long tracebacks can get large
+LINE_LIMIT = 1024 * 1024
+
+_formatter = logging.Formatter()
+
+
+class IPCError(Exception):
+    pass
+
+
+def _write_token(path: str) -> str:
+    token = secrets.token_hex(32)
+    if os.path.exists(path):
+        os.unlink(path)
+    # Created readable by the owner only, O_EXCL so an existing file or symlink is never reused
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+        fp.write(token)
+    return token
+
+
+def _encode(payload: dict[str, Any]) -> bytes:
+    return json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8') + b'\n'
+
+
+class _Client:
+    __slots__ = ('writer', 'authenticated', 'logs', 'dropped', 'task', 'handler')
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer: asyncio.StreamWriter = writer
+        self.authenticated: bool = False
+        self.logs: Optional[asyncio.Queue[dict[str, Any]]] = None
+        self.dropped: int = 0
+        self.task: Optional[asyncio.Task[None]] = None
+        self.handler: Optional[asyncio.Task[Any]] = asyncio.current_task()
+
+
+class IPCServer:
+    """Lets local processes (i.e. the GUI) inspect and control a running bot.
+
+    The protocol is newline delimited JSON. Requests look like
+    ``{"id": 1, "op": "status"}`` and get ``{"id": 1, "result": ...}`` or
+    ``{"id": 1, "error": "..."}`` back. Clients that send ``subscribe`` also get
+    ``{"event": "log", "record": {...}}`` for every log record. Slow clients lose
+    log records instead of holding the bot up.
+
+    Only local connections are possible: a unix socket, or a loopback port on Windows.
+    A random token is written to ``token_path`` on start, readable by the bot's user
+    only, and a connection's first request has to be ``auth`` with that token. Any
+    other request before that closes the connection.
+    """
+
+    LOG_QUEUE_SIZE = 1000
+
+    def __init__(
+            self,
+            bot: OmelettePy,
+            *,
+            address: Union[str, tuple[str, int]] = DEFAULT_ADDRESS,
+            token_path: str = DEFAULT_TOKEN_PATH,
+            on_shutdown: Optional[Callable[[], None]] = None,
+    ):
+        self.bot: OmelettePy = bot
+        self.address: Union[str, tuple[str, int]] = address
+        self.token_path: str = token_path
+        self._token: Optional[str] = None
+        self.on_shutdown: Optional[Callable[[], None]] = on_shutdown
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: set[_Client] = set()
+        self._handler: Optional[IPCLogHandler] = None
+        self._ops: dict[str, Callable[..., Awaitable[Any]]] = {
+            'auth': self.op_auth,
+            'status': self.op_status,
+            'sample': self.op_sample,
+            'load': self.op_load,
+            'unload': self.op_unload,
+            'reload': self.op_reload,
+            'subscribe': self.op_subscribe,
+            'shutdown': self.op_shutdown,
+        }
+
+    async def start(self) -> None:
+        self._token = _write_token(self.token_path)
+        if isinstance(self.address, str):
+            if os.path.exists(self.address):
+                # Left behind by a process that didn't shut down cleanly
+                os.unlink(self.address)
+            # The socket is created owner only from the start, not chmodded once it is already listening
+            umask = os.umask(0o177)
+            try:
+                self._server = await asyncio.start_unix_server(self._serve, path=self.address, limit=LINE_LIMIT)
+            finally:
+                os.umask(umask)
+        else:
+            host, port = self.address
+            self._server = await asyncio.start_server(self._serve, host, port, limit=LINE_LIMIT)
+
+        self._handler = IPCLogHandler(self, asyncio.get_running_loop())
+        logs.add_handler(self._handler)
+        log.info('IPC server listening on %s', self.address)
+
+    async def close(self) -> None:
+        if self._handler is not None:
+            logs.remove_handler(self._handler)
+            self._handler = None
+
+        if self._server is not None:
+            self._server.close()
+            handlers = [client.handler for client in self._clients if client.handler is not None]
+            for client in list(self._clients):
+                client.writer.close()
+            # Closing the writers ends the connection handlers, wait until they're done
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+            if isinstance(self.address, str) and os.path.exists(self.address):
+                os.unlink(self.address)
+
+        if self._token is not None:
+            self._token = None
+            if os.path.exists(self.token_path):
+                os.unlink(self.token_path)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = _Client(writer)
+        self._clients.add(client)
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    op = self._ops[request['op']]
+                except (ValueError, KeyError, TypeError):
+                    writer.write(_encode({'error': 'malformed request'}))
+                    continue
+
+                if not client.authenticated and op != self.op_auth:
+                    writer.write(_encode({'id': request.get('id'), 'error': 'IPCError: not authenticated'}))
+                    await writer.drain()
+                    break
+
+                response: dict[str, Any] = {'id': request.get('id')}
+                try:
+                    response['result'] = await op(client, **request.get('args', {}))
+                except Exception as e:
+                    response['error'] = f'{e.__class__.__name__}: {e}'
+                writer.write(_encode(response))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.discard(client)
+            if client.task is not None:
+                client.task.cancel()
+            writer.close()
+
+    def publish_log(self, record: dict[str, Any]) -> None:
+        for client in self._clients:
+            if client.logs is None:
+                continue
+            try:
+                client.logs.put_nowait(record)
+            except asyncio.QueueFull:
+                client.dropped += 1
+
+    async def _forward_logs(self, client: _Client) -> None:
+        assert client.logs is not None
+        while True:
+            record = await client.logs.get()
+            if client.dropped:
+                # The record is shared between clients
+                record = {**record, 'dropped': client.dropped}
+                client.dropped = 0
+            client.writer.write(_encode({'event': 'log', 'record': record}))
+            await client.writer.drain()
+
+    async def op_auth(self, client: _Client, token: str) -> None:
+        if self._token is None or not secrets.compare_digest(str(token), self._token):
+            raise IPCError('invalid token')
+        client.authenticated = True
+
+    async def op_status(self, client: _Client) -> dict[str, Any]:
+        bot = self.bot
+        latency = bot.latency
+        return {
+            'ready': bot.is_ready(),
+            'user': str(bot.user) if bot.user else None,
+            'latency': latency if math.isfinite(latency) else None,
+            'uptime': bot.uptime.isoformat() if hasattr(bot, 'uptime') else None,
+            'guilds': len(bot.guilds),
+            'extensions': sorted(bot.extensions),
+            'reminder': bot.reminder is not None,
+            'reminders': dashboard.reminders() if bot.reminder is not None else None,
+        }
+
+    async def op_sample(self, client: _Client) -> dict[str, Any]:
+        return dashboard.sample(self.bot)
+
+    async def op_load(self, client: _Client, name: str) -> None:
+        await self.bot.load_extension(name)
+
+    async def op_unload(self, client: _Client, name: str) -> None:
+        await self.bot.unload_extension(name)
+
+    async def op_reload(self, client: _Client, name: str) -> None:
+        await self.bot.reload_extension(name)
+
+    async def op_subscribe(self, client: _Client) -> None:
+        if client.logs is None:
+            client.logs = asyncio.Queue(self.LOG_QUEUE_SIZE)
+            client.task = asyncio.create_task(self._forward_logs(client))
+
+    async def op_shutdown(self, client: _Client) -> None:
+        if self.on_shutdown is None:
+            raise IPCError('this bot cannot be shut down remotely')
+        self.on_shutdown()
+
+
+class IPCLogHandler(logging.Handler):
+    """Hands log records to the :class:`IPCServer` from whichever thread logs them."""
+
+    def __init__(self, server: IPCServer, loop: asyncio.AbstractEventLoop):
+        super().__init__()
+        self.server: IPCServer = server
+        self.loop: asyncio.AbstractEventLoop = loop
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not self.server._clients:
+            return
+
+        try:
+            exc_text = record.exc_text
+            if record.exc_info and not exc_text:
+                exc_text = _formatter.formatException(record.exc_info)
+
+            data = {
+                'name': record.name,
+                'levelno': record.levelno,
+                'levelname': record.levelname,
+                'msg': record.getMessage(),
+                'created': record.created,
+                'msecs': record.msecs,
+                'exc_text': exc_text,
+            }
+            self.loop.call_soon_threadsafe(self.server.publish_log, data)
+        except RuntimeError:
+            # The loop is closed
+            pass
+        except Exception:
+            self.handleError(record)
+
+
+class IPCClient:
+    """The other end of an :class:`IPCServer`."""
+
+    def __init__(
+            self,
+            address: Union[str, tuple[str, int]] = DEFAULT_ADDRESS,
+            *,
+            token_path: str = DEFAULT_TOKEN_PATH,
+    ):
+        self.address: Union[str, tuple[str, int]] = address
+        self.token_path: str = token_path
+        self.on_event: Optional[Callable[[dict[str, Any]], None]] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending: dict[int, asyncio.Future[Any]] = {}
+        self._next_id: int = 0
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def connect(self) -> None:
+        try:
+            with open(self.token_path, 'r', encoding='utf-8') as fp:
+                token = fp.read().strip()
+        except OSError as e:
+            raise IPCError(f'could not read the IPC token, is the bot running? ({e})') from None
+
+        if isinstance(self.address, str):
+            self._reader, self._writer = await asyncio.open_unix_connection(self.address, limit=LINE_LIMIT)
+        else:
+            host, port = self.address
+            self._reader, self._writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        self._task = asyncio.create_task(self._read())
+        try:
+            await self.request('auth', token=token)
+        except IPCError:
+            await self.close()
+            raise
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def _read(self) -> None:
+        assert self._reader is not None
+        try:
+            while line := await self._reader.readline():
+                message = json.loads(line)
+                if 'event' in message:
+                    if self.on_event is not None:
+                        self.on_event(message)
+                    continue
+
+                future = self._pending.pop(message.get('id'), None)
+                if future is None or future.done():
+                    continue
+                if 'error' in message:
+                    future.set_exception(IPCError(message['error']))
+                else:
+                    future.set_result(message.get('result'))
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(IPCError('connection to the bot was lost'))
+            self._pending.clear()
+
+    def send(self, op: str, **args: Any) -> None:
+        """Sends a request without waiting for the reply."""
+        if self._writer is None:
+            raise IPCError('not connected')
+        self._next_id += 1
+        self._writer.write(_encode({'id': self._next_id, 'op': op, 'args': args}))
+
+    async def request(self, op: str, **args: Any) -> Any:
+        if not self.connected:
+            raise IPCError('not connected')
+
+        self.send(op, **args)
+        future = self._pending[self._next_id] = asyncio.get_running_loop().create_future()
+        assert self._writer is not None
+        await self._writer.drain()
+        return await future
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import atexit
+import copy
+import datetime
+import json
+import logging
+import logging.handlers
+import queue
+from typing import Any, Optional
+
+from . import metrics
+
+RECORDS_DROPPED = metrics.registry.counter(
+    'log_records_dropped_total', 'Log records dropped because the logging queue was full.'
+)
+
+# Attributes every LogRecord has, anything else was passed through ``extra``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as one JSON object per line.
+
+    Besides the standard fields, anything passed through ``extra`` is included.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: dict[str, Any] = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data['exc_info'] = record.exc_text
+
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                data[key] = value
+        return json.dumps(data, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """A :class:`~logging.handlers.QueueHandler` that never blocks.
+
+    When the queue is full, records are dropped and counted. Once there is room
+    again, a warning with the number of dropped records is queued.
+
+    Unlike the default, records keep their ``exc_info``: the queue never leaves the
+    process, so tracebacks are formatted by the handlers on the listener thread
+    instead of by the thread that logged.
+    """
+
+    def __init__(self, queue: queue.Queue[logging.LogRecord]):
+        super().__init__(queue)
+        self.dropped: int = 0
+        self._unreported: int = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The arguments might change before the listener gets to the record, the message can't wait
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # Handler.handle holds the handler's lock while this runs
+        if self._unreported:
+            notice = logging.makeLogRecord({
+                'name': __name__,
+                'levelno': logging.WARNING,
+                'levelname': 'WARNING',
+                'msg': f'Dropped {self._unreported} log records, the logging queue was full',
+            })
+            try:
+                self.queue.put_nowait(notice)
+            except queue.Full:
+                pass
+            else:
+                self._unreported = 0
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+            RECORDS_DROPPED.inc()
+
+
+class LogPipeline:
+    """Moves log output off the threads that log.
+
+    The root logger only gets a :class:`DroppingQueueHandler`. A listener thread
+    takes records off the bounded queue and hands them to the actual handlers
+    (console, file, GUI, ...), so slow handlers never hold up the event loop.
+    """
+
+    def __init__(self, handlers: list[logging.Handler], *, maxsize: int = 10000):
+        self.handlers: tuple[logging.Handler, ...] = tuple(handlers)
+        # Handlers added later belong to whoever added them, they are not closed with the pipeline
+        self.extra: list[logging.Handler] = []
+        self.queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.listener = logging.handlers.QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self._started: bool = False
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped
+
+    @property
+    def backlog(self) -> int:
+        return self.queue.qsize()
+
+    def start(self) -> None:
+        if not self._started:
+            self.listener.start()
+            self._started = True
+
+    def stop(self) -> None:
+        """Writes out whatever is still queued, stops the listener thread and closes the handlers."""
+        if self._started:
+            self.listener.stop()
+            self._started = False
+        for handler in self.handlers:
+            handler.close()
+
+    def add_handler(self, handler: logging.Handler) -> None:
+        # The listener thread iterates over the tuple, replacing it is safe
+        self.listener.handlers = (*self.listener.handlers, handler)
+        self.extra.append(handler)
+
+    def remove_handler(self, handler: logging.Handler) -> None:
+        self.listener.handlers = tuple(h for h in self.listener.handlers if h is not handler)
+        self.extra = [h for h in self.extra if h is not handler]
+
+
+pipeline: Optional[LogPipeline] = None
+
+
+def install(handlers: list[logging.Handler], *, maxsize: int = 10000) -> LogPipeline:
+    """Puts ``handlers`` behind a logging queue on the root logger, replacing any previous pipeline.
+
+    Handlers added to the previous pipeline through :func:`add_handler` are kept.
+    """
+    global pipeline
+
+    root = logging.getLogger()
+    extra: list[logging.Handler] = []
+    if pipeline is not None:
+        root.removeHandler(pipeline.handler)
+        extra = pipeline.extra
+        pipeline.stop()
+
+    pipeline = LogPipeline(handlers, maxsize=maxsize)
+    for handler in extra:
+        pipeline.add_handler(handler)
+    pipeline.start()
+    root.addHandler(pipeline.handler)
+    return pipeline
+
+
+def shutdown() -> None:
+    """Flushes and stops the pipeline. Also runs at exit."""
+    global pipeline
+
+    if pipeline is not None:
+        logging.getLogger().removeHandler(pipeline.handler)
+        pipeline.stop()
+        pipeline = None
+
+
+atexit.register(shutdown)
+
+
+def add_handler(handler: logging.Handler) -> None:
+    """Adds a handler behind the logging queue if there is one, to the root logger otherwise."""
+    if pipeline is not None:
+        pipeline.add_handler(handler)
+    else:
+        logging.getLogger().addHandler(handler)
+
+
+def remove_handler(handler: logging.Handler) -> None:
+    if pipeline is not None:
+        pipeline.remove_handler(handler)
+    logging.getLogger().removeHandler(handler)
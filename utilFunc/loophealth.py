@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import defaultdict, deque
+from typing import NamedTuple, Optional
+
+from . import metrics
+
+log = logging.getLogger(__name__)
+
+LOOP_LAG = metrics.registry.histogram(
+    'event_loop_lag_seconds', 'How late the loop health probe ran compared to when it was scheduled.'
+)
+SLOW_CALLBACKS = metrics.registry.counter(
+    'event_loop_slow_callbacks_total', 'Times the event loop was blocked for longer than the threshold.'
+)
+
+
+class SlowCallback(NamedTuple):
+    started_at: datetime.datetime
+    duration: float
+    stack: str
+
+
+class _Stall:
+    __slots__ = ('beat', 'started_at', 'stack')
+
+    def __init__(self, beat: float, stack: str):
+        self.beat: float = beat
+        self.started_at: datetime.datetime = datetime.datetime.now(datetime.timezone.utc)
+        self.stack: str = stack
+
+
+class LoopMonitor:
+    """Keeps an eye on how responsive the event loop is.
+
+    A probe callback reschedules itself every ``interval`` seconds and records how
+    late it ran. A watchdog thread checks when the probe last ran and, if the loop
+    has been stuck for longer than ``threshold``, captures the stack of the loop
+    thread while it is still blocked. Unlike asyncio's debug mode nothing wraps
+    individual callbacks, so this is cheap enough to leave on in production.
+    """
+
+    def __init__(self, *, interval: float = 0.1, threshold: float = 0.25, history: int = 50):
+        self.interval: float = interval
+        self.threshold: float = threshold
+        self.slow_callbacks: deque[SlowCallback] = deque(maxlen=history)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._expected: float = 0.0
+        self._last_beat: float = 0.0
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._handle is not None
+
+    def start(self) -> None:
+        """Starts monitoring the running loop. Must be called from the loop's thread."""
+        if self.running:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._schedule()
+
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    def _schedule(self) -> None:
+        assert self._loop is not None
+        self._expected = self._loop.time() + self.interval
+        self._handle = self._loop.call_at(self._expected, self._beat)
+
+    def _beat(self) -> None:
+        assert self._loop is not None
+        LOOP_LAG.observe(max(0.0, self._loop.time() - self._expected))
+        self._last_beat = time.monotonic()
+        self._schedule()
+
+    def _watch(self) -> None:
+        stall: Optional[_Stall] = None
+        # The probe is allowed to be one interval late before it counts as a stall
+        limit = self.interval + self.threshold
+        while not self._stop.wait(self.threshold / 2):
+            beat = self._last_beat
+            if stall is not None and beat != stall.beat:
+                # The loop got unstuck, the next beat tells how long it took
+                duration = beat - stall.beat - self.interval
+                self.slow_callbacks.append(SlowCallback(stall.started_at, duration, stall.stack))
+                SLOW_CALLBACKS.inc()
+                log.warning('Event loop was blocked for %.3fs in:\n%s', duration, stall.stack)
+                stall = None
+
+            if stall is None and time.monotonic() - beat > limit:
+                frame = sys._current_frames().get(self._thread_id)  # type: ignore
+                stack = ''.join(traceback.format_stack(frame, limit=20)) if frame is not None else ''
+                del frame
+                stall = _Stall(beat, stack)
+
+    def lag(self, q: float) -> float:
+        return LOOP_LAG.percentile(q)
+
+
+class LatencyHistory:
+    """A bounded history of gateway latencies for every shard."""
+
+    def __init__(self, maxlen: int = 180):
+        self.maxlen: int = maxlen
+        self._samples: defaultdict[int, deque[tuple[datetime.datetime, float]]] = defaultdict(
+            lambda: deque(maxlen=self.maxlen)
+        )
+
+    def record(self, latencies: list[tuple[int, float]]) -> None:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for shard_id, latency in latencies:
+            # Shards that are not connected report inf
+            if latency == latency and latency != float('inf'):
+                self._samples[shard_id].append((now, latency))
+
+    def shards(self) -> list[int]:
+        return sorted(self._samples)
+
+    def series(self, shard_id: int) -> list[tuple[datetime.datetime, float]]:
+        return list(self._samples.get(shard_id, ()))
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import math
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Union
+
+# Histograms use log-linear buckets (HDR style): every power of two is split into
+# SUB_BUCKETS linear slices, which keeps the relative error of any percentile
+# under 1 / SUB_BUCKETS regardless of the magnitude of the values.
+SUB_BUCKETS = 16
+# Smallest distinguishable value, in the unit of the histogram (seconds by default).
+RESOLUTION = 1e-6
+# Bucket bounds histograms are exported with, every power of four from ~1ms to ~67s.
+# They are powers of two times RESOLUTION, so the cumulative counts are exact.
+EXPORT_BOUNDS = tuple(RESOLUTION * 4**k for k in range(5, 14))
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+class Metric:
+    kind: str = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labels: dict[str, str]):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labels: dict[str, str] = labels
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} name={self.name!r} labels={self.labels!r}>'
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: dict[str, str]):
+        super().__init__(name, documentation, labels)
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labels: dict[str, str]):
+        super().__init__(name, documentation, labels)
+        self._value: float = 0
+        self._function: Optional[Callable[[], float]] = None
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            try:
+                return self._function()
+            except Exception:
+                return math.nan
+        return self._value
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1) -> None:
+        self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self._value -= amount
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        """Makes the gauge report the return value of ``function`` when read."""
+        self._function = function
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: dict[str, str]):
+        super().__init__(name, documentation, labels)
+        self._counts: dict[int, int] = {}
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.min: float = math.inf
+        self.max: float = -math.inf
+
+    @staticmethod
+    def _bucket_for(value: float) -> int:
+        if value < RESOLUTION:
+            return 0
+        mantissa, exponent = math.frexp(value / RESOLUTION)
+        # mantissa is in [0.5, 1) so this maps each power of two onto SUB_BUCKETS slices
+        sub = int((mantissa * 2 - 1) * SUB_BUCKETS)
+        return 1 + (exponent - 1) * SUB_BUCKETS + sub
+
+    @staticmethod
+    def bucket_upper_bound(index: int) -> float:
+        if index == 0:
+            return RESOLUTION
+        exponent, sub = divmod(index - 1, SUB_BUCKETS)
+        return RESOLUTION * (1 << exponent) * (1 + (sub + 1) / SUB_BUCKETS)
+
+    def observe(self, value: float) -> None:
+        index = self._bucket_for(value)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def buckets(self) -> list[tuple[float, int]]:
+        """Returns the ``(upper bound, count)`` of every non-empty bucket, in order."""
+        # dict.copy is atomic so this can be read from another thread
+        counts = self._counts.copy()
+        return [(self.bucket_upper_bound(index), counts[index]) for index in sorted(counts)]
+
+    def percentile(self, q: float) -> float:
+        """Returns an upper bound for the ``q``-th percentile (0-100), or NaN if empty."""
+        buckets = self.buckets()
+        total = sum(count for _, count in buckets)
+        if total == 0:
+            return math.nan
+
+        rank = max(1, math.ceil(total * q / 100))
+        seen = 0
+        for upper, count in buckets:
+            seen += count
+            if seen >= rank:
+                return min(upper, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else math.nan
+
+    def cumulative(self, bounds: tuple[float, ...] = EXPORT_BOUNDS) -> list[tuple[float, int]]:
+        """Returns how many values fell under each of ``bounds``, which have to be sorted.
+
+        Buckets include their lower bound, so a value equal to a bound counts towards the next one.
+        """
+        buckets = self.buckets()
+        result = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            while index < len(buckets) and buckets[index][0] <= bound:
+                seen += buckets[index][1]
+                index += 1
+            result.append((bound, seen))
+        return result
+
+
+AnyMetric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    """Holds every metric of the process, keyed by name and labels.
+
+    Metrics are created on first use and returned as-is afterwards, so module
+    level metrics survive extension reloads.
+    """
+
+    def __init__(self):
+        self._metrics: dict[tuple[str, LabelKey], AnyMetric] = {}
+
+    def _get_or_create(self, cls: type[AnyMetric], name: str, documentation: str, labels: dict[str, str]) -> AnyMetric:
+        labels = {k: str(v) for k, v in labels.items()}
+        key = (name, tuple(sorted(labels.items())))
+        try:
+            metric = self._metrics[key]
+        except KeyError:
+            metric = self._metrics[key] = cls(name, documentation, labels)
+        else:
+            if not isinstance(metric, cls):
+                raise TypeError(f'metric {name!r} is already registered as a {metric.kind}')
+        return metric
+
+    def counter(self, name: str, documentation: str = '', **labels: str) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labels)  # type: ignore
+
+    def gauge(self, name: str, documentation: str = '', **labels: str) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labels)  # type: ignore
+
+    def histogram(self, name: str, documentation: str = '', **labels: str) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labels)  # type: ignore
+
+    def get(self, name: str, **labels: str) -> Optional[AnyMetric]:
+        return self._metrics.get((name, tuple(sorted((k, str(v)) for k, v in labels.items()))))
+
+    def find(self, name: str) -> list[AnyMetric]:
+        """Returns every labelled variant of a metric."""
+        return [metric for (metric_name, _), metric in list(self._metrics.items()) if metric_name == name]
+
+    def collect(self) -> list[AnyMetric]:
+        return list(self._metrics.values())
+
+
+registry = MetricsRegistry()
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+def _escape_help(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _escape(value: str) -> str:
+    return _escape_help(value).replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str], **extra: str) -> str:
+    labels = {**labels, **extra}
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in sorted(labels.items())) + '}'
+
+
+def render_prometheus(source: Optional[MetricsRegistry] = None) -> str:
+    """Renders every metric in the Prometheus text exposition format (version 0.0.4)."""
+    if source is None:
+        source = registry
+    families: dict[str, list[AnyMetric]] = {}
+    for metric in source.collect():
+        families.setdefault(metric.name, []).append(metric)
+
+    lines = []
+    for name in sorted(families):
+        family = families[name]
+        documentation = next((m.documentation for m in family if m.documentation), '')
+        if documentation:
+            lines.append(f'# HELP {name} {_escape_help(documentation)}')
+        lines.append(f'# TYPE {name} {family[0].kind}')
+        for metric in family:
+            if isinstance(metric, Histogram):
+                for bound, seen in metric.cumulative():
+                    lines.append(f'{name}_bucket{_format_labels(metric.labels, le=_format_value(bound))} {seen}')
+                lines.append(f'{name}_bucket{_format_labels(metric.labels, le="+Inf")} {metric.count}')
+                lines.append(f'{name}_sum{_format_labels(metric.labels)} {_format_value(metric.sum)}')
+                lines.append(f'{name}_count{_format_labels(metric.labels)} {metric.count}')
+            else:
+                lines.append(f'{name}{_format_labels(metric.labels)} {_format_value(metric.value)}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import collections
+import contextvars
+import functools
+import math
+import os
+import sys
+import threading
+from types import FrameType
+from typing import Any, Callable, Iterator, Optional
+
+# Every active CallCounter of the current context, nested counters all count a call
+_call_counts: contextvars.ContextVar[tuple[collections.Counter[str], ...]] = contextvars.ContextVar(
+    '_call_counts', default=()
+)
+
+
+def format_frame(frame: FrameType) -> str:
+    code = frame.f_code
+    name = getattr(code, 'co_qualname', code.co_name)
+    filename = os.path.basename(code.co_filename)
+    # ; and spaces have a meaning in the collapsed stack format
+    return f'{name} ({filename}:{frame.f_lineno})'.replace(';', ':').replace(' ', '_')
+
+
+def iter_stack(frame: Optional[FrameType]) -> Iterator[FrameType]:
+    """Yields the frames of a stack, innermost first."""
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+
+def collapse_stack(frame: FrameType) -> str:
+    """Formats a stack as a single ``outer;...;inner`` line, like ``stackcollapse`` does."""
+    return ';'.join(reversed([format_frame(f) for f in iter_stack(frame)]))
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of ``values``, ``q`` being 0-100."""
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * q / 100))
+    return ordered[rank - 1]
+
+
+class StackSampler:
+    """Periodically samples the stack of another thread from a background thread.
+
+    The samples are aggregated into collapsed stacks that flame graph tools
+    (e.g. ``flamegraph.pl`` or speedscope) can read directly.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, *, interval: float = 0.001):
+        self.thread_id: int = thread_id if thread_id is not None else threading.get_ident()
+        self.interval: float = interval
+        self.samples: collections.Counter[str] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[collapse_stack(frame)] += 1
+            del frame
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> StackSampler:
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    @property
+    def total(self) -> int:
+        return sum(self.samples.values())
+
+    def collapsed(self) -> str:
+        return '\n'.join(f'{stack} {count}' for stack, count in self.samples.most_common())
+
+
+class CallCounter:
+    """Counts database queries and HTTP requests made by the current task.
+
+    While any counter is active, the query methods of :class:`asyncpg.Connection`
+    (which the pool delegates to) and :meth:`aiohttp.ClientSession._request` are
+    wrapped. The wrappers are installed by the first counter to enter and removed
+    by the last one to exit, so counters can overlap and nest. Calls are attributed
+    through a context variable, so only the task that entered the counter and the
+    tasks it spawns are counted, not everything else running on the loop.
+    """
+
+    DB_METHODS = ('execute', 'executemany', 'fetch', 'fetchrow', 'fetchval', 'copy_records_to_table')
+
+    _lock = threading.Lock()
+    _active: int = 0
+    _originals: list[tuple[type, str, Any]] = []
+
+    def __init__(self):
+        self.counts: collections.Counter[str] = collections.Counter()
+        self._token: Optional[contextvars.Token[tuple[collections.Counter[str], ...]]] = None
+
+    def __getitem__(self, kind: str) -> int:
+        return self.counts[kind]
+
+    @staticmethod
+    def _wrap(kind: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        async def wrapped(*args: Any, **kwargs: Any) -> Any:
+            for counts in _call_counts.get():
+                counts[kind] += 1
+            return await func(*args, **kwargs)
+
+        return wrapped
+
+    @classmethod
+    def _patch(cls, owner: type, name: str, kind: str) -> None:
+        original = owner.__dict__[name]
+        cls._originals.append((owner, name, original))
+        setattr(owner, name, cls._wrap(kind, original))
+
+    @classmethod
+    def _install(cls) -> None:
+        import asyncpg
+        import aiohttp
+
+        for name in cls.DB_METHODS:
+            cls._patch(asyncpg.Connection, name, 'db')
+        cls._patch(aiohttp.ClientSession, '_request', 'http')
+
+    @classmethod
+    def _uninstall(cls) -> None:
+        for owner, name, original in reversed(cls._originals):
+            setattr(owner, name, original)
+        cls._originals.clear()
+
+    def __enter__(self) -> CallCounter:
+        if self._token is not None:
+            raise RuntimeError('this counter is already active')
+
+        with CallCounter._lock:
+            if CallCounter._active == 0:
+                self._install()
+            CallCounter._active += 1
+        self._token = _call_counts.set((*_call_counts.get(), self.counts))
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        if self._token is None:
+            return
+
+        _call_counts.reset(self._token)
+        self._token = None
+        with CallCounter._lock:
+            CallCounter._active -= 1
+            if CallCounter._active == 0:
+                self._uninstall()
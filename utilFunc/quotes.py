@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import sqlite3
+import unicodedata
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, NamedTuple, Optional, TypeVar
+
+import mmh3
+
+log = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class Quote(NamedTuple):
+    user: str
+    message: str
+    date_added: str
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(unicodedata.normalize('NFC', text).split()).casefold()
+
+
+def quote_hash(user: str, message: str) -> int:
+    """A stable 64-bit hash of a quote, used to skip duplicates.
+
+    Unlike :func:`hash` this is the same in every process, and it ignores
+    differences in case and whitespace.
+    """
+    data = f'{_normalize(user)}\x00{_normalize(message)}'.encode('utf-8')
+    return mmh3.hash64(data, signed=True)[0]
+
+
+def _create_count_triggers(db: sqlite3.Connection) -> None:
+    db.execute(
+        """CREATE TRIGGER IF NOT EXISTS quotes_count_insert AFTER INSERT ON quotes
+           BEGIN
+               INSERT INTO quote_counts (guild_id, count) VALUES (NEW.guild_id, 1)
+               ON CONFLICT (guild_id) DO UPDATE SET count = count + 1;
+           END"""
+    )
+    db.execute(
+        """CREATE TRIGGER IF NOT EXISTS quotes_count_delete AFTER DELETE ON quotes
+           BEGIN
+               UPDATE quote_counts SET count = count - 1 WHERE guild_id = OLD.guild_id;
+           END"""
+    )
+
+
+def _recount(db: sqlite3.Connection) -> None:
+    db.execute('DELETE FROM quote_counts')
+    db.execute('INSERT INTO quote_counts SELECT guild_id, COUNT(*) FROM quotes GROUP BY guild_id')
+
+
+def _migrate_v1(db: sqlite3.Connection) -> None:
+    db.execute(
+        'CREATE TABLE IF NOT EXISTS quotes(hash TEXT primary key, '
+        'user TEXT, message TEXT, date_added TEXT, guild_id INT)'
+    )
+    db.execute('CREATE INDEX IF NOT EXISTS quotes_guild_id_user_idx ON quotes (guild_id, user)')
+
+    # Per guild row counts, kept current by triggers so counting never scans
+    db.execute('CREATE TABLE IF NOT EXISTS quote_counts(guild_id INT PRIMARY KEY, count INT NOT NULL)')
+    _recount(db)
+    _create_count_triggers(db)
+
+
+def _migrate_v2(db: sqlite3.Connection) -> None:
+    # The old keys came from hash(), which is randomised per process, so every
+    # row is rehashed. Rows that turn out to be duplicates are dropped.
+    db.execute(
+        """CREATE TABLE quotes_new(
+               id INTEGER PRIMARY KEY,
+               hash INTEGER NOT NULL,
+               user TEXT,
+               message TEXT,
+               date_added TEXT,
+               guild_id INT
+           )"""
+    )
+    rows = db.execute('SELECT rowid, user, message, date_added, guild_id FROM quotes ORDER BY rowid')
+    db.executemany(
+        'INSERT INTO quotes_new VALUES(?,?,?,?,?,?)',
+        (
+            (rowid, quote_hash(user or '', message or ''), user, message, date_added, guild_id)
+            for rowid, user, message, date_added, guild_id in rows
+        ),
+    )
+    db.execute(
+        'DELETE FROM quotes_new WHERE id NOT IN (SELECT MIN(id) FROM quotes_new GROUP BY guild_id, hash)'
+    )
+
+    # Dropping the table drops its indexes and triggers too
+    db.execute('DROP TABLE quotes')
+    db.execute('ALTER TABLE quotes_new RENAME TO quotes')
+    db.execute('CREATE UNIQUE INDEX quotes_guild_id_hash_idx ON quotes (guild_id, hash)')
+    db.execute('CREATE INDEX quotes_guild_id_user_idx ON quotes (guild_id, user)')
+    _recount(db)
+    _create_count_triggers(db)
+
+
+# Applied in order, the database's PRAGMA user_version is the number of migrations that ran
+MIGRATIONS: list[Callable[[sqlite3.Connection], None]] = [
+    _migrate_v1,
+    _migrate_v2,
+]
+
+
+class QuoteStore:
+    """The quotes database.
+
+    sqlite connections are bound to the thread that created them, so the connection
+    lives on a dedicated worker thread and every query is run there, keeping the
+    event loop free. The database is opened in WAL mode.
+
+    Random quotes are picked from arrays of quote ids, one per guild and one per
+    (guild, user) pair. They are loaded lazily, kept in an LRU of ``max_pools``
+    entries and appended to when quotes are added, so picking a quote is a random
+    index plus a primary key lookup instead of sorting every candidate by ``RANDOM()``.
+    Like the connection, they are only touched from the worker thread.
+    """
+
+    def __init__(self, path: str = 'quotes.db', *, max_pools: int = 1024):
+        self.path: str = path
+        self.max_pools: int = max_pools
+        self._db: Optional[sqlite3.Connection] = None
+        self._pools: OrderedDict[tuple[int, Optional[str]], array[int]] = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='quotes')
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _open(self) -> None:
+        db = sqlite3.connect(self.path, timeout=30.0)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+
+        version = db.execute('PRAGMA user_version').fetchone()[0]
+        for index, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            with db:
+                db.execute('BEGIN')
+                migration(db)
+                db.execute(f'PRAGMA user_version = {index}')
+            log.info('Migrated %s to version %s', self.path, index)
+
+        self._db = db
+
+    async def open(self) -> None:
+        await self._run(self._open)
+
+    def _close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    async def close(self) -> None:
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            raise RuntimeError('quote store is not open')
+        return self._db
+
+    def _add(self, guild_id: int, user: str, message: str, date_added: str) -> Optional[int]:
+        with self.db:
+            cursor = self.db.execute(
+                'INSERT INTO quotes (hash, user, message, date_added, guild_id) VALUES(?,?,?,?,?) '
+                'ON CONFLICT (guild_id, hash) DO NOTHING',
+                (quote_hash(user, message), user, message, date_added, guild_id),
+            )
+            if cursor.rowcount == 0:
+                return None
+
+        quote_id = cursor.lastrowid
+        for key in ((guild_id, None), (guild_id, user)):
+            pool = self._pools.get(key)
+            if pool is not None:
+                pool.append(quote_id)
+        return self._count(guild_id)
+
+    async def add(self, guild_id: int, user: str, message: str, date_added: str) -> Optional[int]:
+        """Adds a quote. Returns the new number of quotes in the guild, or ``None`` if it was a duplicate."""
+        return await self._run(self._add, guild_id, user, message, date_added)
+
+    def _count(self, guild_id: int) -> int:
+        row = self.db.execute('SELECT count FROM quote_counts WHERE guild_id = ?', (guild_id,)).fetchone()
+        return row[0] if row else 0
+
+    async def count(self, guild_id: int) -> int:
+        return await self._run(self._count, guild_id)
+
+    def _pool(self, guild_id: int, user: Optional[str]) -> array[int]:
+        key = (guild_id, user)
+        try:
+            pool = self._pools[key]
+        except KeyError:
+            if user is None:
+                cursor = self.db.execute('SELECT id FROM quotes WHERE guild_id = ?', (guild_id,))
+            else:
+                cursor = self.db.execute('SELECT id FROM quotes WHERE guild_id = ? AND user = ?', (guild_id, user))
+
+            pool = self._pools[key] = array('q', (quote_id for quote_id, in cursor))
+            if len(self._pools) > self.max_pools:
+                self._pools.popitem(last=False)
+        else:
+            self._pools.move_to_end(key)
+        return pool
+
+    def _random(self, guild_id: int, user: Optional[str]) -> Optional[Quote]:
+        query = 'SELECT user, message, date_added FROM quotes WHERE id = ?'
+        # A second attempt in case the database was changed behind our back
+        for _ in range(2):
+            pool = self._pool(guild_id, user)
+            if not pool:
+                return None
+
+            row = self.db.execute(query, (random.choice(pool),)).fetchone()
+            if row is not None:
+                return Quote(*row)
+
+            del self._pools[(guild_id, user)]
+        return None
+
+    async def random(self, guild_id: int, user: Optional[str] = None) -> Optional[Quote]:
+        """Returns a random quote from the guild, optionally only from ``user``."""
+        return await self._run(self._random, guild_id, user)
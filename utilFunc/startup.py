@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, Mapping, NamedTuple, Optional
+
+from .formats import TabularData
+
+if TYPE_CHECKING:
+    from discord.ext import commands
+
+log = logging.getLogger(__name__)
+
+
+class ExtensionTiming(NamedTuple):
+    name: str
+    # Seconds since loading started at which the extension was able to start loading
+    started: float
+    duration: float
+    error: Optional[BaseException] = None
+
+    @property
+    def status(self) -> str:
+        if self.error is None:
+            return 'ok'
+        if isinstance(self.error, DependencyFailed):
+            return f'skipped ({self.error.dependency} failed)'
+        return f'failed ({type(self.error).__name__})'
+
+
+class DependencyFailed(Exception):
+    def __init__(self, extension: str, dependency: str):
+        self.extension: str = extension
+        self.dependency: str = dependency
+        super().__init__(f'{extension} was not loaded because {dependency} failed to load')
+
+
+class StartupOrchestrator:
+    """Loads the initial extensions and runs the work that can wait until the bot is ready.
+
+    Extensions are loaded concurrently, each one only waiting for the extensions it
+    depends on. Extensions whose dependency failed to load are skipped.
+
+    Warmups (filling caches, refreshing data from the network, ...) are registered
+    with :meth:`defer` and run in the background once the bot is ready, so they
+    never delay connecting to the gateway. Warmups deferred after that point run
+    straight away.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot: commands.Bot = bot
+        self.timings: list[ExtensionTiming] = []
+        self.ready: bool = False
+        self._warmups: list[tuple[str, Callable[[], Awaitable[object]]]] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, extensions: Iterable[str], dependencies: Mapping[str, Iterable[str]] = {}) -> None:
+        extensions = list(extensions)
+        requires = {name: tuple(dependencies.get(name, ())) for name in extensions}
+        for name, deps in requires.items():
+            for dep in deps:
+                if dep not in requires:
+                    raise ValueError(f'{name} depends on {dep}, which is not being loaded')
+        self._check_cycles(requires)
+
+        start = time.perf_counter()
+        done: dict[str, asyncio.Future[None]] = {name: asyncio.get_running_loop().create_future() for name in extensions}
+        timings: dict[str, ExtensionTiming] = {}
+
+        async def load_one(name: str) -> None:
+            error: Optional[BaseException] = None
+            for dep in requires[name]:
+                await done[dep]
+                if timings[dep].error is not None:
+                    error = DependencyFailed(name, dep)
+                    break
+
+            started = time.perf_counter()
+            if error is None:
+                try:
+                    await self.bot.load_extension(name)
+                except Exception as e:
+                    error = e
+                    log.exception('Failed to load extension %s.', name)
+                else:
+                    log.info('Loaded extension %s.', name)
+            else:
+                log.error('%s', error)
+
+            timings[name] = ExtensionTiming(name, started - start, time.perf_counter() - started, error)
+            done[name].set_result(None)
+
+        await asyncio.gather(*(load_one(name) for name in extensions))
+        self.timings = [timings[name] for name in extensions]
+        log.info('Loaded extensions in %.3fs:\n%s', time.perf_counter() - start, self.report())
+
+    def _check_cycles(self, requires: Mapping[str, tuple[str, ...]]) -> None:
+        visiting: set[str] = set()
+        visited: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f'Extension dependency cycle involving {name}')
+            visiting.add(name)
+            for dep in requires[name]:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in requires:
+            visit(name)
+
+    def report(self) -> str:
+        table = TabularData()
+        table.set_columns(['Extension', 'Start', 'Load', 'Status'])
+        for timing in sorted(self.timings, key=lambda t: t.started):
+            table.add_row([timing.name, f'{timing.started * 1000:.0f}ms', f'{timing.duration * 1000:.0f}ms', timing.status])
+        return table.render()
+
+    def defer(self, name: str, func: Callable[[], Awaitable[object]]) -> None:
+        """Runs ``func`` once the bot is ready, or now if it already is."""
+        if self.ready:
+            self._spawn(name, func)
+        else:
+            self._warmups.append((name, func))
+
+    def _spawn(self, name: str, func: Callable[[], Awaitable[object]]) -> None:
+        task = asyncio.create_task(self._run_warmup(name, func))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_warmup(self, name: str, func: Callable[[], Awaitable[object]]) -> None:
+        start = time.perf_counter()
+        try:
+            await func()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception('Warmup %s failed after %.3fs', name, time.perf_counter() - start)
+        else:
+            log.info('Warmup %s finished in %.3fs', name, time.perf_counter() - start)
+
+    def mark_ready(self) -> None:
+        """Starts the deferred warmups. Only the first call does anything."""
+        if self.ready:
+            return
+
+        self.ready = True
+        warmups, self._warmups = self._warmups, []
+        for name, func in warmups:
+            self._spawn(name, func)
+
+    def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._warmups.clear()
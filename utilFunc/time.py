@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import datetime
+import functools
 import re
-from typing import TYPE_CHECKING, Any, Optional, Union
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional, Union
 
 import parsedatetime as pdt
 from dateutil.relativedelta import relativedelta
@@ -95,6 +96,188 @@ class RelativeDelta(app_commands.Transformer, commands.Converter):
             raise app_commands.AppCommandError(str(e)) from None
 
 
+_UNIT_NAMES = {
+    'sec': 'seconds',
+    'second': 'seconds',
+    'min': 'minutes',
+    'minute': 'minutes',
+    'hr': 'hours',
+    'hour': 'hours',
+    'day': 'days',
+    'week': 'weeks',
+    'month': 'months',
+    'year': 'years',
+}
+
+_AMOUNT = r'(?:[0-9]{1,5}|an?)\s*(?:seconds?|secs?|minutes?|mins?|hours?|hrs?|days?|weeks?|months?|years?)\b'
+_CLOCK = r'(?:[0-9]{1,2}(?::[0-9]{2})?\s*[ap]m|[0-9]{1,2}:[0-9]{2})\b'
+_DAY = r'(?:today|tomorrow)'
+_PHRASE = (
+    rf'(?:in\s+)?{_AMOUNT}(?:(?:\s*,\s*|\s+and\s+|\s+){_AMOUNT})*'
+    rf'|{_DAY}(?:\s+at\s+{_CLOCK})?'
+    rf'|at\s+{_CLOCK}(?:\s+{_DAY})?'
+    r'|(?:on\s+)?[0-9]{4}-[0-9]{2}-[0-9]{2}(?:[ T][0-9]{1,2}:[0-9]{2}(?::[0-9]{2})?)?'
+)
+
+
+class FastPhrase(NamedTuple):
+    """A time phrase recognised without parsedatetime, independent of the current time."""
+
+    begin: int
+    end: int
+    delta: Optional[tuple[tuple[str, int], ...]] = None
+    date: Optional[datetime.date] = None
+    day_offset: Optional[int] = None
+    clock: Optional[datetime.time] = None
+
+    def resolve(self, now: datetime.datetime) -> datetime.datetime:
+        """Applies the phrase the same way the parsedatetime path would.
+
+        Raises :exc:`commands.BadArgument` if the result is not a valid date.
+        """
+        try:
+            return self._resolve(now)
+        except (ValueError, OverflowError):
+            raise commands.BadArgument('Invalid time provided, that is too far away.') from None
+
+    def _resolve(self, now: datetime.datetime) -> datetime.datetime:
+        if self.delta is not None:
+            return now + relativedelta(**dict(self.delta))
+
+        date = self.date
+        if date is None and self.day_offset is not None:
+            date = now.date() + datetime.timedelta(days=self.day_offset)
+
+        if self.clock is None:
+            # No time given so it's the current time on that date
+            return datetime.datetime.combine(date, now.timetz())  # type: ignore  # date is always set here
+
+        if date is not None:
+            return datetime.datetime.combine(date, self.clock, tzinfo=now.tzinfo)
+
+        # A time without a date is the next occurrence of that time
+        dt = datetime.datetime.combine(now.date(), self.clock, tzinfo=now.tzinfo)
+        if dt < now:
+            dt += datetime.timedelta(days=1)
+        return dt
+
+
+class FastTimeParser:
+    """Recognises the most common reminder time phrases before falling back to parsedatetime.
+
+    Handles relative offsets ("in 3 days", "2 hours and 30 minutes"), "today"/"tomorrow"
+    with an optional clock time, "at 5pm" and ISO dates, either at the start or the end
+    of the argument. Anything else (quoted times, weekdays, "next month", ...) returns
+    ``None`` so the caller can use the slow path.
+    """
+
+    leading = re.compile(rf'(?P<phrase>{_PHRASE})(?=$|[\s,.!])', re.IGNORECASE)
+    trailing = re.compile(rf'(?:^|(?<=\s))(?P<phrase>{_PHRASE})[.!]?$', re.IGNORECASE)
+    amount = re.compile(
+        r'\b(?:(?P<value>[0-9]+)\s*|(?P<article>an?)\s+)(?P<unit>sec|second|min|minute|hr|hour|day|week|month|year)s?\b',
+        re.IGNORECASE,
+    )
+    clock = re.compile(r'(?P<hour>[0-9]{1,2})(?::(?P<minute>[0-9]{2}))?\s*(?P<meridiem>[ap]m)?', re.IGNORECASE)
+    iso = re.compile(
+        r'(?P<date>[0-9]{4}-[0-9]{2}-[0-9]{2})(?:[ T](?P<hour>[0-9]{1,2}):(?P<minute>[0-9]{2})(?::(?P<second>[0-9]{2}))?)?'
+    )
+
+    # Words next to a phrase that parsedatetime would combine with it, e.g. "3 days ago",
+    # "tomorrow 5pm" or "next friday at 5pm". These are left to the slow path.
+    _continuation = re.compile(
+        r'(?:ago|before|after|from|earlier|at|on|next|this|the|noon|midnight|morning|afternoon|evening|night'
+        r'|(?:mon|tues|wednes|thurs|fri|satur|sun)day|(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*)\b'
+        r'|[0-9]',
+        re.IGNORECASE,
+    )
+    _preceding = re.compile(
+        r'(?:^|\s)(?:next|this|on|the|every|by|from|until|after|before|and|noon|midnight|morning|afternoon'
+        r'|evening|night|tonight|today|tomorrow|(?:mon|tues|wednes|thurs|fri|satur|sun)day'
+        r'|(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*|[0-9][a-z0-9]*),?$',
+        re.IGNORECASE,
+    )
+
+    @classmethod
+    def _parse_clock(cls, text: str) -> Optional[datetime.time]:
+        match = cls.clock.search(text)
+        if match is None:
+            return None
+
+        hour = int(match.group('hour'))
+        minute = int(match.group('minute') or 0)
+        meridiem = match.group('meridiem')
+        if meridiem is not None:
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if meridiem.lower() == 'pm' else 0)
+
+        if hour > 23 or minute > 59:
+            return None
+        return datetime.time(hour, minute)
+
+    @classmethod
+    def _build(cls, phrase: str, begin: int, end: int) -> Optional[FastPhrase]:
+        lowered = phrase.lower()
+        iso = cls.iso.search(phrase)
+        if iso is not None:
+            try:
+                date = datetime.date.fromisoformat(iso.group('date'))
+                clock = None
+                if iso.group('hour') is not None:
+                    clock = datetime.time(int(iso.group('hour')), int(iso.group('minute')), int(iso.group('second') or 0))
+            except ValueError:
+                return None
+            return FastPhrase(begin, end, date=date, clock=clock)
+
+        day_offset = None
+        if 'tomorrow' in lowered:
+            day_offset = 1
+        elif 'today' in lowered:
+            day_offset = 0
+
+        if day_offset is not None or lowered.startswith('at'):
+            clock = None
+            if 'at' in lowered.split():
+                clock = cls._parse_clock(lowered.split('at', 1)[1])
+                if clock is None:
+                    return None
+            return FastPhrase(begin, end, day_offset=day_offset, clock=clock)
+
+        delta: dict[str, int] = {}
+        for match in cls.amount.finditer(lowered):
+            unit = _UNIT_NAMES[match.group('unit')]
+            value = match.group('value')
+            delta[unit] = delta.get(unit, 0) + (1 if value is None else int(value))
+
+        if not delta:
+            return None
+        return FastPhrase(begin, end, delta=tuple(delta.items()))
+
+    @classmethod
+    @functools.lru_cache(maxsize=1024)
+    def scan(cls, argument: str) -> Optional[FastPhrase]:
+        """Finds a supported time phrase at the start or end of the argument.
+
+        The result does not depend on the current time, so it is cached per argument.
+        """
+        if not argument or argument[0] == '"':
+            return None
+
+        match = cls.leading.match(argument)
+        if match is not None:
+            rest = argument[match.end():].lstrip(' ,.!')
+            if cls._continuation.match(rest) is None:
+                return cls._build(match.group('phrase'), 0, match.end())
+            return None
+
+        match = cls.trailing.search(argument)
+        if match is not None:
+            before = argument[:match.start('phrase')].rstrip()
+            if cls._preceding.search(before) is None:
+                return cls._build(match.group('phrase'), match.start('phrase'), match.end('phrase'))
+        return None
+
+
 class HumanTime:
     calendar = pdt.Calendar(version=pdt.VERSION_CONTEXT_STYLE)
 
@@ -106,13 +289,17 @@ class HumanTime:
             tzinfo: datetime.tzinfo = datetime.timezone.utc,
     ):
         now = now or datetime.datetime.now(tzinfo)
-        dt, status = self.calendar.parseDT(argument, sourceTime=now, tzinfo=None)
-        if not status.hasDateOrTime:
-            raise commands.BadArgument('invalid time provided, try e.g. "tomorrow" or "3 days"')
+        fast = FastTimeParser.scan(argument)
+        if fast is not None and fast.begin == 0 and fast.end == len(argument):
+            dt = fast.resolve(now).replace(tzinfo=None)
+        else:
+            dt, status = self.calendar.parseDT(argument, sourceTime=now, tzinfo=None)
+            if not status.hasDateOrTime:
+                raise commands.BadArgument('invalid time provided, try e.g. "tomorrow" or "3 days"')
 
-        if not status.hasTime:
-            # replace it with the current time
-            dt = dt.replace(hour=now.hour, minute=now.minute, second=now.second, microsecond=now.microsecond)
+            if not status.hasTime:
+                # replace it with the current time
+                dt = dt.replace(hour=now.hour, minute=now.minute, second=now.second, microsecond=now.microsecond)
 
         self.dt: datetime.datetime = dt.replace(tzinfo=tzinfo)
         if now.tzinfo is None:
@@ -269,6 +456,17 @@ class UserFriendlyTime(commands.Converter):
 
         # Have to adjust the timezone so pdt knows how to handle things like "tomorrow at 6pm" in an aware way
         now = now.astimezone(tzinfo)
+
+        fast = FastTimeParser.scan(argument)
+        if fast is not None:
+            result = FriendlyTimeResult(fast.resolve(now))
+            if fast.begin == 0:
+                remaining = argument[fast.end:].lstrip(' ,.!')
+            else:
+                remaining = argument[:fast.begin].strip()
+            await result.ensure_constraints(ctx, self, now, remaining)
+            return result
+
         elements = calendar.nlp(argument, sourceTime=now)
         if elements is None or len(elements) == 0:
             raise commands.BadArgument('Invalid time provided, try e.g. "tomorrow" or "3 days".')
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple, Optional, Sequence
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+log = logging.getLogger(__name__)
+
+CLDR_TIMEZONES_URL = 'https://raw.githubusercontent.com/unicode-org/cldr/main/common/bcp47/timezone.xml'
+
+# User-friendly timezone names, most of the rest come from the CLDR database.
+MANUAL_ALIASES: dict[str, str] = {
+    'Eastern Time': 'America/New_York',
+    'Central Time': 'America/Chicago',
+    'Mountain Time': 'America/Denver',
+    'Pacific Time': 'America/Los_Angeles',
+    # (Unfortunately) special case American timezone abbreviations
+    'EST': 'America/New_York',
+    'CST': 'America/Chicago',
+    'MST': 'America/Denver',
+    'PST': 'America/Los_Angeles',
+    'EDT': 'America/New_York',
+    'CDT': 'America/Chicago',
+    'MDT': 'America/Denver',
+    'PDT': 'America/Los_Angeles',
+}
+
+
+class CLDRDataEntry(NamedTuple):
+    description: str
+    aliases: list[str]
+    deprecated: bool
+    preferred: Optional[str]
+
+
+def parse_cldr_timezones(data: bytes) -> dict[str, CLDRDataEntry]:
+    """Parses the CLDR bcp47 timezone XML. This is CPU bound, run it in an executor."""
+    from lxml import etree
+
+    parser = etree.XMLParser(ns_clean=True, recover=True, encoding='utf-8')
+    tree = etree.fromstring(data, parser=parser)
+    return {
+        node.attrib['name']: CLDRDataEntry(
+            description=node.attrib['description'],
+            aliases=node.get('alias', 'Etc/Unknown').split(' '),
+            deprecated=node.get('deprecated', 'false') == 'true',
+            preferred=node.get('preferred'),
+        )
+        for node in tree.iter('type')
+        # Filter the Etc/ entries (except UTC)
+        if not node.attrib['name'].startswith(('utcw', 'utce', 'unk'))
+        and not node.attrib['description'].startswith('POSIX')
+    }
+
+
+class TimezoneIndex:
+    """A search index over a fixed collection of names.
+
+    Results are identical to :func:`utilFunc.fuzzy.finder`, but since a query can only
+    match names that its prefix matched, the candidates of previous queries are kept
+    in an LRU and every keystroke of an autocomplete only has to search the survivors
+    of the previous one.
+    """
+
+    def __init__(self, names: Iterable[str], *, maxsize: int = 512):
+        self._names: list[str] = sorted(set(names))
+        self._maxsize: int = maxsize
+        self._matches: OrderedDict[str, list[int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _candidates(self, query: str) -> Iterable[int]:
+        for end in range(len(query) - 1, 0, -1):
+            try:
+                return self._matches[query[:end]]
+            except KeyError:
+                continue
+        return range(len(self._names))
+
+    def search(self, query: str) -> list[str]:
+        query = query.lower()
+        if not query:
+            return list(self._names)
+
+        try:
+            indices = self._matches[query]
+        except KeyError:
+            regex = re.compile('.*?'.join(map(re.escape, query)), flags=re.IGNORECASE)
+            indices = [i for i in self._candidates(query) if regex.search(self._names[i])]
+            self._matches[query] = indices
+            if len(self._matches) > self._maxsize:
+                self._matches.popitem(last=False)
+        else:
+            self._matches.move_to_end(query)
+            regex = re.compile('.*?'.join(map(re.escape, query)), flags=re.IGNORECASE)
+
+        suggestions = []
+        for i in indices:
+            name = self._names[i]
+            match = regex.search(name)
+            suggestions.append((len(match.group()), match.start(), name))  # type: ignore  # always matches
+
+        suggestions.sort()
+        return [name for _, _, name in suggestions]
+
+
+class TimezoneRegistry:
+    """Every timezone related lookup, built once and shared.
+
+    This holds the IANA zone names, the CLDR aliases, interned :class:`datetime.tzinfo`
+    objects and the search indexes used for autocomplete. The CLDR data is cached on
+    disk and only re-downloaded (conditionally) once it is older than ``max_age``.
+    """
+
+    def __init__(
+            self,
+            *,
+            popular_ids: Sequence[str] = (),
+            cache_path: str = 'cldr_timezones.json',
+            max_age: float = 86400.0,
+    ):
+        self.popular_ids: Sequence[str] = popular_ids
+        self.cache_path: str = cache_path
+        self.max_age: float = max_age
+        self._valid_timezones: Optional[frozenset[str]] = None
+        self._iana_index: Optional[TimezoneIndex] = None
+        self.aliases: dict[str, str] = dict(MANUAL_ALIASES)
+        self.popular: list[tuple[str, str]] = []
+        self._entries: dict[str, CLDRDataEntry] = {}
+        self._tzinfos: dict[str, Optional[datetime.tzinfo]] = {'UTC': datetime.timezone.utc}
+        self._alias_index = TimezoneIndex(self.aliases)
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._fetched_at: float = 0.0
+        self._refresh_lock = asyncio.Lock()
+
+    @property
+    def valid_timezones(self) -> frozenset[str]:
+        # Reading the zoneinfo tarball is slow, so it waits until a timezone is actually needed
+        if self._valid_timezones is None:
+            from dateutil.zoneinfo import get_zonefile_instance
+
+            self._valid_timezones = frozenset(get_zonefile_instance().zones)
+        return self._valid_timezones
+
+    @property
+    def iana_index(self) -> TimezoneIndex:
+        if self._iana_index is None:
+            self._iana_index = TimezoneIndex(self.valid_timezones)
+        return self._iana_index
+
+    def get_tzinfo(self, key: str) -> Optional[datetime.tzinfo]:
+        try:
+            return self._tzinfos[key]
+        except KeyError:
+            import dateutil.tz
+
+            tzinfo = self._tzinfos[key] = dateutil.tz.gettz(key)
+            return tzinfo
+
+    def resolve(self, argument: str) -> Optional[tuple[str, str]]:
+        """Returns the ``(label, key)`` of an exact alias or IANA name."""
+        # Prioritise aliases because they handle short codes slightly better
+        try:
+            return argument, self.aliases[argument]
+        except KeyError:
+            pass
+
+        if argument in self.valid_timezones:
+            return argument, argument
+        return None
+
+    def find(self, query: str) -> list[tuple[str, str]]:
+        # A bit hacky, but if '/' is in the query then it's looking for a raw identifier
+        # otherwise it's looking for a CLDR alias
+        if '/' in query:
+            return [(key, key) for key in self.iana_index.search(query)]
+
+        return [(label, self.aliases[label]) for label in self._alias_index.search(query)]
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() - self._fetched_at > self.max_age
+
+    def _apply(self, entries: dict[str, CLDRDataEntry]) -> None:
+        aliases = dict(MANUAL_ALIASES)
+        for entry in entries.values():
+            # These use the first entry in the alias list as the "canonical" name to use when mapping the
+            # timezone to the IANA database.
+            # The CLDR database is not particularly correct when it comes to these, but neither is the IANA database.
+            # It turns out the notion of a "canonical" name is a bit of a mess. This works fine for users where
+            # this is only used for display purposes, but it's not ideal.
+            if entry.preferred is not None:
+                preferred = entries.get(entry.preferred)
+                if preferred is not None:
+                    aliases[entry.description] = preferred.aliases[0]
+            else:
+                aliases[entry.description] = entry.aliases[0]
+
+        popular = []
+        for key in self.popular_ids:
+            entry = entries.get(key)
+            if entry is not None:
+                popular.append((entry.description, entry.aliases[0]))
+
+        self.aliases = aliases
+        self.popular = popular
+        self._alias_index = TimezoneIndex(aliases)
+
+    def _read_cache(self) -> Optional[dict[str, Any]]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as fp:
+                return json.load(fp)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            log.warning('Ignoring unreadable CLDR cache %s: %s', self.cache_path, e)
+            return None
+
+    def _write_cache(self, entries: dict[str, CLDRDataEntry]) -> None:
+        data = {
+            'etag': self._etag,
+            'last_modified': self._last_modified,
+            'fetched_at': self._fetched_at,
+            'entries': {name: list(entry) for name, entry in entries.items()},
+        }
+        temp = f'{self.cache_path}.tmp'
+        with open(temp, 'w', encoding='utf-8') as fp:
+            json.dump(data, fp, separators=(',', ':'))
+
+        # atomically move the file
+        os.replace(temp, self.cache_path)
+
+    async def load(self) -> None:
+        """Loads the CLDR data from the disk cache, if there is one."""
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(None, self._read_cache)
+        if data is None:
+            return
+
+        self._entries = {name: CLDRDataEntry(*entry) for name, entry in data['entries'].items()}
+        self._etag = data.get('etag')
+        self._last_modified = data.get('last_modified')
+        self._fetched_at = data.get('fetched_at', 0.0)
+        self._apply(self._entries)
+
+    async def refresh(self, session: ClientSession, *, force: bool = False) -> bool:
+        """Revalidates the CLDR data against upstream.
+
+        Returns ``True`` if new data was downloaded.
+        """
+        async with self._refresh_lock:
+            if not force and not self.is_stale:
+                return False
+
+            headers = {}
+            if self._etag:
+                headers['If-None-Match'] = self._etag
+            if self._last_modified:
+                headers['If-Modified-Since'] = self._last_modified
+
+            loop = asyncio.get_running_loop()
+            async with session.get(CLDR_TIMEZONES_URL, headers=headers) as resp:
+                if resp.status == 304:
+                    self._fetched_at = time.time()
+                    await loop.run_in_executor(None, self._write_cache, self._entries)
+                    return False
+
+                if resp.status != 200:
+                    log.warning('Could not refresh CLDR timezone data (status %s)', resp.status)
+                    return False
+
+                raw = await resp.read()
+                self._etag = resp.headers.get('ETag')
+                self._last_modified = resp.headers.get('Last-Modified')
+
+            self._entries = await loop.run_in_executor(None, parse_cldr_timezones, raw)
+            self._fetched_at = time.time()
+            self._apply(self._entries)
+            await loop.run_in_executor(None, self._write_cache, self._entries)
+            return True
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import re
+import time
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Any, Generic, Optional, TypeVar
+
+from .cache import request_counters
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+log = logging.getLogger(__name__)
+
+OPENWEATHER_API = 'https://api.openweathermap.org/data/2.5'
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class WeatherError(Exception):
+    pass
+
+
+class LocationNotFound(WeatherError):
+    def __init__(self, query: str):
+        self.query: str = query
+        super().__init__(f'Could not find data for {query}')
+
+
+class TTLCache(Generic[K, V]):
+    """An LRU bounded to ``maxsize`` entries that expire after ``ttl`` seconds.
+
+    Lookups are counted in the ``cache_requests_total`` metric under ``name``.
+    """
+
+    def __init__(self, name: str, *, ttl: float, maxsize: int):
+        self.ttl: float = ttl
+        self.maxsize: int = maxsize
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._hits, self._misses = request_counters(name)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> Optional[V]:
+        try:
+            stored_at, value = self._data[key]
+        except KeyError:
+            self._misses.inc()
+            return None
+
+        if time.monotonic() - stored_at >= self.ttl:
+            del self._data[key]
+            self._misses.inc()
+            return None
+
+        self._data.move_to_end(key)
+        self._hits.inc()
+        return value
+
+    def age(self, key: K) -> Optional[float]:
+        """How old the entry is in seconds, ``None`` if there is none."""
+        try:
+            stored_at, _ = self._data[key]
+        except KeyError:
+            return None
+        return time.monotonic() - stored_at
+
+    def set(self, key: K, value: V) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+_WHITESPACE = re.compile(r'\s+')
+_COMMA = re.compile(r'\s*,\s*')
+
+
+def normalize_location(query: str) -> str:
+    """Normalizes a location query so that e.g. "New  York , US" and "new york,us" share a key."""
+    return _COMMA.sub(',', _WHITESPACE.sub(' ', query.strip())).casefold()
+
+
+class WeatherService:
+    """Fetches weather data from OpenWeatherMap.
+
+    Requests go through the bot's shared session. Queries are normalized and
+    resolved to OpenWeatherMap location ids, so differently written queries for
+    the same city share cache entries. Raw payloads (not embeds) are cached for
+    ``ttl`` seconds, and concurrent lookups of the same location wait on the same
+    request instead of sending their own.
+    """
+
+    def __init__(self, session: ClientSession, api_key: str, *, ttl: float = 300.0, maxsize: int = 256):
+        self.session: ClientSession = session
+        self.api_key: str = api_key
+        self.payloads: TTLCache[tuple[str, int, str], dict[str, Any]] = TTLCache(
+            'weather_payloads', ttl=ttl, maxsize=maxsize
+        )
+        # Location ids do not change, these only need to be bounded
+        self.locations: TTLCache[str, int] = TTLCache('weather_locations', ttl=float('inf'), maxsize=maxsize * 4)
+        self._inflight: dict[tuple[str, str, str], asyncio.Task[dict[str, Any]]] = {}
+        # When each API call of the last minute was made, for budgeting prefetches
+        self._calls: deque[float] = deque()
+
+    @property
+    def calls_last_minute(self) -> int:
+        cutoff = time.monotonic() - 60.0
+        while self._calls and self._calls[0] < cutoff:
+            self._calls.popleft()
+        return len(self._calls)
+
+    async def _request(self, endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
+        params = {**params, 'appid': self.api_key}
+        self._calls.append(time.monotonic())
+        async with self.session.get(f'{OPENWEATHER_API}/{endpoint}', params=params) as resp:
+            try:
+                data = await resp.json(content_type=None)
+            except ValueError:
+                raise WeatherError(f'OpenWeatherMap returned a non-JSON response (status {resp.status})') from None
+
+        if resp.status == 404:
+            raise LocationNotFound(str(params.get('q', params.get('id'))))
+        if resp.status != 200:
+            raise WeatherError(data.get('message', f'OpenWeatherMap returned status {resp.status}'))
+        return data
+
+    async def _fetch(self, endpoint: str, params: dict[str, Any], units: str) -> dict[str, Any]:
+        lookup = params.get('id', params.get('q'))
+        key = (endpoint, str(lookup), units)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._request(endpoint, {**params, 'units': units}))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded so that one caller being cancelled doesn't cancel it for everyone else
+        return await asyncio.shield(task)
+
+    def resolve(self, query: str) -> Optional[int]:
+        """Returns the location id of a query that was looked up before."""
+        return self.locations.get(normalize_location(query))
+
+    async def current(self, query: str, units: str = 'imperial') -> dict[str, Any]:
+        """Returns the current weather payload for a location query."""
+        normalized = normalize_location(query)
+        location_id = self.locations.get(normalized)
+        if location_id is not None:
+            return await self.current_by_id(location_id, units)
+
+        data = await self._fetch('weather', {'q': normalized}, units)
+        location_id = data['id']
+        self.locations.set(normalized, location_id)
+        self.payloads.set(('weather', location_id, units), data)
+        return data
+
+    async def current_by_id(self, location_id: int, units: str = 'imperial', *, refresh: bool = False) -> dict[str, Any]:
+        key = ('weather', location_id, units)
+        if not refresh:
+            data = self.payloads.get(key)
+            if data is not None:
+                return data
+
+        data = await self._fetch('weather', {'id': location_id}, units)
+        self.payloads.set(key, data)
+        return data
+
+    async def forecast_by_id(self, location_id: int, units: str = 'imperial', *, refresh: bool = False) -> dict[str, Any]:
+        """Returns the 5 day / 3 hour forecast payload of a location."""
+        key = ('forecast', location_id, units)
+        if not refresh:
+            data = self.payloads.get(key)
+            if data is not None:
+                return data
+
+        data = await self._fetch('forecast', {'id': location_id}, units)
+        self.payloads.set(key, data)
+        return data
+
+
+class PopularityTracker(Generic[K]):
+    """Counts how often keys are requested, with counts decaying over time.
+
+    Every request adds 1 to the key's score, and scores halve every ``half_life``
+    seconds. Rather than decaying every score periodically, later requests are
+    worth exponentially more, which ranks keys the same way.
+    """
+
+    def __init__(self, *, half_life: float = 3600.0, maxsize: int = 1024):
+        self.half_life: float = half_life
+        self.maxsize: int = maxsize
+        self._epoch: float = time.monotonic()
+        self._scores: dict[K, float] = {}
+
+    def _weight(self) -> float:
+        return 2.0 ** ((time.monotonic() - self._epoch) / self.half_life)
+
+    def record(self, key: K) -> None:
+        weight = self._weight()
+        if weight > 1e100:
+            # Rebase before the weights overflow
+            self._scores = {k: v / weight for k, v in self._scores.items()}
+            self._epoch = time.monotonic()
+            weight = 1.0
+
+        self._scores[key] = self._scores.get(key, 0.0) + weight
+        if len(self._scores) > self.maxsize:
+            # Forget the least popular half
+            keep = heapq.nlargest(self.maxsize // 2, self._scores.items(), key=lambda item: item[1])
+            self._scores = dict(keep)
+
+    def score(self, key: K) -> float:
+        """The decayed number of requests for the key."""
+        return self._scores.get(key, 0.0) / self._weight()
+
+    def top(self, n: int) -> list[K]:
+        return [key for key, _ in heapq.nlargest(n, self._scores.items(), key=lambda item: item[1])]
+
+
+class WeatherPrefetcher:
+    """Keeps the most popular locations warm in the :class:`WeatherService` cache.
+
+    Every ``interval`` seconds the current conditions and forecast of the ``top``
+    most requested locations are refreshed if their cache entries expire within
+    ``lead`` seconds. Prefetches only use what is left of ``budget`` API calls
+    per minute after user requests.
+    """
+
+    ENDPOINTS = ('weather', 'forecast')
+
+    def __init__(
+            self,
+            service: WeatherService,
+            *,
+            top: int = 10,
+            budget: int = 30,
+            interval: float = 30.0,
+            lead: float = 60.0,
+    ):
+        self.service: WeatherService = service
+        self.popularity: PopularityTracker[tuple[int, str]] = PopularityTracker()
+        self.top: int = top
+        self.budget: int = budget
+        self.interval: float = interval
+        self.lead: float = lead
+        self.prefetched: int = 0
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def record(self, location_id: int, units: str) -> None:
+        self.popularity.record((location_id, units))
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def due(self) -> list[tuple[str, int, str]]:
+        """Returns the cache keys that should be refreshed, most popular first."""
+        threshold = self.service.payloads.ttl - self.lead
+        keys = []
+        for location_id, units in self.popularity.top(self.top):
+            for endpoint in self.ENDPOINTS:
+                key = (endpoint, location_id, units)
+                age = self.service.payloads.age(key)
+                if age is None or age >= threshold:
+                    keys.append(key)
+        return keys
+
+    async def refresh(self) -> int:
+        """Refreshes whatever is due and fits in the budget. Returns the number of calls made."""
+        calls = 0
+        for endpoint, location_id, units in self.due():
+            if self.service.calls_last_minute >= self.budget:
+                break
+
+            try:
+                if endpoint == 'weather':
+                    await self.service.current_by_id(location_id, units, refresh=True)
+                else:
+                    await self.service.forecast_by_id(location_id, units, refresh=True)
+            except WeatherError as e:
+                log.warning('Could not prefetch %s for location %s: %s', endpoint, location_id, e)
+            calls += 1
+
+        self.prefetched += calls
+        return calls
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception('Weather prefetch failed')
+            await asyncio.sleep(self.interval)